@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import os
+import random
+import time
+from types import SimpleNamespace
+
+from benchmarks.fake_telegram import FakeTelegram
+
+os.environ.setdefault("ALERTS_DB_PATH", ":memory:")
+
+from services.alert_store import AlertStore  # noqa: E402
+
+
+def trigger_cost(args):
+    rng = random.Random(5)
+    store = AlertStore(":memory:")
+    started = time.perf_counter()
+    with store.conn:
+        store.conn.executemany(
+            "INSERT INTO alerts (chat_id, coin_id, days, metric, op, threshold, created) VALUES (?, ?, ?, ?, ?, ?, 0)",
+            [
+                (rng.randrange(10 ** 6), f"coin-{rng.randrange(args.coins)}", rng.choice((1, 7, 14, 30, 90)),
+                 rng.choice(("rsi", "volatility")), rng.choice(("<", ">")), rng.uniform(10, 90))
+                for _ in range(args.subscriptions)
+            ],
+        )
+    insert = time.perf_counter() - started
+
+    targets = store.targets()
+    for tick in range(3):
+        started = time.perf_counter()
+        fired = sum(len(store.trigger(c, d, rng.uniform(0, 100), rng.uniform(0, 150))) for c, d in targets)
+        elapsed = time.perf_counter() - started
+        print(f"tick {tick}: {len(targets)} targets, {fired} notifications, {elapsed * 1000:.0f} ms")
+    print(f"inserted {args.subscriptions} subscriptions in {insert * 1000:.0f} ms")
+
+
+async def full_tick(args, telegram: FakeTelegram) -> list[tuple[str, float]]:
+    from telegram.ext import ExtBot
+    from telegram.request import HTTPXRequest
+    from services import alerts
+    from services.alert_store import alert_store
+    from services.outbound import OutboundLimiter
+
+    # Every subscription fires: one alert per chat on an RSI of 20 against a threshold of 30.
+    with alert_store.conn:
+        alert_store.conn.execute("DELETE FROM alerts")
+        alert_store.conn.executemany(
+            "INSERT INTO alerts (chat_id, coin_id, days, metric, op, threshold, created) "
+            "VALUES (?, ?, 14, 'rsi', '<', 30, 0)",
+            [(300_000 + i, f"coin-{i % args.coins}") for i in range(args.firings)],
+        )
+
+    async def evaluate_target(coin_id: str, days: int):
+        return 0, 20.0, 50.0
+
+    alerts._evaluate_target = evaluate_target
+    request = HTTPXRequest(connection_pool_size=256)
+    bot = ExtBot("123456:BENCH", base_url=telegram.base_url, rate_limiter=OutboundLimiter(), request=request)
+    context = SimpleNamespace(bot=bot)
+
+    async def serial():
+        # The previous evaluate_alerts: each firing awaited before the next.
+        for coin_id, days in alert_store.targets():
+            for _, chat_id, metric, op, threshold in alert_store.trigger(coin_id, days, 20.0, 50.0):
+                await alerts._send_alert(context, chat_id, alerts.format_alert(coin_id, days, metric, op,
+                                                                               threshold, 20.0, 50.0))
+
+    results = []
+    async with bot:
+        for name, tick in (("serial sends", serial), ("evaluate_alerts", lambda: alerts.evaluate_alerts(context))):
+            with alert_store.conn:
+                alert_store.conn.execute("UPDATE alerts SET active = 0")
+            sent = telegram.calls.get("sendMessage", 0)
+            started = time.perf_counter()
+            await tick()
+            elapsed = time.perf_counter() - started
+            assert telegram.calls.get("sendMessage", 0) - sent == args.firings, name
+            results.append((name, elapsed))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alert evaluation cost per tick")
+    parser.add_argument("--subscriptions", type=int, default=50000)
+    parser.add_argument("--coins", type=int, default=500)
+    parser.add_argument("--firings", type=int, default=600)
+    parser.add_argument("--telegram-latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    trigger_cost(args)
+
+    from config import ALERT_CHECK_INTERVAL, TELEGRAM_GLOBAL_RATE
+    telegram = FakeTelegram(latency=args.telegram_latency).start()
+    try:
+        results = asyncio.run(full_tick(args, telegram))
+    finally:
+        telegram.stop()
+
+    print(f"full tick with {args.firings} firings, {args.telegram_latency * 1000:.0f} ms Telegram latency, "
+          f"{TELEGRAM_GLOBAL_RATE:g} msg/s global limit, {ALERT_CHECK_INTERVAL:g}s job interval")
+    for name, elapsed in results:
+        status = "overruns the job interval" if elapsed > ALERT_CHECK_INTERVAL else "fits the job interval"
+        print(f"{name:<16} {elapsed:>7.2f}s  {args.firings / elapsed:>6.1f} msg/s  {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.backtest import Params, param_grid, run_backtest, sample_tier, summarize
+from services.ohlc_store import OhlcStore, samples_to_records
+
+
+def synthetic_samples(seed: int, candles: int, interval: int) -> np.ndarray:
+    # Price samples in the store tier the candles are built from, several per candle.
+    tier = sample_tier(interval)
+    substeps = interval // tier
+    rng = np.random.default_rng(seed)
+    # Volatility regimes switch every few weeks so both thresholds get crossed.
+    regime = np.repeat(rng.uniform(0.004, 0.02, candles // 150 + 1), 150)[:candles]
+    steps = rng.normal(0, 1, (candles, substeps)) * regime[:, None] / substeps ** 0.5
+    prices = (10 + seed % 997) * np.exp(np.cumsum(steps.ravel()))
+    start = 1_600_000_000 // interval * interval
+    timestamps = (start + np.arange(1, candles * substeps + 1) * tier) * 1000
+    return samples_to_records(timestamps, prices)
+
+
+def build_fixture(root: str, coins: int, candles: int, interval: int) -> list[str]:
+    store = OhlcStore(root)
+    coin_ids = [f"coin-{i}" for i in range(coins)]
+    for seed, coin_id in enumerate(coin_ids):
+        store.merge(coin_id, sample_tier(interval), synthetic_samples(seed, candles, interval))
+    return coin_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSI strategy backtest over fixture histories and a parameter grid")
+    parser.add_argument("--coins", type=int, default=200)
+    parser.add_argument("--years", type=float, default=3)
+    parser.add_argument("--interval", type=int, default=4 * 3600, help="candle interval in seconds")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[7, 14, 21])
+    parser.add_argument("--oversold", type=float, nargs="+", default=[20, 30])
+    parser.add_argument("--overbought", type=float, nargs="+", default=[70, 80])
+    parser.add_argument("--risk", type=float, nargs="+", default=[1, 1.5, 2])
+    parser.add_argument("--reward", type=float, nargs="+", default=[2, 3])
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    grid = param_grid(args.lengths, args.oversold, args.overbought, args.risk, args.reward)
+
+    candles = int(args.years * 365 * 86400 / args.interval)
+    results = None
+    with tempfile.TemporaryDirectory(prefix="backtest-") as root:
+        coin_ids = build_fixture(root, args.coins, candles, args.interval)
+        print(f"{args.coins} coins x {candles} candles, {len(grid)} parameter sets")
+
+        for workers in dict.fromkeys(args.workers):
+            started = time.perf_counter()
+            results = run_backtest(root, coin_ids, args.interval, grid, workers=workers)
+            elapsed = time.perf_counter() - started
+            print(f"workers={workers:<3} {elapsed:>7.2f}s  {args.coins * len(grid) / elapsed:>9.0f} "
+                  f"coin-param runs/s")
+
+    summary = summarize(results)
+    with pd.option_context("display.width", 160, "display.max_columns", 20, "display.float_format", "{:.2f}".format):
+        print(summary.head(args.top).to_string(index=False))
+        default = summary[(summary[list(Params._fields)] == pd.Series(Params()._asdict())).all(axis=1)]
+        if len(default):
+            print("\nbot defaults:")
+            print(default.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.fake_coingecko import synthetic_ohlc
+from services.charts import CHART_RENDERERS, ChartRenderer
+from services.metrics import calculate_rsi
+
+
+def chart_args(coin_id: str, days: int):
+    df = pd.DataFrame(synthetic_ohlc(coin_id, days, now=1_700_000_000),
+                      columns=["timestamp", "open", "high", "low", "close"])
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    rsi = calculate_rsi(df, 14)
+    return df["timestamp"].to_numpy(), df["close"].to_numpy(), rsi.to_numpy(), coin_id, days
+
+
+async def loop_lag(stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.perf_counter() - started - 0.01)
+    return worst
+
+
+def render_once(renderer: str, image_format: str, args, repeat: int) -> tuple[float, int, int]:
+    render = CHART_RENDERERS[renderer]
+    render(*args, image_format)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        size = len(render(*args, image_format))
+    elapsed = (time.perf_counter() - started) / repeat
+    tracemalloc.start()
+    render(*args, image_format)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+
+async def run_pool(workers: int, charts: int, args, renderer_name: str, image_format: str) -> tuple[float, float]:
+    renderer = ChartRenderer(workers, charts, renderer_name, image_format)
+    await renderer.warm_up()
+    stop = asyncio.Event()
+    lag = asyncio.create_task(loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(renderer.render(*args) for _ in range(charts)))
+    wall = time.perf_counter() - started
+    stop.set()
+    worst_lag = await lag
+    renderer.shutdown()
+    return wall, worst_lag
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chart rendering throughput")
+    parser.add_argument("--charts", type=int, default=24)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--renderers", nargs="+", default=["matplotlib", "fast"], choices=list(CHART_RENDERERS))
+    parser.add_argument("--formats", nargs="+", default=["png", "webp"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    render_args = chart_args("bitcoin", args.days)
+    print(f"{'renderer':<11} {'format':<6} {'ms/chart':>9} {'KiB':>6} {'traced MiB':>10}")
+    for renderer in args.renderers:
+        for image_format in args.formats:
+            elapsed, size, peak = render_once(renderer, image_format, render_args, args.repeat)
+            print(f"{renderer:<11} {image_format:<6} {elapsed * 1000:>9.1f} {size / 1024:>6.1f} {peak / 2**20:>10.1f}")
+
+    for renderer in args.renderers:
+        for workers in args.workers:
+            wall, lag = asyncio.run(run_pool(workers, args.charts, render_args, renderer, args.formats[0]))
+            print(f"{renderer:<11} {workers} worker(s): {args.charts / wall:.1f} charts/s, "
+                  f"worst event-loop lag {lag * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.fake_coingecko import make_coins
+from services.coin_index import CoinIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coin index lookup latency")
+    parser.add_argument("--coins", type=int, default=16000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    coins = make_coins(args.coins)
+    ranks = {c["id"]: rank for rank, c in enumerate(coins[:250], start=1)}
+
+    started = time.perf_counter()
+    index = CoinIndex(coins, ranks, time.time())
+    build = time.perf_counter() - started
+
+    rng = random.Random(7)
+    sample = rng.sample(coins, min(len(coins), 1000))
+    queries = []
+    for coin in sample:
+        queries += [coin["id"], coin["symbol"], coin["name"], coin["name"][:4], coin["id"] + "x"]
+    queries = [queries[i % len(queries)] for i in range(args.lookups)]
+
+    exact = [q for q in queries if q.lower() in index.by_id or q.lower() in index.by_symbol]
+    started = time.perf_counter()
+    for q in exact:
+        index.lookup(q)
+    exact_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for q in queries:
+        index.lookup(q)
+    mixed_time = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "coin_index.json.gz")
+        started = time.perf_counter()
+        index.save(path)
+        save = time.perf_counter() - started
+        size = os.path.getsize(path)
+        started = time.perf_counter()
+        CoinIndex.load(path)
+        load = time.perf_counter() - started
+
+    print(f"entries          : {len(index)}")
+    print(f"build            : {build * 1000:.1f} ms")
+    print(f"exact lookup     : {exact_time / len(exact) * 1e6:.2f} us")
+    print(f"mixed lookup     : {mixed_time / len(queries) * 1e6:.2f} us (id/symbol/name/prefix/fuzzy)")
+    print(f"snapshot         : {size / 1024:.0f} KiB, save {save * 1000:.0f} ms, load {load * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import importlib
+import os
+import time
+
+from benchmarks.fake_coingecko import FakeCoinGecko
+
+
+async def simulate_user(api, coin: str, days: int) -> float:
+    started = time.perf_counter()
+    coin_id = await api.find_coin_id(coin)
+    await api.fetch_price_history(coin_id, days)
+    return time.perf_counter() - started
+
+
+async def run(users: int, latency: float, server: FakeCoinGecko, coins: list[str]):
+    api = importlib.import_module("services.coingecko_api")
+    try:
+        single = await simulate_user(api, "btc", 14)
+
+        before = server.requests
+        started = time.perf_counter()
+        latencies = await asyncio.gather(
+            *(simulate_user(api, coins[i % len(coins)], 14) for i in range(users))
+        )
+        wall = time.perf_counter() - started
+        calls = server.requests - before
+    finally:
+        await api.close_client()
+
+    print(f"upstream latency per call : {latency * 1000:.0f} ms")
+    print(f"single user               : {single * 1000:.0f} ms")
+    print(f"{users} concurrent users     : {wall * 1000:.0f} ms wall, "
+          f"slowest {max(latencies) * 1000:.0f} ms, {calls} upstream calls")
+    print(f"serial estimate           : {single * users * 1000:.0f} ms")
+    return single, wall, calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent users against a local CoinGecko stand-in")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--rate-limited", action="store_true",
+                        help="keep the global token bucket at --rate/--burst and check calls are paced by it")
+    parser.add_argument("--rate", type=float, default=600, help="CoinGecko calls per minute with --rate-limited")
+    parser.add_argument("--burst", type=int, default=5)
+    args = parser.parse_args()
+
+    server = FakeCoinGecko(latency=args.latency).start()
+    os.environ["COINGECKO_BASE_URL"] = server.base_url
+    if args.rate_limited:
+        os.environ["COINGECKO_RATE_PER_MINUTE"] = str(args.rate)
+        os.environ["COINGECKO_BURST"] = str(args.burst)
+        # Every user looks up a different coin, so single-flight cannot merge their calls.
+        coins = [f"coin-{6 + i}" for i in range(args.users)]
+    else:
+        # Only concurrency is measured here, so the global token bucket is opened up.
+        os.environ["COINGECKO_RATE_PER_MINUTE"] = "600000"
+        os.environ["COINGECKO_BURST"] = "1000"
+        coins = ["btc", "eth", "sol", "xrp", "doge"]
+    try:
+        single, wall, calls = asyncio.run(run(args.users, args.latency, server, coins))
+    finally:
+        server.stop()
+
+    if not args.rate_limited:
+        if wall > single * args.users / 2:
+            raise SystemExit("concurrent users are blocking each other")
+        return
+    # The bucket starts at most full, so the calls past the burst need at least this long. Paced calls
+    # finish about one round trip after it; serialized ones would add a round trip per call.
+    paced = max(0, calls - args.burst) * 60 / args.rate
+    print(f"token bucket pacing floor : {paced * 1000:.0f} ms at {args.rate:g}/min, burst {args.burst}")
+    if wall < paced * 0.9:
+        raise SystemExit("upstream calls exceeded the configured rate")
+    if wall > paced + 2 * single:
+        raise SystemExit("rate-limited users are serialized instead of paced")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import importlib
+import itertools
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+
+from benchmarks.fake_coingecko import FakeCoinGecko
+from benchmarks.fake_telegram import FakeTelegram
+from benchmarks.stores import temp_stores
+
+COINS = ["btc", "eth", "sol", "xrp", "doge", "bitcoin", "ethereum"]
+DAYS = [1, 7, 14, 30, 90]
+
+FLOWS = {
+    "rsi": lambda coin, days: [("open", "cb", "rsi"), ("coin", "msg", coin), ("timeframe", "cb", f"rsi_days_{days}")],
+    "volatility": lambda coin, days: [("open", "cb", "volatility"), ("coin", "msg", coin),
+                                      ("timeframe", "cb", f"volatility_days_{days}")],
+    "riskreward": lambda coin, days: [("open", "cb", "riskreward"), ("entry", "msg", "100"),
+                                      ("stop", "msg", "95"), ("target", "msg", "112.5")],
+}
+
+
+class UpdateFactory:
+
+    def __init__(self):
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+
+    def build(self, user_id: int, kind: str, payload: str) -> dict:
+        user = {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"}
+        chat = {"id": user_id, "type": "private"}
+        now = int(time.time())
+        if kind == "msg":
+            return {"update_id": next(self._update_ids), "message": {
+                "message_id": next(self._message_ids), "date": now, "chat": chat, "from": user, "text": payload,
+            }}
+        return {"update_id": next(self._update_ids), "callback_query": {
+            "id": str(next(self._update_ids)), "from": user, "chat_instance": str(user_id), "data": payload,
+            "message": {"message_id": next(self._message_ids), "date": now, "chat": chat, "text": "menu"},
+        }}
+
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    arr = np.asarray(values) * 1000
+    return {
+        "count": len(values),
+        "p50_ms": round(float(np.percentile(arr, 50)), 3),
+        "p95_ms": round(float(np.percentile(arr, 95)), 3),
+        "p99_ms": round(float(np.percentile(arr, 99)), 3),
+        "max_ms": round(float(arr.max()), 3),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def replay(args, coingecko: FakeCoinGecko, telegram: FakeTelegram) -> dict:
+    from telegram import Update
+
+    bot_main = importlib.import_module("main")
+    api = importlib.import_module("services.coingecko_api")
+    charts = importlib.import_module("services.charts")
+    instrumentation = importlib.import_module("services.instrumentation")
+
+    app = bot_main.build_app("123456:BENCH", base_url=telegram.base_url)
+    await app.initialize()
+    await charts.chart_renderer.warm_up()
+
+    factory = UpdateFactory()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    flow_names = args.flows
+    stages: dict[str, list[float]] = {}
+    flows: dict[str, list[float]] = {}
+    updates: list[float] = []
+
+    async def run_user(index: int):
+        user_id = 10_000 + index
+        flow = flow_names[index % len(flow_names)]
+        steps = FLOWS[flow](COINS[index % len(COINS)], DAYS[index % len(DAYS)])
+        async with semaphore:
+            flow_started = time.perf_counter()
+            for stage, kind, payload in steps:
+                update = Update.de_json(factory.build(user_id, kind, payload), app.bot)
+                started = time.perf_counter()
+                await app.process_update(update)
+                elapsed = time.perf_counter() - started
+                updates.append(elapsed)
+                stages.setdefault(f"{flow}.{stage}", []).append(elapsed)
+            flows.setdefault(flow, []).append(time.perf_counter() - flow_started)
+
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(run_user(i) for i in range(args.users)))
+        wall = time.perf_counter() - started
+    finally:
+        await app.shutdown()
+        await api.close_client()
+        charts.chart_renderer.shutdown()
+
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "flows": flow_names,
+            "coingecko_latency_ms": args.coingecko_latency * 1000,
+            "telegram_latency_ms": args.telegram_latency * 1000,
+        },
+        "wall_s": round(wall, 3),
+        "updates": len(updates),
+        "updates_per_s": round(len(updates) / wall, 2),
+        "latency": percentiles(updates),
+        "flows": {name: percentiles(values) for name, values in sorted(flows.items())},
+        "stages": {name: percentiles(values) for name, values in sorted(stages.items())},
+        "spans": {
+            name: {
+                "count": h.count,
+                "mean_ms": round(h.sum / h.count * 1000, 3) if h.count else 0.0,
+                "p50_bucket_ms": h.quantile(0.5) * 1000,
+                "p95_bucket_ms": h.quantile(0.95) * 1000,
+            }
+            for name, h in sorted(instrumentation.telemetry.stages().items())
+        },
+        "upstream": {"coingecko": dict(coingecko.paths), "telegram": dict(telegram.calls)},
+    }
+
+
+def compare(result: dict, baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\ncompared with {baseline_path} ({baseline.get('revision')}):")
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        old, new = baseline["latency"].get(key), result["latency"].get(key)
+        if old:
+            print(f"  {key:<8} {old:>10.1f} -> {new:>10.1f} ({(new / old - 1) * 100:+.1f}%)")
+    old, new = baseline["updates_per_s"], result["updates_per_s"]
+    print(f"  upd/s    {old:>10.1f} -> {new:>10.1f} ({(new / old - 1) * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark through the real ConversationHandlers")
+    parser.add_argument("--users", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--flows", nargs="+", default=list(FLOWS), choices=list(FLOWS))
+    parser.add_argument("--coingecko-latency", type=float, default=0.05)
+    parser.add_argument("--telegram-latency", type=float, default=0.02)
+    parser.add_argument("--output", help="write the JSON report to this path")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    args = parser.parse_args()
+
+    coingecko = FakeCoinGecko(latency=args.coingecko_latency).start()
+    telegram = FakeTelegram(latency=args.telegram_latency).start()
+    os.environ.update({
+        "TELEGRAM_BOT_TOKEN": "123456:BENCH",
+        "COINGECKO_BASE_URL": coingecko.base_url,
+        "COINGECKO_RATE_PER_MINUTE": "600000",
+        "COINGECKO_BURST": "1000",
+        # Replayed flows have no think time and the fake API has no flood limits; send pacing is
+        # measured separately by benchmarks.send_queue.
+        "TELEGRAM_GLOBAL_RATE": "100000",
+        "TELEGRAM_GLOBAL_BURST": "100000",
+        "TELEGRAM_CHAT_RATE": "100000",
+        "TELEGRAM_CHAT_BURST": "100000",
+        "TELEGRAM_GROUP_RATE_PER_MINUTE": "6000000",
+    })
+    try:
+        with temp_stores("bench-"):
+            result = asyncio.run(replay(args, coingecko, telegram))
+    finally:
+        coingecko.stop()
+        telegram.stop()
+
+    report = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    print(report)
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+BASE_COINS = [
+    ("bitcoin", "btc", "Bitcoin"),
+    ("ethereum", "eth", "Ethereum"),
+    ("tether", "usdt", "Tether"),
+    ("solana", "sol", "Solana"),
+    ("ripple", "xrp", "XRP"),
+    ("dogecoin", "doge", "Dogecoin"),
+]
+
+
+def make_coins(count: int = 300) -> list[dict]:
+    coins = [{"id": i, "symbol": s, "name": n} for i, s, n in BASE_COINS]
+    n = len(coins)
+    while len(coins) < count:
+        coins.append({"id": f"coin-{n}", "symbol": f"c{n}", "name": f"Coin {n}"})
+        n += 1
+    return coins
+
+
+def ohlc_interval(days: int) -> int:
+    if days <= 2:
+        return 30 * 60
+    if days <= 30:
+        return 4 * 3600
+    return 4 * 86400
+
+
+def price_interval(days: int) -> int:
+    if days <= 1:
+        return 5 * 60
+    if days <= 90:
+        return 3600
+    return 86400
+
+
+def synthetic_price(coin_id: str, ts: float) -> float:
+    seed = sum(ord(c) for c in coin_id)
+    base = 10 + seed % 997
+    t = ts / 3600
+    return base * (1 + 0.05 * math.sin(t / 7 + seed) + 0.02 * math.sin(t / 1.3 + seed * 3))
+
+
+def synthetic_ohlc(coin_id: str, days: int, now: float | None = None) -> list[list[float]]:
+    now = time.time() if now is None else now
+    step = ohlc_interval(days)
+    end = int(now // step) * step
+    rows = []
+    for ts in range(end - days * 86400 + step, end + 1, step):
+        points = [synthetic_price(coin_id, ts - step + step * k / 4) for k in range(5)]
+        rows.append([ts * 1000, points[0], max(points), min(points), points[-1]])
+    return rows
+
+
+def synthetic_prices(coin_id: str, days: int, now: float | None = None) -> list[list[float]]:
+    now = time.time() if now is None else now
+    step = price_interval(days)
+    end = int(now // step) * step
+    return [[ts * 1000, synthetic_price(coin_id, ts)] for ts in range(end - days * 86400, end + 1, step)]
+
+
+class FakeCoinGecko:
+
+    def __init__(self, latency: float = 0.0, coins: int = 300, rate_limit_every: int = 0):
+        self.latency = latency
+        self.coins = make_coins(coins)
+        self.rate_limit_every = rate_limit_every
+        self.requests = 0
+        self.paths: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, port: int = 0) -> "FakeCoinGecko":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                status, body = fake.handle(url.path, params)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def handle(self, path: str, params: dict) -> tuple[int, object]:
+        with self._lock:
+            self.requests += 1
+            key = path.rsplit("/", 1)[-1] if path.startswith("/coins/") else path
+            self.paths[key] = self.paths.get(key, 0) + 1
+            count = self.requests
+        if self.latency:
+            time.sleep(self.latency)
+        if self.rate_limit_every and count % self.rate_limit_every == 0:
+            return 429, {"status": {"error_code": 429}}
+
+        if path == "/search":
+            query = params.get("query", "").lower()
+            hits = [c for c in self.coins if query in c["id"] or query == c["symbol"]]
+            return 200, {"coins": hits[:25]}
+        if path == "/coins/list":
+            return 200, self.coins
+        if path == "/coins/markets":
+            return 200, self.markets(params)
+        if path == "/simple/price":
+            ids = [i for i in params.get("ids", "").split(",") if i]
+            return 200, {i: {"usd": synthetic_price(i, time.time())} for i in ids}
+        parts = path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "coins":
+            coin_id, kind = parts[1], parts[2]
+            days = int(params.get("days", "1"))
+            if kind == "ohlc":
+                return 200, synthetic_ohlc(coin_id, days)
+            if kind == "market_chart":
+                prices = synthetic_prices(coin_id, days)
+                return 200, {"prices": prices, "market_caps": [], "total_volumes": []}
+        return 404, {"error": "not found"}
+
+    def markets(self, params: dict) -> list[dict]:
+        ids = [i for i in params.get("ids", "").split(",") if i]
+        ranked = list(enumerate(self.coins, start=1))
+        if ids:
+            ranked = [(rank, c) for rank, c in ranked if c["id"] in ids]
+        per_page = int(params.get("per_page", "100"))
+        page = int(params.get("page", "1"))
+        ranked = ranked[(page - 1) * per_page:page * per_page]
+        now = time.time()
+        rows = []
+        for rank, coin in ranked:
+            price = synthetic_price(coin["id"], now)
+            rows.append({
+                "id": coin["id"],
+                "symbol": coin["symbol"],
+                "name": coin["name"],
+                "current_price": price,
+                "market_cap": price * 1e6 / rank,
+                "market_cap_rank": rank,
+                "total_volume": price * 1e5,
+                "high_24h": price * 1.03,
+                "low_24h": price * 0.97,
+                "price_change_percentage_24h": 100 * (price / synthetic_price(coin["id"], now - 86400) - 1),
+            })
+        return rows
+
+
+if __name__ == "__main__":
+    server = FakeCoinGecko().start(8765)
+    print(f"Fake CoinGecko listening on {server.base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,149 @@
+import itertools
+import json
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import default
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+def multipart_fields(content_type: str, body: bytes) -> dict:
+    message = BytesParser(policy=default).parsebytes(
+        b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body)
+    return {part.get_param("name", header="content-disposition"): part.get_payload(decode=True).decode()
+            for part in message.iter_parts() if part.get_filename() is None}
+
+
+class FakeTelegram:
+
+    def __init__(self, latency: float = 0.0, retry_after_every: int = 0, flood_limits: bool = False,
+                 global_rate: float = 30, chat_rate: float = 1, chat_burst: int = 3, retry_after: int = 1):
+        self.latency = latency
+        self.retry_after_every = retry_after_every
+        # Optional emulation of Telegram's send limits: a global and a per-chat token bucket whose
+        # overflow is answered with 429 and retry_after, like the real API.
+        self.flood_limits = flood_limits
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.retry_after = retry_after
+        self.floods = 0
+        self._buckets: dict[int, list[float]] = {}
+        self.calls: dict[str, int] = {}
+        self.call_times: dict[str, float] = {}
+        self.chat_calls: dict[tuple[int, str], int] = {}
+        self.requests = 0
+        self._ids = itertools.count(1000)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/bot"
+
+    def start(self, port: int = 0) -> "FakeTelegram":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                started = time.perf_counter()
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                method = self.path.rsplit("/", 1)[-1]
+                status, result = fake.handle(method, self.headers.get("Content-Type", ""), body)
+                message = result.get("result")
+                chat_id = message.get("chat", {}).get("id") if isinstance(message, dict) else None
+                payload = json.dumps(result).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with fake._lock:
+                    fake.call_times[method] = fake.call_times.get(method, 0.0) + time.perf_counter() - started
+                    if chat_id:
+                        fake.chat_calls[(chat_id, method)] = fake.chat_calls.get((chat_id, method), 0) + 1
+
+            do_GET = do_POST
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def handle(self, method: str, content_type: str, body: bytes) -> tuple[int, dict]:
+        with self._lock:
+            self.requests += 1
+            self.calls[method] = self.calls.get(method, 0) + 1
+            count = self.requests
+        if self.latency:
+            time.sleep(self.latency)
+        if self.retry_after_every and method != "getMe" and count % self.retry_after_every == 0:
+            return self.too_many_requests(1)
+
+        params = {}
+        if "json" in content_type:
+            params = json.loads(body or b"{}")
+        elif "urlencoded" in content_type:
+            params = {k: v[0] for k, v in parse_qs(body.decode()).items()}
+        elif "multipart" in content_type:
+            params = multipart_fields(content_type, body)
+        chat_id = int(params.get("chat_id", 0) or 0)
+        if self.flood_limits and chat_id and not self.take(chat_id):
+            return self.too_many_requests(self.retry_after)
+        return 200, {"ok": True, "result": self.result(method, chat_id, params)}
+
+    def reset_limits(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def too_many_requests(self, retry_after: int) -> tuple[int, dict]:
+        return 429, {"ok": False, "error_code": 429, "description": f"Too Many Requests: retry after {retry_after}",
+                     "parameters": {"retry_after": retry_after}}
+
+    def take(self, chat_id: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            limits = [(0, self.global_rate, self.global_rate), (chat_id, self.chat_rate, self.chat_burst)]
+            buckets = []
+            for key, rate, burst in limits:
+                tokens, last = self._buckets.get(key, (burst, now))
+                buckets.append((key, min(burst, tokens + (now - last) * rate)))
+            if any(tokens < 1 for _, tokens in buckets):
+                for key, tokens in buckets:
+                    self._buckets[key] = [tokens, now]
+                self.floods += 1
+                return False
+            for key, tokens in buckets:
+                self._buckets[key] = [tokens - 1, now]
+            return True
+
+    def result(self, method: str, chat_id: int, params: dict):
+        if method == "getMe":
+            return {"id": 1, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+        if method in ("answerCallbackQuery", "answerInlineQuery", "deleteWebhook", "setWebhook"):
+            return True
+        message = {
+            "message_id": next(self._ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+        }
+        if method == "sendPhoto":
+            file_id = f"photo-{message['message_id']}"
+            message["photo"] = [{"file_id": file_id, "file_unique_id": file_id, "width": 1500, "height": 1000}]
+            if "caption" in params:
+                message["caption"] = params["caption"]
+        else:
+            message["text"] = params.get("text", "")
+        return message
@@ -0,0 +1,84 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.metrics_kernel import make_frame, per_call
+from services.metrics import (
+    ANNUALIZATION, BOLLINGER_LENGTH, BOLLINGER_WIDTH, MACD_FAST, MACD_SIGNAL, MACD_SLOW, REALIZED_LENGTH,
+    analyze_ohlc, ewm_mean, returns_kernel, rolling_mean_std, rsi_kernel, span_length,
+)
+
+
+def columns(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    close = df["close"].to_numpy(dtype="float64")
+    high = df["high"].to_numpy(dtype="float64") if "high" in df else close
+    low = df["low"].to_numpy(dtype="float64") if "low" in df else close
+    return high, low, close
+
+
+# Textbook pandas definitions, timed against the fused pass. Equivalence is covered by
+# tests/test_metrics.py.
+def pandas_indicators(df: pd.DataFrame, length: int) -> dict:
+    high, low, close = (pd.Series(a) for a in columns(df))
+    previous = close.shift(1).fillna(close.iloc[0])
+    true_range = pd.concat([high - low, (high - previous).abs(), (low - previous).abs()], axis=1).max(axis=1)
+    macd = close.ewm(span=MACD_FAST).mean() - close.ewm(span=MACD_SLOW).mean()
+    mid = close.rolling(BOLLINGER_LENGTH).mean()
+    deviation = close.rolling(BOLLINGER_LENGTH).std(ddof=0) * BOLLINGER_WIDTH
+    log_returns = np.log(close / close.shift(1))
+    return {
+        "atr": true_range.ewm(com=length - 1).mean(),
+        "macd": macd,
+        "macd_signal": macd.ewm(span=MACD_SIGNAL).mean(),
+        "bollinger_mid": mid,
+        "bollinger_upper": mid + deviation,
+        "bollinger_lower": mid - deviation,
+        "realized_volatility": log_returns.rolling(REALIZED_LENGTH).std() * ANNUALIZATION * 100,
+    }
+
+
+# Each indicator on its own, as separate handlers would compute them: every one re-reads the
+# columns and makes its own passes over the frame.
+def separate(df: pd.DataFrame, length: int):
+    rsi_kernel(df["close"].to_numpy(dtype="float64"), length)
+
+    high, low, close = columns(df)
+    previous = np.r_[close[:1], close[:-1]]
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - previous), np.abs(low - previous)))
+    ewm_mean(true_range, length)
+
+    close = df["close"].to_numpy(dtype="float64")
+    macd = ewm_mean(close, span_length(MACD_FAST)) - ewm_mean(close, span_length(MACD_SLOW))
+    ewm_mean(macd, span_length(MACD_SIGNAL))
+
+    rolling_mean_std(df["close"].to_numpy(dtype="float64"), BOLLINGER_LENGTH)
+
+    returns = returns_kernel(df["close"].to_numpy(dtype="float64"))[0]
+    rolling_mean_std(np.log1p(returns), REALIZED_LENGTH, ddof=1)
+
+
+def fused(df: pd.DataFrame, length: int):
+    analyze_ohlc(*columns(df), length)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fused indicator pass vs one pass per indicator")
+    parser.add_argument("--length", type=int, default=14)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'candles':>8} {'pandas us':>10} {'separate us':>12} {'fused us':>9} {'vs separate':>12}")
+    for days, candles in ((1, None), (14, None), (30, None), (365, None), (365, 2000)):
+        df = make_frame("bitcoin", days)
+        if candles:
+            df = pd.concat([df] * (candles // len(df) + 1), ignore_index=True).tail(candles)
+        reference = per_call(lambda: pandas_indicators(df, args.length), max(args.repeat // 10, 1))
+        apart = per_call(lambda: separate(df, args.length), args.repeat)
+        together = per_call(lambda: fused(df, args.length), args.repeat)
+        print(f"{len(df):>8} {reference * 1e6:>10.1f} {apart * 1e6:>12.1f} {together * 1e6:>9.1f} "
+              f"{apart / together:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
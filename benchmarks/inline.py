@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import importlib
+import itertools
+import os
+import time
+
+from benchmarks.e2e import percentiles
+from benchmarks.fake_coingecko import FakeCoinGecko
+from benchmarks.fake_telegram import FakeTelegram
+from benchmarks.stores import temp_stores
+
+QUERIES = ["btc", "eth", "sol", "xrp", "doge", "bitcoin", "ethereum", "coin-1", "coin-2", "coin-3"]
+
+
+def inline_update(update_id: int, user_id: int, query: str) -> dict:
+    return {"update_id": update_id, "inline_query": {
+        "id": str(update_id), "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"},
+        "query": query, "offset": "",
+    }}
+
+
+async def run(args, coingecko: FakeCoinGecko, telegram: FakeTelegram) -> dict:
+    from telegram import Update
+
+    bot_main = importlib.import_module("main")
+    api = importlib.import_module("services.coingecko_api")
+    coin_index = importlib.import_module("services.coin_index")
+    market_snapshot = importlib.import_module("services.market_snapshot")
+    coin_summary = importlib.import_module("services.coin_summary")
+
+    app = bot_main.build_app("123456:BENCH", base_url=telegram.base_url)
+    await app.initialize()
+    ids = itertools.count(1)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def ask(query: str, user_id: int) -> float:
+        async with semaphore:
+            started = time.perf_counter()
+            await app.process_update(Update.de_json(inline_update(next(ids), user_id, query), app.bot))
+            return time.perf_counter() - started
+
+    try:
+        await coin_index.refresh_coin_index()
+        await market_snapshot.refresh_market_snapshot()
+        for query in QUERIES:
+            coin_summary.summary_table.record(coin_index.coin_index.lookup(query))
+        started = time.perf_counter()
+        await coin_summary.refresh_summaries()
+        refresh = time.perf_counter() - started
+
+        hits = await asyncio.gather(*(ask(QUERIES[i % len(QUERIES)], i) for i in range(args.queries)))
+
+        await asyncio.sleep(args.coingecko_latency * 5)
+
+        # Cold coins: each query waits on its own background fetch while hot queries keep flowing.
+        cold = [f"coin-{n}" for n in range(100, 100 + args.cold)]
+        hot_during_misses = []
+
+        async def hot_stream():
+            for i in range(args.queries):
+                hot_during_misses.append(await ask(QUERIES[i % len(QUERIES)], 10_000 + i))
+
+        misses, _ = await asyncio.gather(
+            asyncio.gather(*(ask(coin_id, 20_000 + i) for i, coin_id in enumerate(cold))),
+            hot_stream(),
+        )
+        after_miss = await asyncio.gather(*(ask(coin_id, 30_000 + i) for i, coin_id in enumerate(cold)))
+    finally:
+        await app.shutdown()
+        await api.close_client()
+
+    return {
+        "summaries": len(coin_summary.summary_table),
+        "refresh_s": refresh,
+        "hit": percentiles(list(hits)),
+        "hit_during_misses": percentiles(hot_during_misses),
+        "miss": percentiles(list(misses)),
+        "repeat_after_miss": percentiles(list(after_miss)),
+        "answers": telegram.calls.get("answerInlineQuery", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inline-query latency from the precomputed summary table")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--cold", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--coingecko-latency", type=float, default=0.2)
+    parser.add_argument("--telegram-latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    coingecko = FakeCoinGecko(latency=args.coingecko_latency).start()
+    telegram = FakeTelegram(latency=args.telegram_latency).start()
+    os.environ.update({
+        "TELEGRAM_BOT_TOKEN": "123456:BENCH",
+        "COINGECKO_BASE_URL": coingecko.base_url,
+        "COINGECKO_RATE_PER_MINUTE": "600000",
+        "COINGECKO_BURST": "1000",
+        # Replayed flows have no think time and the fake API has no flood limits; send pacing is
+        # measured separately by benchmarks.send_queue.
+        "TELEGRAM_GLOBAL_RATE": "100000",
+        "TELEGRAM_GLOBAL_BURST": "100000",
+        "TELEGRAM_CHAT_RATE": "100000",
+        "TELEGRAM_CHAT_BURST": "100000",
+        "TELEGRAM_GROUP_RATE_PER_MINUTE": "6000000",
+        "INLINE_HOT_COINS": str(len(QUERIES)),
+    })
+    try:
+        with temp_stores("inline-"):
+            result = asyncio.run(run(args, coingecko, telegram))
+    finally:
+        coingecko.stop()
+        telegram.stop()
+
+    print(f"{result['summaries']} summaries precomputed in {result['refresh_s']:.2f}s, "
+          f"{result['answers']} inline answers sent")
+    print(f"{'':<20} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for name in ("hit", "hit_during_misses", "miss", "repeat_after_miss"):
+        stats = result[name]
+        print(f"{name:<20} {stats['count']:>6} {stats.get('p50_ms', 0):>8.1f} {stats.get('p95_ms', 0):>8.1f} "
+              f"{stats.get('max_ms', 0):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import argparse
+import asyncio
+import gc
+import os
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.e2e import percentiles
+from benchmarks.fake_coingecko import FakeCoinGecko
+from benchmarks.stores import temp_stores
+
+DAYS = [1, 7, 14, 30, 90]
+
+
+# services modules read config at import, so they are imported only after main() has pointed the
+# environment at the fake server.
+async def serve(requests: list[tuple[str, int]]) -> list[float]:
+    from services.market_data import get_ohlc_history
+    from services.metrics import analyze_closes
+
+    latencies = []
+    for coin_id, days in requests:
+        started = time.perf_counter()
+        df = await get_ohlc_history(coin_id, days)
+        analysis = analyze_closes(df["close"].to_numpy(dtype="float64"))
+        assert not np.isnan(analysis.rsi[-1]), (coin_id, days)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def run(args, fake: FakeCoinGecko) -> dict:
+    from services import coingecko_api, live_prices, market_data, market_snapshot
+    from services.coin_summary import summary_table
+    from services.price_rings import price_rings
+
+    def calls() -> int:
+        return sum(fake.paths.values())
+
+    try:
+        await market_snapshot.refresh_market_snapshot()
+        coins = [row["id"] for row in market_snapshot.market_snapshot.top(args.coins)]
+        for coin_id in coins:
+            summary_table.record(coin_id)
+        keys = [(c, d) for c in coins for d in DAYS]
+        rng = random.Random(7)
+        requests = [rng.choice(keys) for _ in range(args.requests)]
+
+        before = calls()
+        cold = await serve(keys)
+        cold_calls = calls() - before
+
+        before = calls()
+        started = time.perf_counter()
+        await live_prices.refresh_live_prices()
+        seed_s, seed_calls = time.perf_counter() - started, calls() - before
+
+        # Right after seeding the rings hold the stored samples plus the polled price, so every bar
+        # but the live one must match what the store path builds.
+        for coin_id, days in keys:
+            live = market_data.live_ohlc(coin_id, days)
+            stored = await market_data._load_ohlc(coin_id, days, 0)
+            assert live is not None, (coin_id, days)
+            merged = live.iloc[:-1].merge(stored.iloc[:-1], on="timestamp", suffixes=("_live", "_stored"))
+            assert len(merged) >= len(stored) - 2, (coin_id, days, len(merged), len(stored))
+            for column in ("open", "high", "low", "close"):
+                np.testing.assert_allclose(merged[f"{column}_live"], merged[f"{column}_stored"], rtol=1e-12)
+
+        before = calls()
+        live = await serve(requests)
+        live_calls = calls() - before
+
+        before = calls()
+        started = time.perf_counter()
+        await live_prices.refresh_live_prices()
+        poll_s, poll_calls = time.perf_counter() - started, calls() - before
+
+        for coin_id in price_rings.coins():
+            price_rings.remove(coin_id)
+        market_data.ohlc_cache.clear()
+        before = calls()
+        stored = await serve(requests)
+        stored_calls = calls() - before
+        frame_bytes = sum(int(market_data.ohlc_cache.get((coins[0], d)).memory_usage(deep=True).sum()) for d in DAYS)
+    finally:
+        await coingecko_api.close_client()
+
+    return {
+        "coins": len(coins),
+        "cold": (percentiles(cold), cold_calls),
+        "live": (percentiles(live), live_calls),
+        "stored": (percentiles(stored), stored_calls),
+        "seed": (seed_s, seed_calls),
+        "poll": (poll_s, poll_calls),
+        "frame_bytes": frame_bytes,
+    }
+
+
+def memory(coins: int) -> dict:
+    from services.ohlc_store import samples_to_records
+    from services.price_rings import LIVE_TIERS, PriceRings
+
+    now_ms = int(time.time() * 1000)
+    tiers = {
+        interval: samples_to_records(now_ms - interval * 1000 * np.arange(capacity, 0, -1, dtype="int64"),
+                                     np.linspace(1.0, 2.0, capacity))
+        for interval, capacity in LIVE_TIERS.items()
+    }
+    gc.collect()
+    objects = len(gc.get_objects())
+    tracemalloc.start()
+    rings = PriceRings(coins, 300)
+    for i in range(coins):
+        rings.add(f"coin-{i}", tiers)
+    rings.push([f"coin-{i}" for i in range(coins)], [1.5] * coins, now_ms + 60_000)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    return {
+        "coins": coins,
+        "reserved_bytes": rings.nbytes,
+        "traced_bytes": current,
+        "peak_bytes": peak,
+        "new_objects": len(gc.get_objects()) - objects,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-coin requests served from in-memory price rings")
+    parser.add_argument("--coins", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--memory-coins", type=int, default=5000)
+    parser.add_argument("--coingecko-latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    fake = FakeCoinGecko(latency=args.coingecko_latency).start()
+    os.environ.update({
+        "COINGECKO_BASE_URL": fake.base_url,
+        "COINGECKO_RATE_PER_MINUTE": "600000",
+        "COINGECKO_BURST": "1000",
+        "LIVE_PRICE_COINS": str(args.coins),
+        "LIVE_PRICE_SEEDS_PER_POLL": str(args.coins),
+    })
+    try:
+        with temp_stores("live-"):
+            result = asyncio.run(run(args, fake))
+    finally:
+        fake.stop()
+
+    print(f"{result['coins']} hot coins x {len(DAYS)} timeframes")
+    print(f"seed {result['seed'][0]:.2f}s / {result['seed'][1]} upstream calls, "
+          f"poll tick {result['poll'][0] * 1000:.1f}ms / {result['poll'][1]} upstream calls")
+    print(f"{'':<28} {'requests':>8} {'upstream':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, label in (("cold", "cold (network)"), ("stored", "stored samples + TTL cache"),
+                        ("live", "live price rings")):
+        stats, upstream = result[name]
+        print(f"{label:<28} {stats['count']:>8} {upstream:>8} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f}")
+
+    mem = memory(args.memory_coins)
+    per_coin = mem["reserved_bytes"] / mem["coins"]
+    print(f"{mem['coins']} coins in rings: {mem['reserved_bytes'] / 2**20:.1f} MiB reserved "
+          f"({per_coin / 1024:.1f} KiB/coin), {mem['traced_bytes'] / 2**20:.1f} MiB traced, "
+          f"{mem['new_objects']} new Python objects")
+    print(f"cached DataFrames for one coin's {len(DAYS)} timeframes: {result['frame_bytes'] / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
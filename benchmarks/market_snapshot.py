@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+import importlib
+import os
+import time
+
+from benchmarks.fake_coingecko import FakeCoinGecko
+
+
+async def run(coins: int):
+    api = importlib.import_module("services.coingecko_api")
+    snapshot_module = importlib.import_module("services.market_snapshot")
+    snapshot = snapshot_module.MarketSnapshot(max_age=300, max_tracked=1000)
+    ids = [f"coin-{i}" for i in range(10, 10 + coins)]
+    try:
+        started = time.perf_counter()
+        rows = await snapshot.ensure(ids)
+        first = time.perf_counter() - started
+
+        started = time.perf_counter()
+        await snapshot.ensure(ids)
+        second = time.perf_counter() - started
+
+        top = await snapshot.ensure_top(coins)
+    finally:
+        await api.close_client()
+    return len(rows), len(top), first, second
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upstream cost of a market dashboard")
+    parser.add_argument("--coins", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    server = FakeCoinGecko(latency=args.latency, coins=args.coins + 300).start()
+    os.environ["COINGECKO_BASE_URL"] = server.base_url
+    try:
+        rows, top, first, second = asyncio.run(run(args.coins))
+    finally:
+        server.stop()
+
+    print(f"dashboard of {rows} coins  : {first * 1000:.0f} ms cold, {second * 1000:.2f} ms from snapshot")
+    print(f"top {top} dashboard          : fetched as one ranked page")
+    print(f"upstream calls            : {server.requests} ({server.paths})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.fake_coingecko import synthetic_ohlc
+from services.metrics import analyze_closes, calculate_rsi, calculate_volatility
+
+
+def make_frame(coin_id: str, days: int, candles: int | None = None) -> pd.DataFrame:
+    df = pd.DataFrame(synthetic_ohlc(coin_id, days, now=1_700_000_000),
+                      columns=["timestamp", "open", "high", "low", "close"])
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df if candles is None else df.tail(candles).reset_index(drop=True)
+
+
+# The pandas implementations the kernel replaced, timed against it. Equivalence is covered by
+# tests/test_metrics.py.
+def pandas_rsi(df: pd.DataFrame, length: int = 14) -> pd.Series | None:
+    delta = df["close"].diff()
+    gain = delta.where(delta > 0, 0.0)
+    loss = -delta.where(delta < 0, 0.0)
+    avg_gain = gain.ewm(com=length - 1, min_periods=length).mean()
+    avg_loss = loss.ewm(com=length - 1, min_periods=length).mean()
+    rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    return None if rsi.isnull().all() else rsi
+
+
+def pandas_volatility(df: pd.DataFrame) -> float | None:
+    returns = df["close"].pct_change().dropna()
+    return None if returns.empty else returns.std() * (252 ** 0.5) * 100
+
+
+def pandas_levels(df: pd.DataFrame, rsi_value: float) -> tuple:
+    returns = df["close"].pct_change().dropna()
+    volatility = returns.std() if not returns.empty else 0.02
+    risk_pct, reward_pct = volatility * 1.5, volatility * 3
+    last_price = df["close"].iloc[-1]
+    if rsi_value < 30:
+        entry, stop, target = last_price, last_price * (1 - risk_pct), last_price * (1 + reward_pct)
+    elif rsi_value > 70:
+        entry, stop, target = last_price, last_price * (1 + risk_pct), last_price * (1 - reward_pct)
+    else:
+        return None, None, None, None
+    return entry, stop, target, abs(target - entry) / abs(entry - stop)
+
+
+def per_call(func, repeat: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy metrics kernel vs the pandas implementation: per-call cost")
+    parser.add_argument("--length", type=int, default=14)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'candles':>8} {'pandas us':>10} {'kernel us':>10} {'speedup':>8}")
+    for days in (1, 14, 30, 90, 365):
+        df = make_frame("bitcoin", days)
+
+        def old():
+            rsi = pandas_rsi(df, args.length)
+            pandas_volatility(df)
+            pandas_levels(df, rsi.iloc[-1])
+
+        def new():
+            analyze_closes(df["close"].to_numpy(dtype="float64"), args.length)
+
+        before, after = per_call(old, args.repeat), per_call(new, args.repeat)
+        print(f"{len(df):>8} {before * 1e6:>10.1f} {after * 1e6:>10.1f} {before / after:>7.1f}x")
+
+    df = make_frame("bitcoin", 30)
+    for name, old, new in (
+        ("calculate_rsi", lambda: pandas_rsi(df, args.length), lambda: calculate_rsi(df, args.length)),
+        ("calculate_volatility", lambda: pandas_volatility(df), lambda: calculate_volatility(df)),
+    ):
+        before, after = per_call(old, args.repeat), per_call(new, args.repeat)
+        print(f"{name:<22} {before * 1e6:>8.1f} us -> {after * 1e6:>7.1f} us ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
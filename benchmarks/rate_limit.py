@@ -0,0 +1,43 @@
+import argparse
+import asyncio
+import importlib
+import os
+import time
+
+from benchmarks.fake_coingecko import FakeCoinGecko
+
+
+async def run(users: int, coins: int):
+    api = importlib.import_module("services.coingecko_api")
+    ids = ["bitcoin", "ethereum", "solana", "ripple", "dogecoin"][:coins]
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(api.fetch_price_history(ids[i % len(ids)], 14) for i in range(users)))
+        wall = time.perf_counter() - started
+    finally:
+        await api.close_client()
+    return wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Token bucket, single-flight and retry behaviour")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--coins", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeCoinGecko(latency=args.latency, rate_limit_every=args.rate_limit_every).start()
+    os.environ["COINGECKO_BASE_URL"] = server.base_url
+    os.environ.setdefault("COINGECKO_BACKOFF", "0.1")
+    try:
+        wall = asyncio.run(run(args.users, args.coins))
+    finally:
+        server.stop()
+
+    print(f"{args.users} requests over {args.coins} coins in {wall * 1000:.0f} ms")
+    print(f"upstream calls: {server.requests} ({server.paths})")
+
+
+if __name__ == "__main__":
+    main()
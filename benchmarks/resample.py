@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import importlib
+import os
+import time
+
+import numpy as np
+
+from benchmarks.fake_coingecko import FakeCoinGecko
+from benchmarks.stores import temp_stores
+
+DAYS = [1, 7, 14, 30, 90]
+
+
+# services modules read config at import, so they are imported only after main() has pointed the
+# environment at the fake server. Resampling itself is covered by tests/test_resample.py.
+async def upstream_calls(coins: list[str], fake: FakeCoinGecko) -> dict:
+    api = importlib.import_module("services.coingecko_api")
+    market_data = importlib.import_module("services.market_data")
+    try:
+        started = time.perf_counter()
+        frames = {}
+        for coin_id in coins:
+            for days in DAYS:
+                frames[coin_id, days] = await market_data.get_ohlc_history(coin_id, days)
+        elapsed = time.perf_counter() - started
+    finally:
+        await api.close_client()
+
+    # Every timeframe resampled from the same hourly samples must agree where their bars line up.
+    for coin_id in coins:
+        weekly, monthly = frames[coin_id, 7], frames[coin_id, 30]
+        merged = weekly.merge(monthly, on="timestamp", suffixes=("_7", "_30"))
+        assert len(merged) >= len(weekly) - 1
+        for column in ("open", "high", "low", "close"):
+            np.testing.assert_allclose(merged[f"{column}_7"], merged[f"{column}_30"], rtol=1e-12)
+    return {"paths": dict(fake.paths), "candles": {d: len(frames[coins[0], d]) for d in DAYS}, "elapsed_s": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upstream requests for every timeframe built from stored samples")
+    parser.add_argument("--coins", nargs="+", default=["bitcoin", "ethereum", "solana", "coin-42"])
+    args = parser.parse_args()
+
+    fake = FakeCoinGecko().start()
+    os.environ.update({
+        "COINGECKO_BASE_URL": fake.base_url,
+        "COINGECKO_RATE_PER_MINUTE": "600000",
+        "COINGECKO_BURST": "1000",
+    })
+    try:
+        with temp_stores("resample-"):
+            result = asyncio.run(upstream_calls(args.coins, fake))
+    finally:
+        fake.stop()
+    requests = sum(result["paths"].values())
+    print(f"{len(args.coins)} coins x {len(DAYS)} timeframes -> {requests} upstream requests {result['paths']}")
+    print("candles per timeframe: " + ", ".join(f"{d}d={n}" for d, n in result["candles"].items()))
+
+
+if __name__ == "__main__":
+    main()
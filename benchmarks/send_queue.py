@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.e2e import percentiles
+from benchmarks.fake_telegram import FakeTelegram
+
+
+async def run(args, telegram: FakeTelegram, limited: bool) -> dict:
+    from telegram.error import RetryAfter
+    from telegram.ext import ExtBot
+    from telegram.request import HTTPXRequest
+    from services.outbound import OutboundLimiter
+    from services.rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+
+    limiter = OutboundLimiter() if limited else None
+    # Same connection pool the Application builds, so the pool is not the bottleneck.
+    request = HTTPXRequest(connection_pool_size=256)
+    bot = ExtBot("123456:BENCH", base_url=telegram.base_url, rate_limiter=limiter, request=request)
+    delivered = dropped = 0
+    interactive: list[float] = []
+
+    async def send(chat_id: int, text: str, priority: int) -> bool:
+        nonlocal delivered, dropped
+        kwargs = {"rate_limit_args": priority} if limited else {}
+        try:
+            await bot.send_message(chat_id=chat_id, text=text, **kwargs)
+        except RetryAfter:
+            dropped += 1
+            return False
+        delivered += 1
+        return True
+
+    async def broadcast():
+        # An alert sweep: every chat gets one message, some chats several.
+        sends = [send(100_000 + i, f"alert {i}", PRIORITY_BACKGROUND) for i in range(args.chats)]
+        sends += [send(100_000 + i, f"alert {i}.{n}", PRIORITY_BACKGROUND)
+                  for i in range(args.busy_chats) for n in range(1, args.per_busy_chat)]
+        await asyncio.gather(*sends)
+
+    async def users():
+        await asyncio.sleep(0.2)
+        for i in range(args.interactive):
+            started = time.perf_counter()
+            if await send(200_000 + i, f"reply {i}", PRIORITY_INTERACTIVE):
+                interactive.append(time.perf_counter() - started)
+            await asyncio.sleep(args.interactive_gap)
+
+    telegram.reset_limits()
+    floods = telegram.floods
+    async with bot:
+        started = time.perf_counter()
+        await asyncio.gather(broadcast(), users())
+        wall = time.perf_counter() - started
+    return {
+        "delivered": delivered,
+        "dropped": dropped,
+        "http_429": telegram.floods - floods,
+        "retries": limiter.retries if limiter else 0,
+        "wall_s": wall,
+        "msgs_per_s": delivered / wall,
+        "interactive": percentiles(interactive),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Broadcast throughput against emulated Telegram flood limits")
+    parser.add_argument("--chats", type=int, default=300)
+    parser.add_argument("--busy-chats", type=int, default=20)
+    parser.add_argument("--per-busy-chat", type=int, default=5)
+    parser.add_argument("--interactive", type=int, default=20)
+    parser.add_argument("--interactive-gap", type=float, default=0.25)
+    parser.add_argument("--telegram-latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    telegram = FakeTelegram(latency=args.telegram_latency, flood_limits=True).start()
+    os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123456:BENCH")
+    try:
+        results = {name: asyncio.run(run(args, telegram, name == "limited")) for name in ("direct", "limited")}
+    finally:
+        telegram.stop()
+
+    total = args.chats + args.busy_chats * (args.per_busy_chat - 1) + args.interactive
+    print(f"{total} messages, fake API limits {telegram.global_rate:g}/s global, {telegram.chat_rate:g}/s per chat")
+    print(f"{'':<8} {'delivered':>9} {'dropped':>8} {'429s':>6} {'retries':>8} {'wall s':>7} {'msg/s':>6} "
+          f"{'reply p50 ms':>12} {'reply p95 ms':>12}")
+    for name, r in results.items():
+        stats = r["interactive"]
+        print(f"{name:<8} {r['delivered']:>9} {r['dropped']:>8} {r['http_429']:>6} {r['retries']:>8} "
+              f"{r['wall_s']:>7.2f} {r['msgs_per_s']:>6.1f} {stats.get('p50_ms', 0):>12.1f} "
+              f"{stats.get('p95_ms', 0):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+HEAVY = ("numpy", "pandas", "matplotlib")
+
+
+def loaded() -> list[str]:
+    return [name for name in HEAVY if name in sys.modules]
+
+
+async def child(args, spawned_at: float) -> dict:
+    # benchmarks.e2e pulls in numpy, so the child process must not import it before main does.
+    from telegram import Update
+
+    started = time.perf_counter()
+    bot_main = importlib.import_module("main")
+    if args.eager:
+        for module in bot_main.PREWARM_MODULES + ("services.charts",):
+            importlib.import_module(module)
+    imported = time.perf_counter()
+    after_import = loaded()
+
+    app = bot_main.build_app("123456:BENCH", base_url=os.environ["TELEGRAM_BASE_URL"])
+    await app.initialize()
+    await app.post_init(app)
+    await app.start()
+    ready = time.perf_counter()
+
+    from benchmarks.e2e import FLOWS, UpdateFactory
+
+    factory = UpdateFactory()
+    update = factory.build(1, "msg", "/start")
+    update["message"]["entities"] = [{"type": "bot_command", "offset": 0, "length": 6}]
+    await app.process_update(Update.de_json(update, app.bot))
+    first_reply = time.perf_counter()
+    first_reply_wall = time.time() - spawned_at
+
+    for _, kind, payload in FLOWS["riskreward"](None, None):
+        await app.process_update(Update.de_json(factory.build(2, kind, payload), app.bot))
+    riskreward = time.perf_counter()
+
+    modules = bot_main.PREWARM_MODULES + ("services.charts",)
+    while not all(module in sys.modules for module in modules) or app.job_queue.get_jobs_by_name("prewarm"):
+        await asyncio.sleep(0.01)
+    await sys.modules["services.charts"].chart_renderer.warm_up()
+    prewarmed = time.perf_counter()
+
+    flow_started = time.perf_counter()
+    for _, kind, payload in FLOWS["rsi"]("btc", 30):
+        await app.process_update(Update.de_json(factory.build(3, kind, payload), app.bot))
+    rsi = time.perf_counter() - flow_started
+
+    await app.stop()
+    await app.shutdown()
+    await app.post_shutdown(app)
+    return {
+        "import_s": round(imported - started, 4),
+        "start_s": round(ready - imported, 4),
+        "first_reply_s": round(first_reply - ready, 4),
+        "spawn_to_first_reply_s": round(first_reply_wall, 4),
+        "loaded_after_import": after_import,
+        "riskreward_flow_s": round(riskreward - first_reply, 4),
+        "prewarm_done_s": round(prewarmed - started, 4),
+        "rsi_flow_after_prewarm_s": round(rsi, 4),
+    }
+
+
+def measure(eager: bool, env: dict) -> dict:
+    command = [sys.executable, "-m", "benchmarks.startup", "--child", str(time.time())]
+    if eager:
+        command.append("--eager")
+    output = subprocess.run(command, env=env, capture_output=True, text=True)
+    if output.returncode:
+        raise RuntimeError(output.stderr)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start: time until the bot answers /start, with a budget")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=1.5,
+                        help="fail if spawn-to-first-reply (median) exceeds this many seconds")
+    parser.add_argument("--child", type=float, help=argparse.SUPPRESS)
+    parser.add_argument("--eager", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(asyncio.run(child(args, args.child))))
+        return
+
+    from benchmarks.fake_coingecko import FakeCoinGecko
+    from benchmarks.fake_telegram import FakeTelegram
+    from benchmarks.stores import temp_stores
+
+    coingecko = FakeCoinGecko().start()
+    telegram = FakeTelegram().start()
+    try:
+        with temp_stores("startup-"):
+            env = dict(os.environ, TELEGRAM_BASE_URL=telegram.base_url, COINGECKO_BASE_URL=coingecko.base_url,
+                       METRICS_PORT="0")
+            results = {mode: [measure(mode == "eager", env) for _ in range(args.runs)] for mode in ("eager", "lazy")}
+    finally:
+        coingecko.stop()
+        telegram.stop()
+
+    keys = ("import_s", "start_s", "first_reply_s", "spawn_to_first_reply_s", "riskreward_flow_s",
+            "prewarm_done_s", "rsi_flow_after_prewarm_s")
+    medians = {mode: {key: sorted(r[key] for r in runs)[len(runs) // 2] for key in keys}
+               for mode, runs in results.items()}
+    print(f"{'':<26} {'eager':>8} {'lazy':>8}")
+    for key in keys:
+        print(f"{key:<26} {medians['eager'][key]:>8.3f} {medians['lazy'][key]:>8.3f}")
+    for mode, runs in results.items():
+        print(f"{mode} import loads: {', '.join(runs[0]['loaded_after_import']) or 'none of ' + ', '.join(HEAVY)}")
+
+    spent = medians["lazy"]["spawn_to_first_reply_s"]
+    if spent > args.budget:
+        print(f"FAIL: first reply after {spent:.3f}s, budget {args.budget:.3f}s")
+        sys.exit(1)
+    print(f"OK: first reply after {spent:.3f}s, budget {args.budget:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import contextlib
+import os
+import tempfile
+
+
+def store_paths(data_dir: str) -> dict[str, str]:
+    return {
+        "OHLC_STORE_DIR": os.path.join(data_dir, "ohlc"),
+        "COIN_INDEX_PATH": os.path.join(data_dir, "coin_index.json.gz"),
+        "ALERTS_DB_PATH": os.path.join(data_dir, "alerts.sqlite3"),
+        "PERSISTENCE_PATH": os.path.join(data_dir, "state.sqlite3"),
+    }
+
+
+# Points every on-disk store at a fresh directory, removed when the benchmark is done. services
+# modules read config at import, so they must be imported inside the block.
+@contextlib.contextmanager
+def temp_stores(prefix: str):
+    with tempfile.TemporaryDirectory(prefix=prefix) as data_dir:
+        os.environ.update(store_paths(data_dir))
+        yield data_dir
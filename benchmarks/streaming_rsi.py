@@ -0,0 +1,43 @@
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.fake_coingecko import synthetic_ohlc
+from services.metrics import calculate_rsi
+from services.streaming_rsi import StreamingRSI
+
+
+def make_frame(coin_id: str, days: int) -> pd.DataFrame:
+    df = pd.DataFrame(synthetic_ohlc(coin_id, days, now=1_700_000_000),
+                      columns=["timestamp", "open", "high", "low", "close"])
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming RSI per-candle cost vs a batch recompute")
+    parser.add_argument("--length", type=int, default=14)
+    parser.add_argument("--updates", type=int, default=200000)
+    args = parser.parse_args()
+
+    df = make_frame("bitcoin", 30)
+    closes = df["close"].tolist()
+
+    started = time.perf_counter()
+    for _ in range(200):
+        calculate_rsi(df, args.length)
+    batch = (time.perf_counter() - started) / 200
+
+    rsi = StreamingRSI.from_history(df, args.length)
+    started = time.perf_counter()
+    for i in range(args.updates):
+        rsi.update(closes[i % len(closes)])
+    update = (time.perf_counter() - started) / args.updates
+
+    print(f"batch calculate_rsi over {len(df)} candles : {batch * 1e6:.1f} us")
+    print(f"streaming update per candle          : {update * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import asyncio
+import functools
+import importlib
+import json
+import os
+import socket
+import time
+
+import httpx
+
+from benchmarks.e2e import COINS, DAYS, FLOWS, UpdateFactory, percentiles
+from benchmarks.fake_coingecko import FakeCoinGecko
+from benchmarks.fake_telegram import FakeTelegram
+from benchmarks.stores import temp_stores
+
+TOKEN = "123456:BENCH"
+# The RSI chart carries its analysis as a caption, unless the chart queue is full.
+TERMINAL = {("volatility", "timeframe"): ("editMessageText",), ("rsi", "timeframe"): ("sendPhoto", "sendMessage")}
+
+
+async def wait_for(predicate, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        await asyncio.sleep(0.005)
+    return True
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run(args, workers: int, telegram: FakeTelegram) -> dict:
+    bot_main = importlib.import_module("main")
+    webhook = importlib.import_module("services.webhook")
+
+    ready = telegram.calls.get("getMe", 0) + workers
+    factory = functools.partial(bot_main.build_app, TOKEN, base_url=telegram.base_url)
+    pool = webhook.WorkerPool(factory, workers, free_port()).start()
+    server = await webhook.serve_webhook(pool.dispatch, "127.0.0.1", 0, "/hook")
+    url = "http://127.0.0.1:%d/hook" % server.sockets[0].getsockname()[1]
+    if not await wait_for(lambda: telegram.calls.get("getMe", 0) >= ready, 120):
+        raise RuntimeError("workers did not start")
+    await asyncio.sleep(args.settle)
+
+    updates = UpdateFactory()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    flows: list[float] = []
+    timeouts = 0
+
+    async def run_user(client: httpx.AsyncClient, index: int):
+        nonlocal timeouts
+        user_id = workers * 1_000_000 + index
+        flow = args.flows[index % len(args.flows)]
+        steps = FLOWS[flow](COINS[index % len(COINS)], DAYS[index % len(DAYS)])
+        async with semaphore:
+            started = time.perf_counter()
+            for stage, kind, payload in steps:
+                methods = TERMINAL.get((flow, stage), ("sendMessage",))
+                replies = lambda: sum(telegram.chat_calls.get((user_id, m), 0) for m in methods)
+                target = replies() + 1
+                await client.post(url, content=json.dumps(updates.build(user_id, kind, payload)))
+                if not await wait_for(lambda: replies() >= target, args.step_timeout):
+                    timeouts += 1
+                    return
+                await asyncio.sleep(args.think)
+            flows.append(time.perf_counter() - started)
+
+    try:
+        async with httpx.AsyncClient(limits=httpx.Limits(max_connections=args.concurrency)) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(run_user(client, i) for i in range(args.users)))
+            wall = time.perf_counter() - started
+    finally:
+        server.close()
+        await pool.shutdown()
+
+    return {
+        "workers": workers,
+        "wall_s": round(wall, 3),
+        "flows_per_s": round(len(flows) / wall, 2),
+        "timeouts": timeouts,
+        "flow_latency": percentiles(flows),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Webhook throughput with 1..N worker processes")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--users", type=int, default=120)
+    parser.add_argument("--concurrency", type=int, default=40)
+    parser.add_argument("--flows", nargs="+", default=list(FLOWS), choices=list(FLOWS))
+    parser.add_argument("--coingecko-latency", type=float, default=0.05)
+    parser.add_argument("--telegram-latency", type=float, default=0.02)
+    parser.add_argument("--step-timeout", type=float, default=30)
+    parser.add_argument("--think", type=float, default=0.2, help="pause between a reply and the user's next step")
+    parser.add_argument("--settle", type=float, default=2)
+    args = parser.parse_args()
+
+    coingecko = FakeCoinGecko(latency=args.coingecko_latency).start()
+    telegram = FakeTelegram(latency=args.telegram_latency).start()
+    os.environ.update({
+        "TELEGRAM_BOT_TOKEN": TOKEN,
+        "COINGECKO_BASE_URL": coingecko.base_url,
+        "COINGECKO_RATE_PER_MINUTE": "600000",
+        "COINGECKO_BURST": "1000",
+        # Replayed flows have no think time and the fake API has no flood limits; send pacing is
+        # measured separately by benchmarks.send_queue.
+        "TELEGRAM_GLOBAL_RATE": "100000",
+        "TELEGRAM_GLOBAL_BURST": "100000",
+        "TELEGRAM_CHAT_RATE": "100000",
+        "TELEGRAM_CHAT_BURST": "100000",
+        "TELEGRAM_GROUP_RATE_PER_MINUTE": "6000000",
+        "METRICS_PORT": "0",
+        "CHART_WORKERS": str(max(args.workers)),
+    })
+    print(f"{'workers':>8} {'wall s':>8} {'flows/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'timeouts':>9}")
+    try:
+        baseline = None
+        for workers in args.workers:
+            with temp_stores(f"webhook-{workers}-"):
+                result = asyncio.run(run(args, workers, telegram))
+            baseline = baseline or result["flows_per_s"]
+            latency = result["flow_latency"]
+            print(f"{workers:>8} {result['wall_s']:>8.2f} {result['flows_per_s']:>8.2f} "
+                  f"{latency.get('p50_ms', 0):>8.0f} {latency.get('p95_ms', 0):>8.0f} {result['timeouts']:>9}"
+                  f"   x{result['flows_per_s'] / baseline if baseline else 0:.2f}")
+    finally:
+        coingecko.stop()
+        telegram.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,86 @@
+import os
 
 RSI_COIN, RSI_TIMEFRAME = range(2)
 
 VOLATILITY_COIN, VOLATILITY_TIMEFRAME = range(2)
 
 RISKREWARD_ENTRY, RISKREWARD_STOP, RISKREWARD_TARGET = range(3)
+
+COINGECKO_BASE_URL = os.environ.get("COINGECKO_BASE_URL", "https://api.coingecko.com/api/v3")
+COINGECKO_TIMEOUT = float(os.environ.get("COINGECKO_TIMEOUT", "10"))
+COINGECKO_MAX_CONNECTIONS = int(os.environ.get("COINGECKO_MAX_CONNECTIONS", "20"))
+COINGECKO_MAX_CONCURRENCY = int(os.environ.get("COINGECKO_MAX_CONCURRENCY", "8"))
+COINGECKO_RATE_PER_MINUTE = float(os.environ.get("COINGECKO_RATE_PER_MINUTE", "30"))
+COINGECKO_BURST = int(os.environ.get("COINGECKO_BURST", "5"))
+COINGECKO_MAX_RETRIES = int(os.environ.get("COINGECKO_MAX_RETRIES", "3"))
+COINGECKO_BACKOFF = float(os.environ.get("COINGECKO_BACKOFF", "1"))
+COINGECKO_BREAKER_FAILURES = int(os.environ.get("COINGECKO_BREAKER_FAILURES", "5"))
+COINGECKO_BREAKER_RESET = float(os.environ.get("COINGECKO_BREAKER_RESET", "30"))
+
+OHLC_CACHE_SIZE = int(os.environ.get("OHLC_CACHE_SIZE", "512"))
+OHLC_CACHE_MIN_TTL = float(os.environ.get("OHLC_CACHE_MIN_TTL", "60"))
+
+COIN_INDEX_PATH = os.environ.get("COIN_INDEX_PATH", "data/coin_index.json.gz")
+COIN_INDEX_REFRESH = float(os.environ.get("COIN_INDEX_REFRESH", str(24 * 3600)))
+
+CHART_WORKERS = int(os.environ.get("CHART_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+CHART_QUEUE_SIZE = int(os.environ.get("CHART_QUEUE_SIZE", "32"))
+CHART_CACHE_MAX_BYTES = int(os.environ.get("CHART_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CHART_CACHE_MAX_ENTRIES = int(os.environ.get("CHART_CACHE_MAX_ENTRIES", "4096"))
+CHART_RENDERER = os.environ.get("CHART_RENDERER", "fast")
+CHART_FORMAT = os.environ.get("CHART_FORMAT", "png")
+
+OHLC_STORE_DIR = os.environ.get("OHLC_STORE_DIR", "data/ohlc")
+OHLC_STORE_READONLY = os.environ.get("OHLC_STORE_READONLY", "0") == "1"
+OHLC_STORE_OPEN_MAPS = int(os.environ.get("OHLC_STORE_OPEN_MAPS", "64"))
+
+SCAN_LIMIT = int(os.environ.get("SCAN_LIMIT", "250"))
+SCAN_TIMEOUT = float(os.environ.get("SCAN_TIMEOUT", "20"))
+SCAN_TOP = int(os.environ.get("SCAN_TOP", "10"))
+
+ALERTS_DB_PATH = os.environ.get("ALERTS_DB_PATH", "data/alerts.sqlite3")
+ALERT_CHECK_INTERVAL = float(os.environ.get("ALERT_CHECK_INTERVAL", "60"))
+ALERTS_PER_CHAT = int(os.environ.get("ALERTS_PER_CHAT", "20"))
+RSI_STREAMS_MAX = int(os.environ.get("RSI_STREAMS_MAX", "10000"))
+RSI_STREAM_IDLE = float(os.environ.get("RSI_STREAM_IDLE", "3600"))
+
+MARKET_SNAPSHOT_TOP = int(os.environ.get("MARKET_SNAPSHOT_TOP", "250"))
+MARKET_SNAPSHOT_INTERVAL = float(os.environ.get("MARKET_SNAPSHOT_INTERVAL", "120"))
+MARKET_SNAPSHOT_MAX_AGE = float(os.environ.get("MARKET_SNAPSHOT_MAX_AGE", "300"))
+MARKET_SNAPSHOT_TRACKED = int(os.environ.get("MARKET_SNAPSHOT_TRACKED", "1000"))
+MARKET_DASHBOARD_DEFAULT = int(os.environ.get("MARKET_DASHBOARD_DEFAULT", "20"))
+MARKET_DASHBOARD_MAX = int(os.environ.get("MARKET_DASHBOARD_MAX", "100"))
+
+INLINE_DAYS = int(os.environ.get("INLINE_DAYS", "14"))
+INLINE_RESULTS = int(os.environ.get("INLINE_RESULTS", "10"))
+INLINE_HOT_COINS = int(os.environ.get("INLINE_HOT_COINS", "100"))
+INLINE_REFRESH_INTERVAL = float(os.environ.get("INLINE_REFRESH_INTERVAL", "300"))
+INLINE_SUMMARY_MAX_AGE = float(os.environ.get("INLINE_SUMMARY_MAX_AGE", "900"))
+INLINE_MISS_WAIT = float(os.environ.get("INLINE_MISS_WAIT", "1.5"))
+INLINE_CACHE_TIME = int(os.environ.get("INLINE_CACHE_TIME", "60"))
+
+LIVE_PRICE_COINS = int(os.environ.get("LIVE_PRICE_COINS", "100"))
+LIVE_PRICE_INTERVAL = float(os.environ.get("LIVE_PRICE_INTERVAL", "60"))
+LIVE_PRICE_MAX_AGE = float(os.environ.get("LIVE_PRICE_MAX_AGE", "300"))
+LIVE_PRICE_SEEDS_PER_POLL = int(os.environ.get("LIVE_PRICE_SEEDS_PER_POLL", "20"))
+
+TELEGRAM_GLOBAL_RATE = float(os.environ.get("TELEGRAM_GLOBAL_RATE", "30"))
+TELEGRAM_GLOBAL_BURST = int(os.environ.get("TELEGRAM_GLOBAL_BURST", "30"))
+TELEGRAM_CHAT_RATE = float(os.environ.get("TELEGRAM_CHAT_RATE", "1"))
+TELEGRAM_CHAT_BURST = int(os.environ.get("TELEGRAM_CHAT_BURST", "3"))
+TELEGRAM_GROUP_RATE_PER_MINUTE = float(os.environ.get("TELEGRAM_GROUP_RATE_PER_MINUTE", "20"))
+TELEGRAM_MAX_RETRIES = int(os.environ.get("TELEGRAM_MAX_RETRIES", "3"))
+
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9108"))
+ADMIN_IDS = {int(i) for i in os.environ.get("ADMIN_IDS", "").split(",") if i.strip()}
+
+PERSISTENCE_PATH = os.environ.get("PERSISTENCE_PATH", "data/state.sqlite3")
+PERSISTENCE_INTERVAL = float(os.environ.get("PERSISTENCE_INTERVAL", "1"))
+
+WEBHOOK_URL = os.environ.get("WEBHOOK_URL", "")
+WEBHOOK_LISTEN = os.environ.get("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.environ.get("WEBHOOK_PORT", "8443"))
+WEBHOOK_SECRET = os.environ.get("WEBHOOK_SECRET", "")
+WEBHOOK_WORKERS = int(os.environ.get("WEBHOOK_WORKERS", "1"))
+WORKER_INDEX = int(os.environ.get("WORKER_INDEX", "0"))
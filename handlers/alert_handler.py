@@ -0,0 +1,76 @@
+import math
+from telegram import Update
+from telegram.ext import ContextTypes
+from services.alert_store import alert_store, METRICS, OPERATORS
+from services.alerts import METRIC_LABELS
+from services.coin_index import resolve_coin_id
+from config import ALERTS_PER_CHAT
+
+ALERT_DAYS = (1, 7, 14, 30, 90)
+METRIC_ALIASES = {"rsi": "rsi", "vol": "volatility", "volatility": "volatility"}
+
+ALERT_USAGE = (
+    "راهنمای هشدار:\n"
+    "/alert btc 14 rsi < 30\n"
+    "/alert eth 7 vol > 80\n"
+    "بازه‌ها: 1، 7، 14، 30، 90 روز"
+)
+
+
+async def alert_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    args = context.args or []
+    if len(args) != 5:
+        await update.message.reply_text(ALERT_USAGE)
+        return
+
+    coin_query, days_text, metric_text, op, threshold_text = args
+    metric = METRIC_ALIASES.get(metric_text.lower())
+    try:
+        days = int(days_text)
+        threshold = float(threshold_text)
+    except ValueError:
+        days, threshold = 0, 0.0
+    # nan and inf parse as floats but would never or always fire.
+    if days not in ALERT_DAYS or metric not in METRICS or op not in OPERATORS or not math.isfinite(threshold):
+        await update.message.reply_text(ALERT_USAGE)
+        return
+
+    chat_id = update.effective_chat.id
+    if len(alert_store.for_chat(chat_id)) >= ALERTS_PER_CHAT:
+        await update.message.reply_text(f"⚠️ حداکثر {ALERTS_PER_CHAT} هشدار برای هر گفتگو مجاز است.")
+        return
+
+    coin_id = await resolve_coin_id(coin_query)
+    if not coin_id:
+        await update.message.reply_text("⚠️ کوین مورد نظر پیدا نشد. لطفا دوباره تلاش کنید.")
+        return
+
+    alert_id = alert_store.add(chat_id, coin_id, days, metric, op, threshold)
+    await update.message.reply_text(
+        f"✅ هشدار #{alert_id} ثبت شد: {METRIC_LABELS[metric]} **{coin_id}** ({days} روز) {op} {threshold:g}",
+        parse_mode='Markdown'
+    )
+
+
+async def alerts_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    rows = alert_store.for_chat(update.effective_chat.id)
+    if not rows:
+        await update.message.reply_text("هیچ هشدار فعالی ندارید.\n\n" + ALERT_USAGE)
+        return
+
+    lines = [f"#{alert_id}: {coin_id} {days}d {METRIC_LABELS[metric]} {op} {threshold:g}"
+             for alert_id, coin_id, days, metric, op, threshold in rows]
+    await update.message.reply_text("🔔 هشدارهای شما:\n" + "\n".join(lines) + "\n\nبرای حذف: /unalert شماره")
+
+
+async def unalert_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    try:
+        alert_id = int((context.args or [""])[0].lstrip("#"))
+    except ValueError:
+        await update.message.reply_text("لطفا شماره هشدار را وارد کنید. مثال: /unalert 3")
+        return
+
+    if alert_store.remove(update.effective_chat.id, alert_id):
+        await update.message.reply_text(f"🗑 هشدار #{alert_id} حذف شد.")
+    else:
+        await update.message.reply_text("⚠️ هشداری با این شماره پیدا نشد.")
@@ -0,0 +1,67 @@
+import asyncio
+from telegram import Update, InlineQueryResultArticle, InputTextMessageContent
+from telegram.ext import ContextTypes
+from services.coin_index import search_coin_ids, coin_symbol
+from services.coin_summary import summary_table, CoinSummary
+from services.instrumentation import telemetry
+from services.metrics import OVERSOLD, OVERBOUGHT
+from config import INLINE_RESULTS, INLINE_MISS_WAIT, INLINE_CACHE_TIME
+
+MISS_FETCH_LIMIT = 3
+
+
+def rsi_state(rsi: float | None) -> str:
+    if rsi is None:
+        return "نامشخص"
+    if rsi < OVERSOLD:
+        return "اشباع فروش"
+    if rsi > OVERBOUGHT:
+        return "اشباع خرید"
+    return "تعادلی"
+
+
+def summary_article(row: CoinSummary) -> InlineQueryResultArticle:
+    symbol = coin_symbol(row.coin_id).upper()
+    rsi_text = f"{row.rsi:.2f}" if row.rsi is not None else "N/A"
+    volatility_text = f"{row.volatility:.2f}%" if row.volatility is not None else "N/A"
+    price_text = f"${row.last_price:,.6g}"
+    text = (
+        f"📊 **{row.coin_id}** ({symbol}) - {row.days} روز گذشته:\n"
+        f"💰 قیمت: `{price_text}`\n"
+        f"📈 RSI: `{rsi_text}` ({rsi_state(row.rsi)})\n"
+        f"📉 نوسان سالانه: `{volatility_text}`"
+    )
+    return InlineQueryResultArticle(
+        id=f"{row.coin_id}:{row.days}"[:64],
+        title=f"{symbol} · {price_text}",
+        description=f"RSI {rsi_text} ({rsi_state(row.rsi)}) · نوسان {volatility_text}",
+        input_message_content=InputTextMessageContent(text, parse_mode='Markdown'),
+    )
+
+
+@telemetry.timed("handler:inline_query")
+async def inline_query(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = update.inline_query.query.strip()
+    if query:
+        coin_ids = await search_coin_ids(query, INLINE_RESULTS)
+        if coin_ids:
+            summary_table.record(coin_ids[0])
+    else:
+        coin_ids = summary_table.hot(INLINE_RESULTS)
+
+    rows = {coin_id: summary_table.get(coin_id) for coin_id in coin_ids}
+    missing = [c for c, row in rows.items() if row is None]
+    telemetry.inc("bot_inline_queries_total", result="hit" if not missing else "miss")
+
+    # Misses are computed in shared background tasks. A query only waits (briefly) when its best
+    # match is missing; otherwise it answers at once, uncached, so a later keystroke picks them up.
+    tasks = {c: summary_table.fetch(c) for c in missing[:MISS_FETCH_LIMIT]}
+    if coin_ids and coin_ids[0] in tasks:
+        await asyncio.wait([tasks[coin_ids[0]]], timeout=INLINE_MISS_WAIT)
+        for coin_id, task in tasks.items():
+            if task.done() and not task.cancelled() and task.exception() is None:
+                rows[coin_id] = task.result()
+
+    results = [summary_article(row) for row in rows.values() if row is not None]
+    complete = all(row is not None for row in rows.values())
+    await update.inline_query.answer(results, cache_time=INLINE_CACHE_TIME if complete else 0, is_personal=False)
@@ -0,0 +1,43 @@
+import asyncio
+from telegram import Update
+from telegram.ext import ContextTypes
+from services.coin_index import resolve_coin_id
+from services.market_snapshot import market_snapshot
+from services.instrumentation import telemetry
+from config import MARKET_DASHBOARD_DEFAULT, MARKET_DASHBOARD_MAX
+
+ROWS_PER_MESSAGE = 50
+
+
+def format_market_row(row: dict) -> str:
+    rank = row.get("market_cap_rank") or "-"
+    symbol = (row.get("symbol") or row["id"]).upper()[:8]
+    price = row.get("current_price")
+    change = row.get("price_change_percentage_24h")
+    price_text = f"{price:,.6g}" if price is not None else "N/A"
+    change_text = f"{change:+.2f}%" if change is not None else "N/A"
+    return f"{str(rank):>4} {symbol:<8} {price_text:>12} {change_text:>8}"
+
+
+@telemetry.timed("handler:market_command")
+async def market_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    args = context.args or []
+
+    if not args or (len(args) == 1 and args[0].isdigit()):
+        count = max(1, min(int(args[0]) if args else MARKET_DASHBOARD_DEFAULT, MARKET_DASHBOARD_MAX))
+        rows = await market_snapshot.ensure_top(count)
+        title = f"📋 {count} کوین برتر بازار:"
+    else:
+        coin_ids = await asyncio.gather(*(resolve_coin_id(a) for a in args[:MARKET_DASHBOARD_MAX]))
+        coin_ids = list(dict.fromkeys(c for c in coin_ids if c))
+        rows = await market_snapshot.ensure(coin_ids)
+        title = "📋 وضعیت کوین‌های انتخابی:"
+
+    if not rows:
+        await update.message.reply_text("❌ داده‌ای از بازار دریافت نشد. لطفا دوباره تلاش کنید.")
+        return
+
+    for start in range(0, len(rows), ROWS_PER_MESSAGE):
+        table = "\n".join(format_market_row(r) for r in rows[start:start + ROWS_PER_MESSAGE])
+        header = f"{title}\n" if start == 0 else ""
+        await update.message.reply_text(f"{header}```\n{table}\n```", parse_mode='Markdown')
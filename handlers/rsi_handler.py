@@ -1,46 +1,51 @@
-import asyncio
-import io
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+import numpy as np
 import pandas as pd
 from telegram import Update, InputFile, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes, ConversationHandler
-from services.coingecko_api import find_coin_id, fetch_ohlc_history
-from services.metrics import calculate_rsi
+from services.coin_index import resolve_coin_id
+from services.indicators import get_indicators
+from services.coin_summary import summary_table
+from services.metrics import OVERSOLD, OVERBOUGHT
+from services.charts import chart_renderer, ChartQueueFull
+from services.chart_cache import chart_cache
+from services.rate_limiter import SingleFlight
+from services.instrumentation import telemetry
 from utils.helpers import format_number
 from config import RSI_COIN, RSI_TIMEFRAME
 
+_chart_renders = SingleFlight()
 
-def generate_rsi_chart(df: pd.DataFrame, rsi_values: pd.Series, coin_id: str, days: int):
-    plt.style.use('dark_background')
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10), gridspec_kw={'height_ratios': [3, 1]})
+CAPTION_LIMIT = 1024
 
-    if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
 
-    ax1.plot(df['timestamp'], df['close'], label=f'{coin_id.capitalize()} Price', color='white')
-    ax1.set_title(f'Price and RSI for {coin_id.capitalize()} over {days} days', color='white', fontsize=16)
-    ax1.set_ylabel('Price (USD)', color='white')
-    ax1.grid(True, linestyle='--', alpha=0.5)
-    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
-    fig.autofmt_xdate()
-    ax1.legend(loc='best')
+async def send_rsi_chart(context: ContextTypes.DEFAULT_TYPE, chat_id: int, df: pd.DataFrame,
+                         rsi_values: np.ndarray, coin_id: str, days: int, caption: str | None = None):
+    chart_key = (coin_id, days, df["timestamp"].iloc[-1].value)
+    chart_bytes, file_id = chart_cache.get(chart_key)
 
-    ax2.plot(df['timestamp'], rsi_values, label='RSI', color='cyan')
-    ax2.set_xlabel('Date', color='white')
-    ax2.set_ylabel('RSI Value', color='white')
-    ax2.axhline(y=70, color='red', linestyle='--', label='Overbought (70)')
-    ax2.axhline(y=30, color='green', linestyle='--', label='Oversold (30)')
-    ax2.fill_between(df['timestamp'], 70, 100, color='red', alpha=0.2)
-    ax2.fill_between(df['timestamp'], 0, 30, color='green', alpha=0.2)
-    ax2.grid(True, linestyle='--', alpha=0.5)
-    ax2.legend(loc='best')
+    if file_id is not None:
+        try:
+            with telemetry.span("send_photo"):
+                await context.bot.send_photo(chat_id=chat_id, photo=file_id, caption=caption,
+                                             parse_mode='Markdown' if caption else None)
+            return
+        except BadRequest:
+            chart_cache.invalidate(chart_key)
 
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight')
-    plt.close(fig)
-    buf.seek(0)
-    return buf
+    if chart_bytes is None:
+        with telemetry.span("generate_rsi_chart"):
+            chart_bytes = await _chart_renders.do(chart_key, lambda: chart_renderer.render(
+                df["timestamp"].to_numpy(), df["close"].to_numpy(), rsi_values, coin_id, days
+            ))
+        chart_cache.put_bytes(chart_key, chart_bytes)
+
+    with telemetry.span("send_photo"):
+        filename = f'{coin_id}_rsi_chart.{chart_renderer.image_format}'
+        message = await context.bot.send_photo(chat_id=chat_id, photo=InputFile(chart_bytes, filename=filename),
+                                               caption=caption, parse_mode='Markdown' if caption else None)
+    if message.photo:
+        chart_cache.put_file_id(chart_key, message.photo[-1].file_id)
 
 
 async def rsi_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -52,10 +57,10 @@ async def rsi_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     return RSI_COIN
 
 
+@telemetry.timed("handler:get_rsi_coin")
 async def get_rsi_coin(update: Update, context: ContextTypes.DEFAULT_TYPE):
     coin_query = update.message.text.strip()
-    coin_id = find_coin_id(coin_query)
-    await asyncio.sleep(1)
+    coin_id = await resolve_coin_id(coin_query)
     if not coin_id:
         await update.message.reply_text("⚠️ کوین مورد نظر پیدا نشد. لطفا دوباره تلاش کنید.")
         return RSI_COIN
@@ -86,6 +91,7 @@ async def get_rsi_coin(update: Update, context: ContextTypes.DEFAULT_TYPE):
     return RSI_TIMEFRAME
 
 
+@telemetry.timed("handler:get_rsi_timeframe")
 async def get_rsi_timeframe(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
@@ -93,31 +99,25 @@ async def get_rsi_timeframe(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     days = int(query.data.split('_')[-1])
     coin_id = context.user_data.get('coin_id')
+    summary_table.record(coin_id)
 
-    df = fetch_ohlc_history(coin_id, days)
-    await asyncio.sleep(1)
-    if df.empty or 'close' not in df.columns or 'timestamp' not in df.columns:
+    result = await get_indicators(coin_id, days)
+    if result is None or 'timestamp' not in result.frame.columns:
         await query.edit_message_text("❌ داده‌ای برای این کوین یافت نشد. لطفا دوباره تلاش کنید.")
         return ConversationHandler.END
 
-    rsi_values = calculate_rsi(df, length=14)
-    if rsi_values is None or rsi_values.empty or len(rsi_values) < 2 or pd.isna(rsi_values.iloc[-1]):
+    df, analysis = result.frame, result.values
+    rsi_values = analysis.rsi
+    if len(rsi_values) < 2 or np.isnan(rsi_values[-1]):
         await query.edit_message_text(
             "⚠️ محاسبه RSI امکان‌پذیر نبود یا داده کافی وجود ندارد. لطفا بازه زمانی دیگری را انتخاب کنید.")
         return ConversationHandler.END
 
-    rsi_value = rsi_values.iloc[-1]
-    last_price = df["close"].iloc[-1]
-
-    returns = df["close"].pct_change().dropna()
-    volatility = returns.std() if not returns.empty else 0.02
-
-    risk_pct = volatility * 1.5
-    reward_pct = volatility * 3
-
-    signal, explanation, entry_price, stop_loss, take_profit, rr_ratio = (None,) * 6
+    rsi_value = rsi_values[-1]
+    last_price = analysis.last_price
+    entry_price, stop_loss, take_profit, rr_ratio = analysis.entry, analysis.stop, analysis.target, analysis.rr_ratio
 
-    if rsi_value < 30:
+    if rsi_value < OVERSOLD:
         signal = "✅ سیگنال ورود به خرید (اشباع فروش)"
         explanation = (
             "شاخص RSI زیر ۳۰ قرار گرفته است که نشان‌دهنده شرایط اشباع فروش است. "
@@ -126,11 +126,8 @@ async def get_rsi_timeframe(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "با این حال، توصیه می‌شود قبل از ورود، به حجم معاملات و سایر شاخص‌های تکمیلی نیز توجه کنید. "
             "حد ضرر بر اساس نوسانات واقعی بازار و با حفظ نسبت ریسک به ریوارد منطقی تعیین شده است."
         )
-        entry_price = last_price
-        stop_loss = entry_price * (1 - risk_pct)
-        take_profit = entry_price * (1 + reward_pct)
 
-    elif rsi_value > 70:
+    elif rsi_value > OVERBOUGHT:
         signal = "🔻 سیگنال خروج یا فروش (اشباع خرید)"
         explanation = (
             "شاخص RSI بالای ۷۰ است که نشان‌دهنده شرایط اشباع خرید است. "
@@ -139,9 +136,6 @@ async def get_rsi_timeframe(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "با رعایت حد ضرر و مدیریت ریسک وارد موقعیت فروش می‌شوند. "
             "حد ضرر و حد سود بر اساس نوسانات واقعی بازار و تحلیل ریسک به ریوارد تعریف شده‌اند."
         )
-        entry_price = last_price
-        stop_loss = entry_price * (1 + risk_pct)
-        take_profit = entry_price * (1 - reward_pct)
 
     else:
         signal = "🔄 بازار در محدوده تعادلی - توصیه به احتیاط"
@@ -151,16 +145,6 @@ async def get_rsi_timeframe(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "تریدرها منتظر دریافت سیگنال‌های قوی‌تر از سایر شاخص‌ها و تاییدیه‌ها بمانند. "
             "مدیریت ریسک و حفظ نقدینگی برای فرصت‌های بهتر، در اولویت قرار دارد."
         )
-        entry_price = None
-        stop_loss = None
-        take_profit = None
-
-    if entry_price and stop_loss and take_profit:
-        risk_value = abs(entry_price - stop_loss)
-        reward_value = abs(take_profit - entry_price)
-        rr_ratio = reward_value / risk_value if risk_value > 0 else None
-    else:
-        rr_ratio = None
 
     msg = (
         f"📊 تحلیل تکنیکال **{coin_id.capitalize()}** بر اساس داده‌های {days} روز گذشته:\n"
@@ -174,6 +158,10 @@ async def get_rsi_timeframe(update: Update, context: ContextTypes.DEFAULT_TYPE):
         msg += (
             f"🎯 نقطه ورود پیشنهادی: `${format_number(entry_price)}`\n"
             f"🛑 حد ضرر (Stop Loss): `${format_number(stop_loss)}`\n"
+        )
+        if analysis.atr_stop is not None:
+            msg += f"📏 حد ضرر بر اساس ATR: `${format_number(analysis.atr_stop)}`\n"
+        msg += (
             f"🏆 حد سود (Take Profit): `${format_number(take_profit)}`\n"
             f"⚖️ نسبت ریسک به ریوارد (R/R Ratio): `{rr_ratio:.2f}`\n\n"
             "💡 **توجه:** این تحلیل صرفا یک سیگنال احتمالی است. همیشه با مدیریت ریسک وارد معامله شوید و به حد ضرر پایبند باشید."
@@ -181,9 +169,14 @@ async def get_rsi_timeframe(update: Update, context: ContextTypes.DEFAULT_TYPE):
     else:
         msg += "💡 در شرایط فعلی، برای جلوگیری از ریسک غیرضروری، بهتر است وارد معامله نشوید."
 
-    chart_buffer = generate_rsi_chart(df, rsi_values, coin_id, days)
-    await context.bot.send_photo(chat_id=update.effective_chat.id,
-                                 photo=InputFile(chart_buffer, filename=f'{coin_id}_rsi_chart.png'))
-    await context.bot.send_message(chat_id=update.effective_chat.id, text=msg, parse_mode='Markdown')
+    # One captioned photo instead of a photo and a separate message when the text fits a caption.
+    caption = msg if len(msg) <= CAPTION_LIMIT else None
+    try:
+        await send_rsi_chart(context, update.effective_chat.id, df, rsi_values, coin_id, days, caption)
+    except ChartQueueFull:
+        msg += "\n\n⏳ به دلیل تعداد زیاد درخواست‌ها، نمودار در حال حاضر ارسال نشد."
+        caption = None
+    if caption is None:
+        await context.bot.send_message(chat_id=update.effective_chat.id, text=msg, parse_mode='Markdown')
 
     return ConversationHandler.END
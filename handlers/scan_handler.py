@@ -0,0 +1,48 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+from services.scanner import scan_market
+from services.instrumentation import telemetry
+from config import SCAN_LIMIT, SCAN_TOP
+
+SCAN_DAYS = (1, 7, 14, 30, 90)
+
+
+def format_scan_rows(table) -> str:
+    lines = []
+    for row in table.itertuples(index=False):
+        lines.append(f"{row.coin_id[:16]:<16} {row.rsi:6.2f} {row.volatility:8.2f}%")
+    return "\n".join(lines)
+
+
+@telemetry.timed("handler:scan_command")
+async def scan_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    days = 14
+    if context.args:
+        try:
+            days = int(context.args[0])
+        except ValueError:
+            days = 0
+    if days not in SCAN_DAYS:
+        await update.message.reply_text("⚠️ بازه زمانی نامعتبر است. یکی از مقادیر 1، 7، 14، 30 یا 90 را وارد کنید. مثال: /scan 14")
+        return
+
+    status = await update.message.reply_text(f"🔎 در حال اسکن {SCAN_LIMIT} کوین برتر بازار...")
+    table, missing = await scan_market(days)
+    if table.empty:
+        await status.edit_text("❌ داده‌ای برای اسکن بازار دریافت نشد. لطفا کمی بعد دوباره تلاش کنید.")
+        return
+
+    oversold = table[table["signal"] == "oversold"].sort_values("rsi").head(SCAN_TOP)
+    overbought = table[table["signal"] == "overbought"].sort_values("rsi", ascending=False).head(SCAN_TOP)
+
+    msg = f"📡 اسکن بازار بر اساس داده‌های {days} روز گذشته ({len(table)} کوین):\n\n"
+    msg += "✅ اشباع فروش (RSI < 30):\n"
+    msg += f"```\n{format_scan_rows(oversold)}\n```\n" if not oversold.empty else "—\n"
+    msg += "\n🔻 اشباع خرید (RSI > 70):\n"
+    msg += f"```\n{format_scan_rows(overbought)}\n```\n" if not overbought.empty else "—\n"
+    if oversold.empty and overbought.empty:
+        msg += f"\n🔄 بیشترین فاصله از تعادل:\n```\n{format_scan_rows(table.head(SCAN_TOP))}\n```\n"
+    if missing:
+        msg += f"\n⏳ داده {missing} کوین هنوز آماده نیست و در اسکن بعدی لحاظ می‌شود."
+
+    await status.edit_text(msg, parse_mode='Markdown')
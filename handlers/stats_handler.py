@@ -0,0 +1,36 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+from services.instrumentation import telemetry
+from config import ADMIN_IDS
+
+
+def format_seconds(value: float) -> str:
+    if value == float("inf"):
+        return ">30s"
+    return f"{value * 1000:.0f}ms" if value < 1 else f"{value:.1f}s"
+
+
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if update.effective_user is None or update.effective_user.id not in ADMIN_IDS:
+        return
+
+    lines = ["stage                          n     p50    p95   mean"]
+    for stage, histogram in sorted(telemetry.stages().items()):
+        mean = histogram.sum / histogram.count if histogram.count else 0.0
+        lines.append(
+            f"{stage[:28]:<28} {histogram.count:>5} {format_seconds(histogram.quantile(0.5)):>7} "
+            f"{format_seconds(histogram.quantile(0.95)):>6} {format_seconds(mean):>6}"
+        )
+
+    counters = []
+    for (name, labels), value in sorted(telemetry.counters.items()):
+        label_text = ",".join(f"{k}={v}" for k, v in labels)
+        counters.append(f"{name}{{{label_text}}} {value:g}")
+    for name, _, labels, func in telemetry.gauges:
+        label_text = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+        counters.append(f"{name}{{{label_text}}} {float(func()):g}")
+
+    await update.message.reply_text(
+        "📊 آمار عملکرد ربات:\n```\n" + "\n".join(lines) + "\n```\n```\n" + "\n".join(counters) + "\n```",
+        parse_mode='Markdown'
+    )
@@ -1,8 +1,13 @@
+import numpy as np
 import pandas as pd
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
-from services.coingecko_api import find_coin_id, fetch_ohlc_history
-from services.metrics import calculate_volatility
+from services.coin_index import resolve_coin_id
+from services.indicators import get_indicators
+from services.coin_summary import summary_table
+from services.metrics import REALIZED_LENGTH
+from services.instrumentation import telemetry
+from utils.helpers import format_number
 from config import VOLATILITY_COIN, VOLATILITY_TIMEFRAME
 
 async def volatility_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -19,10 +24,11 @@ async def volatility_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     )
     return VOLATILITY_COIN
 
+@telemetry.timed("handler:get_volatility_coin")
 async def get_volatility_coin(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     coin_query = update.message.text.strip()
-    coin_id = find_coin_id(coin_query)
+    coin_id = await resolve_coin_id(coin_query)
 
     if not coin_id:
         await update.message.reply_text(
@@ -56,6 +62,7 @@ async def get_volatility_coin(update: Update, context: ContextTypes.DEFAULT_TYPE
     )
     return VOLATILITY_TIMEFRAME
 
+@telemetry.timed("handler:get_volatility_timeframe")
 async def get_volatility_timeframe(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     query = update.callback_query
@@ -63,23 +70,32 @@ async def get_volatility_timeframe(update: Update, context: ContextTypes.DEFAULT
 
     days = int(query.data.split('_')[-1])
     coin_id = context.user_data.get('coin_id')
+    summary_table.record(coin_id)
 
-    df = fetch_ohlc_history(coin_id, days)
-    if df.empty:
+    result = await get_indicators(coin_id, days)
+    if result is None:
         await query.edit_message_text(
             "❌ داده‌ای برای این کوین یافت نشد. لطفا دوباره امتحان کنید."
         )
         return ConversationHandler.END
 
-    volatility = calculate_volatility(df)
+    analysis = result.values
+    volatility = analysis.volatility
     if volatility is None:
         await query.edit_message_text(
             "⚠️ محاسبه نوسان قیمت امکان‌پذیر نبود."
         )
         return ConversationHandler.END
 
-    await query.edit_message_text(
+    msg = (
         f"📈 نوسان سالانه تخمینی برای **{coin_id}** در {days} روز گذشته:\n"
         f"🔹 **{volatility:.2f}%**"
     )
+    realized = analysis.realized_volatility[-1]
+    if not np.isnan(realized):
+        msg += f"\n🔹 نوسان تحقق‌یافته {REALIZED_LENGTH} کندل اخیر: **{realized:.2f}%**"
+    atr = analysis.atr[-1]
+    if analysis.last_price and not np.isnan(atr):
+        msg += f"\n🔹 میانگین دامنه واقعی (ATR): `${format_number(float(atr))}` ({atr / analysis.last_price * 100:.2f}%)"
+    await query.edit_message_text(msg)
     return ConversationHandler.END
@@ -1,57 +1,162 @@
-from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, filters, ConversationHandler, CallbackQueryHandler
+from telegram.ext import Application, ApplicationBuilder, CommandHandler, MessageHandler, filters, ConversationHandler, CallbackQueryHandler, InlineQueryHandler
 from handlers.start_handler import start_command
-from handlers.rsi_handler import rsi_command, get_rsi_coin, get_rsi_timeframe
-from handlers.volatility_handler import volatility_command, get_volatility_coin, get_volatility_timeframe
-from handlers.riskreward_handler import riskreward_command, get_riskreward_entry, get_riskreward_stop, get_riskreward_target
+from handlers.market_handler import market_command
+from handlers.stats_handler import stats_command
+from services.coingecko_api import close_client
+from services.coin_index import load_snapshot, schedule_refresh, schedule_reload
+from services.market_snapshot import refresh_market_snapshot
+from services.instrumentation import start_metrics_server
+from services.outbound import OutboundLimiter
+from services.persistence import SqlitePersistence
+from services.webhook import run_webhook
 from config import (
     RSI_COIN, RSI_TIMEFRAME,
     VOLATILITY_COIN, VOLATILITY_TIMEFRAME,
-    RISKREWARD_ENTRY, RISKREWARD_STOP, RISKREWARD_TARGET
+    RISKREWARD_ENTRY, RISKREWARD_STOP, RISKREWARD_TARGET,
+    ALERT_CHECK_INTERVAL, MARKET_SNAPSHOT_INTERVAL, INLINE_REFRESH_INTERVAL,
+    LIVE_PRICE_COINS, LIVE_PRICE_INTERVAL,
+    METRICS_HOST, METRICS_PORT,
+    PERSISTENCE_PATH, PERSISTENCE_INTERVAL,
+    WEBHOOK_URL, WORKER_INDEX
 )
+import asyncio
+import functools
+import importlib
 import os
+import sys
 
 TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
 
-def main():
+# These pull in numpy/pandas (and the chart pool pulls in matplotlib), so they are imported on
+# first use or by prewarm() once the bot is already answering.
+PREWARM_MODULES = (
+    "handlers.riskreward_handler",
+    "handlers.rsi_handler",
+    "handlers.volatility_handler",
+    "handlers.scan_handler",
+    "handlers.alert_handler",
+    "handlers.inline_handler",
+    "services.alerts",
+)
+
+def lazy(module: str, name: str):
+
+    async def callback(*args, **kwargs):
+        return await getattr(importlib.import_module(module), name)(*args, **kwargs)
+
+    callback.__name__ = name
+    return callback
+
+async def prewarm(context):
+    for module in PREWARM_MODULES:
+        await asyncio.to_thread(importlib.import_module, module)
+    await importlib.import_module("services.charts").chart_renderer.warm_up()
+
+async def on_startup(app):
+    await asyncio.to_thread(load_snapshot)
+    # The JobQueue only starts once polling is set up, so this one-shot job is usually late; without
+    # a grace time APScheduler would drop it as missed.
+    app.job_queue.run_once(prewarm, 0, name="prewarm", job_kwargs={"misfire_grace_time": None})
+    if WORKER_INDEX:
+        # Background jobs run in webhook worker 0 only, which is also the only OHLC store writer;
+        # the other workers pick up its coin index snapshot from disk.
+        schedule_reload(app.job_queue)
+    else:
+        schedule_refresh(app.job_queue)
+        app.job_queue.run_repeating(refresh_market_snapshot, interval=MARKET_SNAPSHOT_INTERVAL, first=1,
+                                    name="market_snapshot")
+        app.job_queue.run_repeating(lazy("services.coin_summary", "refresh_summaries"),
+                                    interval=INLINE_REFRESH_INTERVAL, first=10, name="inline_summaries")
+        if LIVE_PRICE_COINS:
+            app.job_queue.run_repeating(lazy("services.live_prices", "refresh_live_prices"),
+                                        interval=LIVE_PRICE_INTERVAL, first=5, name="live_prices")
+        app.job_queue.run_repeating(lazy("services.alerts", "evaluate_alerts"), interval=ALERT_CHECK_INTERVAL,
+                                    first=ALERT_CHECK_INTERVAL, name="alerts")
+    if METRICS_PORT:
+        app.bot_data['metrics_server'] = await start_metrics_server(METRICS_HOST, METRICS_PORT)
 
-    app = ApplicationBuilder().token(TOKEN).build()
+async def on_shutdown(app):
+    await close_client()
+    charts = sys.modules.get("services.charts")
+    if charts is not None:
+        charts.chart_renderer.shutdown()
+    metrics_server = app.bot_data.pop('metrics_server', None)
+    if metrics_server is not None:
+        metrics_server.close()
+
+def build_app(token: str, base_url: str | None = None) -> Application:
+
+    builder = (
+        ApplicationBuilder()
+        .token(token)
+        .concurrent_updates(True)
+        .rate_limiter(OutboundLimiter())
+        .persistence(SqlitePersistence(PERSISTENCE_PATH, PERSISTENCE_INTERVAL))
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+    )
+    if base_url:
+        builder = builder.base_url(base_url)
+    app = builder.build()
 
     app.add_handler(CommandHandler("start", start_command))
+    app.add_handler(CommandHandler("scan", lazy("handlers.scan_handler", "scan_command")))
+    app.add_handler(CommandHandler("alert", lazy("handlers.alert_handler", "alert_command")))
+    app.add_handler(CommandHandler("alerts", lazy("handlers.alert_handler", "alerts_command")))
+    app.add_handler(CommandHandler("unalert", lazy("handlers.alert_handler", "unalert_command")))
+    app.add_handler(CommandHandler("market", market_command))
+    app.add_handler(CommandHandler("stats", stats_command))
+    app.add_handler(InlineQueryHandler(lazy("handlers.inline_handler", "inline_query")))
 
     rsi_handler = ConversationHandler(
-        entry_points=[CallbackQueryHandler(rsi_command, pattern='^rsi$')],
+        entry_points=[CallbackQueryHandler(lazy("handlers.rsi_handler", "rsi_command"), pattern='^rsi$')],
         states={
-            RSI_COIN: [MessageHandler(filters.TEXT & ~filters.COMMAND, get_rsi_coin)],
-            RSI_TIMEFRAME: [CallbackQueryHandler(get_rsi_timeframe, pattern='^rsi_days_')],
+            RSI_COIN: [MessageHandler(filters.TEXT & ~filters.COMMAND, lazy("handlers.rsi_handler", "get_rsi_coin"))],
+            RSI_TIMEFRAME: [CallbackQueryHandler(lazy("handlers.rsi_handler", "get_rsi_timeframe"), pattern='^rsi_days_')],
         },
         fallbacks=[],
         allow_reentry=True,
+        name="rsi",
+        persistent=True,
     )
 
     volatility_handler = ConversationHandler(
-        entry_points=[CallbackQueryHandler(volatility_command, pattern='^volatility$')],
+        entry_points=[CallbackQueryHandler(lazy("handlers.volatility_handler", "volatility_command"), pattern='^volatility$')],
         states={
-            VOLATILITY_COIN: [MessageHandler(filters.TEXT & ~filters.COMMAND, get_volatility_coin)],
-            VOLATILITY_TIMEFRAME: [CallbackQueryHandler(get_volatility_timeframe, pattern='^volatility_days_')],
+            VOLATILITY_COIN: [MessageHandler(filters.TEXT & ~filters.COMMAND, lazy("handlers.volatility_handler", "get_volatility_coin"))],
+            VOLATILITY_TIMEFRAME: [CallbackQueryHandler(lazy("handlers.volatility_handler", "get_volatility_timeframe"), pattern='^volatility_days_')],
         },
         fallbacks=[],
         allow_reentry=True,
+        name="volatility",
+        persistent=True,
     )
 
     riskreward_handler = ConversationHandler(
-        entry_points=[CallbackQueryHandler(riskreward_command, pattern='^riskreward$')],
+        entry_points=[CallbackQueryHandler(lazy("handlers.riskreward_handler", "riskreward_command"), pattern='^riskreward$')],
         states={
-            RISKREWARD_ENTRY: [MessageHandler(filters.TEXT & ~filters.COMMAND, get_riskreward_entry)],
-            RISKREWARD_STOP: [MessageHandler(filters.TEXT & ~filters.COMMAND, get_riskreward_stop)],
-            RISKREWARD_TARGET: [MessageHandler(filters.TEXT & ~filters.COMMAND, get_riskreward_target)],
+            RISKREWARD_ENTRY: [MessageHandler(filters.TEXT & ~filters.COMMAND, lazy("handlers.riskreward_handler", "get_riskreward_entry"))],
+            RISKREWARD_STOP: [MessageHandler(filters.TEXT & ~filters.COMMAND, lazy("handlers.riskreward_handler", "get_riskreward_stop"))],
+            RISKREWARD_TARGET: [MessageHandler(filters.TEXT & ~filters.COMMAND, lazy("handlers.riskreward_handler", "get_riskreward_target"))],
         },
         fallbacks=[],
         allow_reentry=True,
+        name="riskreward",
+        persistent=True,
     )
 
     app.add_handler(rsi_handler)
     app.add_handler(volatility_handler)
     app.add_handler(riskreward_handler)
+    return app
+
+def main():
+
+    if WEBHOOK_URL:
+        run_webhook(functools.partial(build_app, TOKEN), TOKEN)
+        return
+
+    app = build_app(TOKEN)
 
     print("Bot started!")
     app.run_polling()
@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import time
+from config import ALERTS_DB_PATH
+
+METRICS = ("rsi", "volatility")
+OPERATORS = ("<", ">")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id INTEGER NOT NULL,
+    coin_id TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    op TEXT NOT NULL,
+    threshold REAL NOT NULL,
+    active INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alerts_target ON alerts (coin_id, days, metric, op, threshold);
+CREATE INDEX IF NOT EXISTS alerts_chat ON alerts (chat_id);
+"""
+
+_MATCH = """
+    (metric = 'rsi' AND ((op = '<' AND threshold > :rsi) OR (op = '>' AND threshold < :rsi)))
+    OR (metric = 'volatility' AND ((op = '<' AND threshold > :vol) OR (op = '>' AND threshold < :vol)))
+"""
+
+
+class AlertStore:
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # Opened on first use, so importing the module does not create the database file.
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def add(self, chat_id: int, coin_id: str, days: int, metric: str, op: str, threshold: float) -> int:
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO alerts (chat_id, coin_id, days, metric, op, threshold, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (chat_id, coin_id, days, metric, op, threshold, time.time()),
+            )
+        return cur.lastrowid
+
+    def remove(self, chat_id: int, alert_id: int) -> bool:
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM alerts WHERE id = ? AND chat_id = ?", (alert_id, chat_id))
+        return cur.rowcount > 0
+
+    def remove_chat(self, chat_id: int):
+        with self.conn:
+            self.conn.execute("DELETE FROM alerts WHERE chat_id = ?", (chat_id,))
+
+    def for_chat(self, chat_id: int) -> list[tuple]:
+        return self.conn.execute(
+            "SELECT id, coin_id, days, metric, op, threshold FROM alerts WHERE chat_id = ? ORDER BY id",
+            (chat_id,),
+        ).fetchall()
+
+    def targets(self) -> list[tuple[str, int]]:
+        return self.conn.execute("SELECT DISTINCT coin_id, days FROM alerts").fetchall()
+
+    def trigger(self, coin_id: str, days: int, rsi: float | None, volatility: float | None) -> list[tuple]:
+        params = {
+            "coin_id": coin_id,
+            "days": days,
+            "rsi": float("nan") if rsi is None else rsi,
+            "vol": float("nan") if volatility is None else volatility,
+        }
+        with self.conn:
+            self.conn.execute(
+                f"UPDATE alerts SET active = 0 WHERE coin_id = :coin_id AND days = :days "
+                f"AND active = 1 AND NOT ({_MATCH})",
+                params,
+            )
+            fired = self.conn.execute(
+                f"SELECT id, chat_id, metric, op, threshold FROM alerts "
+                f"WHERE coin_id = :coin_id AND days = :days AND active = 0 AND ({_MATCH})",
+                params,
+            ).fetchall()
+            self.conn.executemany("UPDATE alerts SET active = 1 WHERE id = ?", [(row[0],) for row in fired])
+        return fired
+
+
+alert_store = AlertStore(ALERTS_DB_PATH)
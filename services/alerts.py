@@ -0,0 +1,66 @@
+import asyncio
+from telegram.error import Forbidden, TelegramError
+from telegram.ext import ContextTypes
+from services.alert_store import alert_store
+from services.market_data import get_ohlc_history
+from services.metrics import calculate_volatility
+from services.rate_limiter import PRIORITY_BACKGROUND
+from services.streaming_rsi import live_rsi
+
+METRIC_LABELS = {"rsi": "RSI", "volatility": "نوسان سالانه"}
+
+_evaluated: dict[tuple[str, int], tuple[int, float | None, float | None]] = {}
+
+
+async def _evaluate_target(coin_id: str, days: int) -> tuple[int, float | None, float | None] | None:
+    df = await get_ohlc_history(coin_id, days, PRIORITY_BACKGROUND)
+    if df.empty:
+        return None
+    candle = df["timestamp"].iloc[-1].value
+    cached = _evaluated.get((coin_id, days))
+    if cached is None or cached[0] != candle:
+        cached = (candle, live_rsi(coin_id, days, df), calculate_volatility(df))
+        _evaluated[(coin_id, days)] = cached
+    return cached
+
+
+def format_alert(coin_id: str, days: int, metric: str, op: str, threshold: float,
+                 rsi: float | None, volatility: float | None) -> str:
+    value = rsi if metric == "rsi" else volatility
+    unit = "%" if metric == "volatility" else ""
+    return (
+        f"🔔 هشدار **{coin_id}** ({days} روز):\n"
+        f"{METRIC_LABELS[metric]} = `{value:.2f}{unit}` (شرط: {op} {threshold:g}{unit})"
+    )
+
+
+async def _send_alert(context: ContextTypes.DEFAULT_TYPE, chat_id: int, text: str):
+    try:
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=text,
+            parse_mode='Markdown',
+            rate_limit_args=PRIORITY_BACKGROUND,
+        )
+    except Forbidden:
+        alert_store.remove_chat(chat_id)
+    except TelegramError as e:
+        print(f"Error sending alert: {e}")
+
+
+async def evaluate_alerts(context: ContextTypes.DEFAULT_TYPE):
+    targets = alert_store.targets()
+    results = await asyncio.gather(*(_evaluate_target(c, d) for c, d in targets), return_exceptions=True)
+    for key in _evaluated.keys() - set(targets):
+        del _evaluated[key]
+
+    sends = []
+    for (coin_id, days), result in zip(targets, results):
+        if result is None or isinstance(result, BaseException):
+            continue
+        _, rsi, volatility = result
+        for _, chat_id, metric, op, threshold in alert_store.trigger(coin_id, days, rsi, volatility):
+            text = format_alert(coin_id, days, metric, op, threshold, rsi, volatility)
+            sends.append(_send_alert(context, chat_id, text))
+    # Sent together: the bot's OutboundLimiter paces them per chat and globally.
+    await asyncio.gather(*sends, return_exceptions=True)
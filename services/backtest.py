@@ -0,0 +1,180 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from services.metrics import rsi_kernel, OVERSOLD, OVERBOUGHT, RISK_MULTIPLIER, REWARD_MULTIPLIER
+from services.ohlc_store import OhlcStore, resample_records
+
+# get_rsi_timeframe measures volatility over the whole requested window; 180 four-hour candles is
+# the 30-day request, used here as a trailing window so no signal sees future prices.
+VOL_WINDOW = 180
+HORIZON = 42
+
+# The store holds raw price samples in the tiers market_data fetches, not candles.
+SAMPLE_TIERS = (5 * 60, 3600, 86400)
+
+
+class Params(NamedTuple):
+    length: int = 14
+    oversold: float = OVERSOLD
+    overbought: float = OVERBOUGHT
+    risk: float = RISK_MULTIPLIER
+    reward: float = REWARD_MULTIPLIER
+
+
+def param_grid(lengths=(14,), oversold=(OVERSOLD,), overbought=(OVERBOUGHT,),
+               risk=(RISK_MULTIPLIER,), reward=(REWARD_MULTIPLIER,)) -> list[Params]:
+    return [Params(*combo) for combo in product(lengths, oversold, overbought, risk, reward)]
+
+
+def trailing_volatility(closes: np.ndarray, window: int) -> np.ndarray:
+    returns = closes[1:] / closes[:-1] - 1
+    volatility = np.full(len(closes), np.nan)
+    if len(returns) >= window:
+        volatility[window:] = sliding_window_view(returns, window).std(axis=1, ddof=1)
+    return volatility
+
+
+def forward_windows(values: np.ndarray, horizon: int) -> np.ndarray:
+    # Row t holds the `horizon` candles after t, NaN-padded past the end of the data.
+    padded = np.concatenate([values[1:], np.full(horizon, np.nan)])
+    return sliding_window_view(padded, horizon)
+
+
+def simulate_trades(rows: np.ndarray, rsi: np.ndarray, volatility: np.ndarray, params: Params,
+                    horizon: int = HORIZON) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    closes, highs, lows = rows["close"], rows["high"], rows["low"]
+    long = rsi < params.oversold
+    short = rsi > params.overbought
+    signals = np.flatnonzero((long | short) & ~np.isnan(volatility))
+    if not len(signals):
+        return signals, signals, np.empty(0)
+
+    entry = closes[signals]
+    side = np.where(long[signals], 1.0, -1.0)
+    step = volatility[signals]
+    stop = entry * (1 - side * step * params.risk)
+    target = entry * (1 + side * step * params.reward)
+
+    is_long = (side > 0)[:, None]
+    high = forward_windows(highs, horizon)[signals]
+    low = forward_windows(lows, horizon)[signals]
+    stop_hit = np.where(is_long, low <= stop[:, None], high >= stop[:, None])
+    target_hit = np.where(is_long, high >= target[:, None], low <= target[:, None])
+    first_stop = np.where(stop_hit.any(axis=1), stop_hit.argmax(axis=1), horizon)
+    first_target = np.where(target_hit.any(axis=1), target_hit.argmax(axis=1), horizon)
+
+    # A candle that touches both levels is counted as a stop; the candle's path is unknown.
+    stopped = (first_stop < horizon) & (first_stop <= first_target)
+    reached = (first_target < horizon) & ~stopped
+    timed_out = ~stopped & ~reached
+    complete = ~timed_out | (signals + horizon < len(closes))
+
+    offset = np.where(stopped, first_stop, np.where(reached, first_target, horizon - 1))
+    exits = signals + 1 + offset
+    exit_price = np.where(stopped, stop, np.where(reached, target, closes[np.minimum(exits, len(closes) - 1)]))
+    returns = side * (exit_price / entry - 1)
+    return signals[complete], exits[complete], returns[complete]
+
+
+def one_at_a_time(entries: np.ndarray, exits: np.ndarray) -> np.ndarray:
+    # Only the first signal after the previous trade closed is taken, so the loop runs once per
+    # trade taken rather than once per signal.
+    following = np.searchsorted(entries, exits, side="right")
+    taken = []
+    i = 0
+    while i < len(entries):
+        taken.append(i)
+        i = following[i]
+    return np.asarray(taken, dtype=np.int64)
+
+
+def max_drawdown(returns: np.ndarray) -> float:
+    if not len(returns):
+        return 0.0
+    equity = np.cumprod(1 + returns)
+    peak = np.maximum.accumulate(np.maximum(equity, 1.0))
+    return float(np.max(1 - equity / peak))
+
+
+def backtest_rows(rows: np.ndarray, grid: list[Params], vol_window: int = VOL_WINDOW,
+                  horizon: int = HORIZON) -> list[dict]:
+    closes = np.ascontiguousarray(rows["close"], dtype="float64")
+    volatility = trailing_volatility(closes, vol_window)
+    rsi_by_length = {}
+    results = []
+    for params in grid:
+        rsi = rsi_by_length.get(params.length)
+        if rsi is None:
+            rsi = rsi_by_length[params.length] = rsi_kernel(closes, params.length)
+        entries, exits, returns = simulate_trades(rows, rsi, volatility, params, horizon)
+        returns = returns[one_at_a_time(entries, exits)] if len(entries) else returns
+        results.append({
+            **params._asdict(),
+            "trades": len(returns),
+            "wins": int(np.sum(returns > 0)),
+            "return_sum": float(returns.sum()),
+            "total_return": float(np.prod(1 + returns) - 1),
+            "max_drawdown": max_drawdown(returns),
+        })
+    return results
+
+
+def sample_tier(interval: int) -> int:
+    # The coarsest tier that divides the candle interval has the longest history behind it.
+    tiers = [tier for tier in SAMPLE_TIERS if tier <= interval and interval % tier == 0]
+    if not tiers:
+        raise ValueError(f"no sample tier builds {interval}s candles")
+    return max(tiers)
+
+
+def candles_from_samples(samples: np.ndarray, interval: int) -> np.ndarray:
+    bars = resample_records(samples, interval)
+    # The last bar is still forming unless its latest sample fell on the closing edge.
+    if len(bars) and bars["timestamp"][-1] % (interval * 1000):
+        bars = bars[:-1]
+    return bars
+
+
+def _backtest_coin(root: str, coin_id: str, interval: int, grid: list[Params], vol_window: int,
+                   horizon: int) -> list[dict]:
+    samples = OhlcStore(root, readonly=True).read(coin_id, sample_tier(interval))
+    rows = candles_from_samples(samples, interval)
+    return [{"coin_id": coin_id, **result} for result in backtest_rows(rows, grid, vol_window, horizon)]
+
+
+def run_backtest(root: str, coin_ids: list[str], interval: int, grid: list[Params],
+                 vol_window: int = VOL_WINDOW, horizon: int = HORIZON, workers: int | None = None) -> pd.DataFrame:
+    workers = workers or os.cpu_count() or 1
+    args = (interval, grid, vol_window, horizon)
+    if workers == 1:
+        results = [_backtest_coin(root, coin_id, *args) for coin_id in coin_ids]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(_backtest_coin, root, coin_id, *args) for coin_id in coin_ids]
+            results = [future.result() for future in futures]
+    return pd.DataFrame([row for coin in results for row in coin])
+
+
+def summarize(results: pd.DataFrame) -> pd.DataFrame:
+    grouped = results.groupby(list(Params._fields))
+    summary = grouped.agg(
+        coins=("coin_id", "count"),
+        trades=("trades", "sum"),
+        wins=("wins", "sum"),
+        return_sum=("return_sum", "sum"),
+        median_return=("total_return", "median"),
+        median_drawdown=("max_drawdown", "median"),
+        worst_drawdown=("max_drawdown", "max"),
+    )
+    trades = summary["trades"].where(summary["trades"] > 0)
+    summary["win_rate"] = summary["wins"] / trades * 100
+    summary["expectancy"] = summary["return_sum"] / trades * 100
+    for column in ("median_return", "median_drawdown", "worst_drawdown"):
+        summary[column] *= 100
+    summary = summary.drop(columns=["wins", "return_sum"])
+    return summary.sort_values("expectancy", ascending=False).reset_index()
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from typing import Hashable
+from services.instrumentation import telemetry
+from config import CHART_CACHE_MAX_BYTES, CHART_CACHE_MAX_ENTRIES
+
+
+class ChartCache:
+
+    def __init__(self, max_bytes: int, max_entries: int):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.bytes_used = 0
+        self.file_id_hits = 0
+        self.bytes_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[Hashable, tuple[bytes | None, str | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> tuple[bytes | None, str | None]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, None
+        self._data.move_to_end(key)
+        if entry[1] is not None:
+            self.file_id_hits += 1
+        else:
+            self.bytes_hits += 1
+        return entry
+
+    def put_bytes(self, key: Hashable, data: bytes):
+        self._store(key, (data, None))
+
+    def put_file_id(self, key: Hashable, file_id: str):
+        self._store(key, (None, file_id))
+
+    def invalidate(self, key: Hashable):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes_used -= self._size(entry)
+
+    def _store(self, key: Hashable, entry: tuple[bytes | None, str | None]):
+        self.invalidate(key)
+        self._data[key] = entry
+        self.bytes_used += self._size(entry)
+        while self._data and (self.bytes_used > self.max_bytes or len(self._data) > self.max_entries):
+            _, evicted = self._data.popitem(last=False)
+            self.bytes_used -= self._size(evicted)
+            self.evictions += 1
+
+    @staticmethod
+    def _size(entry: tuple[bytes | None, str | None]) -> int:
+        data, file_id = entry
+        return len(data or b"") + len(file_id or "")
+
+    def stats(self) -> dict:
+        total = self.file_id_hits + self.bytes_hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes_used,
+            "file_id_hits": self.file_id_hits,
+            "bytes_hits": self.bytes_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.file_id_hits + self.bytes_hits) / total if total else 0.0,
+        }
+
+
+chart_cache = ChartCache(CHART_CACHE_MAX_BYTES, CHART_CACHE_MAX_ENTRIES)
+
+telemetry.gauge("bot_cache_entries", lambda: len(chart_cache), cache="chart")
+telemetry.gauge("bot_cache_bytes", lambda: chart_cache.bytes_used, cache="chart")
+telemetry.gauge("bot_cache_hits_total", lambda: chart_cache.file_id_hits, kind="counter", cache="chart_file_id")
+telemetry.gauge("bot_cache_hits_total", lambda: chart_cache.bytes_hits, kind="counter", cache="chart")
+telemetry.gauge("bot_cache_misses_total", lambda: chart_cache.misses, kind="counter", cache="chart")
@@ -0,0 +1,132 @@
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from services.instrumentation import telemetry
+from services.raster_chart import render_rsi_chart
+from config import CHART_WORKERS, CHART_QUEUE_SIZE, CHART_RENDERER, CHART_FORMAT
+
+
+class ChartQueueFull(Exception):
+    pass
+
+
+def _warm_up(renderer: str, image_format: str):
+    if renderer == "matplotlib":
+        import matplotlib
+        matplotlib.use("Agg")
+    CHART_RENDERERS[renderer](
+        np.array(["2024-01-01", "2024-01-02"], dtype="datetime64[ms]"),
+        np.array([1.0, 2.0]), np.array([40.0, 60.0]), "warmup", 1, image_format,
+    )
+
+
+def _noop():
+    return None
+
+
+def generate_rsi_chart(timestamps: np.ndarray, closes: np.ndarray, rsi_values: np.ndarray,
+                       coin_id: str, days: int, image_format: str = "png") -> bytes:
+    import matplotlib.dates as mdates
+    from matplotlib import style
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    with style.context('dark_background'):
+        fig = Figure(figsize=(15, 10))
+        FigureCanvasAgg(fig)
+        ax1, ax2 = fig.subplots(2, 1, gridspec_kw={'height_ratios': [3, 1]})
+
+        ax1.plot(timestamps, closes, label=f'{coin_id.capitalize()} Price', color='white')
+        ax1.set_title(f'Price and RSI for {coin_id.capitalize()} over {days} days', color='white', fontsize=16)
+        ax1.set_ylabel('Price (USD)', color='white')
+        ax1.grid(True, linestyle='--', alpha=0.5)
+        ax1.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
+        fig.autofmt_xdate()
+        ax1.legend(loc='best')
+
+        ax2.plot(timestamps, rsi_values, label='RSI', color='cyan')
+        ax2.set_xlabel('Date', color='white')
+        ax2.set_ylabel('RSI Value', color='white')
+        ax2.axhline(y=70, color='red', linestyle='--', label='Overbought (70)')
+        ax2.axhline(y=30, color='green', linestyle='--', label='Oversold (30)')
+        ax2.fill_between(timestamps, 70, 100, color='red', alpha=0.2)
+        ax2.fill_between(timestamps, 0, 30, color='green', alpha=0.2)
+        ax2.grid(True, linestyle='--', alpha=0.5)
+        ax2.legend(loc='best')
+
+        buf = io.BytesIO()
+        fig.savefig(buf, format=image_format, bbox_inches='tight')
+    return buf.getvalue()
+
+
+CHART_RENDERERS = {"matplotlib": generate_rsi_chart, "fast": render_rsi_chart}
+
+
+class ChartRenderer:
+
+    def __init__(self, workers: int, queue_size: int, renderer: str = "fast", image_format: str = "png"):
+        if renderer not in CHART_RENDERERS:
+            raise ValueError(f"unknown chart renderer: {renderer}")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.renderer = renderer
+        self.image_format = image_format
+        self.pending = 0
+        self.rejected = 0
+        self.crashes = 0
+        self._executor: ProcessPoolExecutor | None = None
+
+    def start(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_up,
+                initargs=(self.renderer, self.image_format),
+            )
+        return self._executor
+
+    async def warm_up(self):
+        loop = asyncio.get_running_loop()
+        executor = self.start()
+        await asyncio.gather(*(loop.run_in_executor(executor, _noop) for _ in range(self.workers)))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def render(self, timestamps: np.ndarray, closes: np.ndarray, rsi_values: np.ndarray,
+                     coin_id: str, days: int) -> bytes:
+        if self.pending >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise ChartQueueFull("chart render queue is full")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            for attempt in range(2):
+                executor = self.start()
+                try:
+                    return await loop.run_in_executor(
+                        executor, CHART_RENDERERS[self.renderer], timestamps, closes, rsi_values, coin_id, days,
+                        self.image_format,
+                    )
+                except BrokenProcessPool as e:
+                    print(f"Error rendering chart, restarting chart workers: {e}")
+                    self.crashes += 1
+                    # Concurrent renders see the same broken pool; only the first one replaces it.
+                    if self._executor is executor:
+                        self.shutdown()
+            raise ChartQueueFull("chart workers keep crashing")
+        finally:
+            self.pending -= 1
+
+
+chart_renderer = ChartRenderer(CHART_WORKERS, CHART_QUEUE_SIZE, CHART_RENDERER, CHART_FORMAT)
+
+telemetry.gauge("bot_chart_queue_depth", lambda: chart_renderer.pending)
+telemetry.gauge("bot_chart_rejected_total", lambda: chart_renderer.rejected, kind="counter")
+telemetry.gauge("bot_chart_worker_crashes_total", lambda: chart_renderer.crashes, kind="counter")
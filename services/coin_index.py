@@ -0,0 +1,215 @@
+import asyncio
+import bisect
+import difflib
+import gzip
+import json
+import os
+import time
+from collections import defaultdict
+from services.coingecko_api import find_coin_id, fetch_coin_list, fetch_markets_page
+from services.instrumentation import telemetry
+from services.rate_limiter import PRIORITY_BACKGROUND
+from config import COIN_INDEX_PATH, COIN_INDEX_REFRESH
+
+PREFIX_CANDIDATES = 200
+FUZZY_CANDIDATES = 50
+FUZZY_MAX_POSTINGS = 500
+RELOAD_DELAY = 60
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CoinIndex:
+
+    def __init__(self, coins: list[dict] | None = None, ranks: dict[str, int] | None = None,
+                 updated: float = 0.0):
+        self.updated = updated
+        self.build(coins or [], ranks or {})
+
+    def __len__(self) -> int:
+        return len(self.coins)
+
+    def build(self, coins: list[dict], ranks: dict[str, int]):
+        self.coins = [(c["id"], c.get("symbol") or "", c.get("name") or "") for c in coins if c.get("id")]
+        self.ranks = ranks
+        self.names = {coin_id: name for coin_id, _, name in self.coins}
+        self.symbols = {coin_id: symbol for coin_id, symbol, _ in self.coins}
+
+        by_id = {}
+        by_symbol = defaultdict(list)
+        by_name = defaultdict(list)
+        keys = set()
+        for coin_id, symbol, name in self.coins:
+            coin_key = coin_id.lower()
+            by_id[coin_key] = coin_id
+            by_symbol[symbol.lower()].append(coin_id)
+            by_name[name.lower()].append(coin_id)
+            keys.add((coin_key, coin_id))
+            keys.add((symbol.lower(), coin_id))
+            keys.add((name.lower(), coin_id))
+
+        self.by_id = by_id
+        self.by_symbol = {k: sorted(v, key=self.rank_key) for k, v in by_symbol.items()}
+        self.by_name = {k: sorted(v, key=self.rank_key) for k, v in by_name.items()}
+        self.prefix_keys = sorted(k for k in keys if k[0])
+
+        grams = defaultdict(list)
+        for pos, (key, _) in enumerate(self.prefix_keys):
+            for gram in _trigrams(key):
+                grams[gram].append(pos)
+        self.trigrams = dict(grams)
+
+    def rank_key(self, coin_id: str) -> tuple:
+        return (self.ranks.get(coin_id, float("inf")), len(coin_id), coin_id)
+
+    def lookup(self, query: str) -> str | None:
+        query = query.lower().strip()
+        if not query:
+            return None
+        if query in self.by_id:
+            return self.by_id[query]
+        if query in self.by_symbol:
+            return self.by_symbol[query][0]
+        if query in self.by_name:
+            return self.by_name[query][0]
+        matches = self.search(query, limit=1)
+        return matches[0] if matches else None
+
+    def search(self, query: str, limit: int = 10) -> list[str]:
+        query = query.lower().strip()
+        if not query:
+            return []
+        exact = self.by_id.get(query)
+        ranked = [exact] if exact else []
+        ranked += self.by_symbol.get(query, []) + self.by_name.get(query, [])
+        ranked += sorted(self._prefix(query), key=self.rank_key)
+        if len(ranked) < limit:
+            ranked += self._fuzzy(query)
+
+        seen = set()
+        result = []
+        for coin_id in ranked:
+            if coin_id not in seen:
+                seen.add(coin_id)
+                result.append(coin_id)
+                if len(result) == limit:
+                    break
+        return result
+
+    def _prefix(self, query: str) -> set[str]:
+        start = bisect.bisect_left(self.prefix_keys, (query, ""))
+        matches = set()
+        for key, coin_id in self.prefix_keys[start:start + PREFIX_CANDIDATES]:
+            if not key.startswith(query):
+                break
+            matches.add(coin_id)
+        return matches
+
+    def _fuzzy(self, query: str) -> list[str]:
+        postings = sorted((self.trigrams[g] for g in _trigrams(query) if g in self.trigrams), key=len)
+        if not postings:
+            return []
+        selective = [p for p in postings if len(p) <= FUZZY_MAX_POSTINGS] or postings[:1]
+        counts = defaultdict(int)
+        for posting in selective:
+            for pos in posting:
+                counts[pos] += 1
+        if not counts:
+            return []
+        best = sorted(counts, key=counts.get, reverse=True)[:FUZZY_CANDIDATES]
+        scored = []
+        for pos in best:
+            key, coin_id = self.prefix_keys[pos]
+            score = difflib.SequenceMatcher(None, query, key).ratio()
+            if score >= 0.6:
+                scored.append((-score, self.rank_key(coin_id), coin_id))
+        return [coin_id for _, _, coin_id in sorted(scored)]
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        payload = {
+            "version": 1,
+            "updated": self.updated,
+            "coins": [list(coin) for coin in self.coins],
+            "ranks": self.ranks,
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CoinIndex":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        coins = [{"id": i, "symbol": s, "name": n} for i, s, n in payload["coins"]]
+        return cls(coins, payload.get("ranks", {}), payload.get("updated", 0.0))
+
+
+coin_index = CoinIndex()
+
+
+def load_snapshot(path: str = COIN_INDEX_PATH) -> bool:
+    global coin_index
+    if not os.path.exists(path):
+        return False
+    try:
+        coin_index = CoinIndex.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error loading coin index snapshot: {e}")
+        return False
+    return True
+
+
+def snapshot_age() -> float:
+    return time.time() - coin_index.updated if coin_index.updated else float("inf")
+
+
+async def refresh_coin_index(context=None):
+    global coin_index
+    coins = await fetch_coin_list(priority=PRIORITY_BACKGROUND)
+    if not coins:
+        return
+    markets = await fetch_markets_page(1, 250, priority=PRIORITY_BACKGROUND)
+    ranks = {m["id"]: m["market_cap_rank"] for m in markets if m.get("market_cap_rank")}
+    index = await asyncio.to_thread(CoinIndex, coins, ranks, time.time())
+    coin_index = index
+    await asyncio.to_thread(index.save, COIN_INDEX_PATH)
+
+
+def schedule_refresh(job_queue):
+    first = max(1.0, COIN_INDEX_REFRESH - snapshot_age())
+    job_queue.run_repeating(refresh_coin_index, interval=COIN_INDEX_REFRESH, first=first, name="coin_index_refresh")
+
+
+async def reload_snapshot(context=None):
+    await asyncio.to_thread(load_snapshot)
+
+
+def schedule_reload(job_queue):
+    # For webhook workers that do not refresh the index themselves: reload the snapshot shortly after
+    # the refreshing worker is due to have rewritten it.
+    first = max(1.0, COIN_INDEX_REFRESH - snapshot_age()) + RELOAD_DELAY
+    job_queue.run_repeating(reload_snapshot, interval=COIN_INDEX_REFRESH, first=first, name="coin_index_reload")
+
+
+async def resolve_coin_id(query: str) -> str | None:
+    with telemetry.span("find_coin_id"):
+        if not len(coin_index):
+            return await find_coin_id(query)
+        return coin_index.lookup(query)
+
+
+async def search_coin_ids(query: str, limit: int) -> list[str]:
+    with telemetry.span("find_coin_id"):
+        if not len(coin_index):
+            coin_id = await find_coin_id(query)
+            return [coin_id] if coin_id else []
+        return coin_index.search(query, limit)
+
+
+def coin_symbol(coin_id: str) -> str:
+    return coin_index.symbols.get(coin_id) or coin_id
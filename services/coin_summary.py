@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import NamedTuple
+import numpy as np
+from services.instrumentation import telemetry
+from services.indicators import CoinIndicators, get_indicators
+from services.market_snapshot import market_snapshot
+from services.rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from config import INLINE_DAYS, INLINE_HOT_COINS, INLINE_SUMMARY_MAX_AGE
+
+
+class CoinSummary(NamedTuple):
+    coin_id: str
+    days: int
+    rsi: float | None
+    volatility: float | None
+    last_price: float
+    updated: float
+
+
+def summarize_indicators(result: CoinIndicators) -> CoinSummary:
+    values = result.values
+    rsi = float(values.rsi[-1]) if not np.isnan(values.rsi[-1]) else None
+    volatility = values.volatility if values.volatility is not None and not np.isnan(values.volatility) else None
+    return CoinSummary(result.coin_id, result.days, rsi, volatility, values.last_price, time.time())
+
+
+class SummaryTable:
+
+    def __init__(self, days: int, max_age: float, hot_coins: int):
+        self.days = days
+        self.max_age = max_age
+        self.hot_coins = hot_coins
+        self.rows: dict[str, CoinSummary] = {}
+        self.requests: dict[str, float] = {}
+        self._pending: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def record(self, coin_id: str):
+        self.requests[coin_id] = self.requests.get(coin_id, 0) + 1
+
+    def get(self, coin_id: str) -> CoinSummary | None:
+        row = self.rows.get(coin_id)
+        if row is None or time.time() - row.updated > self.max_age:
+            return None
+        return row
+
+    def hot(self, count: int) -> list[str]:
+        ranked = sorted(self.requests, key=self.requests.get, reverse=True)[:count]
+        if len(ranked) < count:
+            ranked += [r["id"] for r in market_snapshot.top(count) if r["id"] not in self.requests]
+        return ranked[:count]
+
+    async def compute(self, coin_id: str, priority: int = PRIORITY_INTERACTIVE) -> CoinSummary | None:
+        result = await get_indicators(coin_id, self.days, priority)
+        if result is None:
+            return None
+        summary = summarize_indicators(result)
+        self.rows[coin_id] = summary
+        return summary
+
+    def fetch(self, coin_id: str) -> asyncio.Task:
+        task = self._pending.get(coin_id)
+        if task is None:
+            task = asyncio.create_task(self.compute(coin_id))
+            self._pending[coin_id] = task
+            task.add_done_callback(lambda _: self._pending.pop(coin_id, None))
+        return task
+
+    async def refresh(self):
+        coin_ids = self.hot(self.hot_coins)
+        results = await asyncio.gather(*(self.compute(c, PRIORITY_BACKGROUND) for c in coin_ids),
+                                       return_exceptions=True)
+        for coin_id, result in zip(coin_ids, results):
+            if isinstance(result, BaseException):
+                print(f"Error refreshing summary for {coin_id}: {result}")
+        # Rows for coins someone typed once would otherwise stay forever; get() already ignores them.
+        hot = set(coin_ids)
+        cutoff = time.time() - self.max_age
+        for coin_id in [c for c, row in self.rows.items() if row.updated < cutoff and c not in hot]:
+            del self.rows[coin_id]
+        # Halve the counts so "most requested" follows recent demand.
+        self.requests = {c: n / 2 for c, n in self.requests.items() if n >= 0.5}
+
+
+summary_table = SummaryTable(INLINE_DAYS, INLINE_SUMMARY_MAX_AGE, INLINE_HOT_COINS)
+
+telemetry.gauge("bot_inline_summaries", lambda: len(summary_table))
+
+
+async def refresh_summaries(context=None):
+    with telemetry.span("refresh_summaries"):
+        await summary_table.refresh()
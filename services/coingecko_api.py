@@ -1,17 +1,126 @@
-import requests
-import pandas as pd
-import time
+import asyncio
+import random
+import httpx
+from typing import TYPE_CHECKING
+from services.instrumentation import telemetry
+from services.rate_limiter import (
+    TokenBucketScheduler, SingleFlight, CircuitBreaker, CircuitOpenError,
+    PRIORITY_INTERACTIVE
+)
+from config import (
+    COINGECKO_BASE_URL, COINGECKO_TIMEOUT,
+    COINGECKO_MAX_CONNECTIONS, COINGECKO_MAX_CONCURRENCY,
+    COINGECKO_RATE_PER_MINUTE, COINGECKO_BURST,
+    COINGECKO_MAX_RETRIES, COINGECKO_BACKOFF,
+    COINGECKO_BREAKER_FAILURES, COINGECKO_BREAKER_RESET
+)
 
-def find_coin_id(query: str) -> str | None:
+if TYPE_CHECKING:
+    import pandas as pd
+
+_client: httpx.AsyncClient | None = None
+_semaphore: asyncio.Semaphore | None = None
+
+scheduler = TokenBucketScheduler(COINGECKO_RATE_PER_MINUTE / 60, COINGECKO_BURST)
+breaker = CircuitBreaker(COINGECKO_BREAKER_FAILURES, COINGECKO_BREAKER_RESET)
+_single_flight = SingleFlight()
+
+telemetry.gauge("bot_upstream_queue_depth", lambda: scheduler.queue_depth, service="coingecko")
+telemetry.gauge("bot_upstream_inflight", lambda: _single_flight.inflight, service="coingecko")
+telemetry.gauge("bot_upstream_circuit_open", lambda: breaker.state != "closed", service="coingecko")
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=COINGECKO_BASE_URL,
+            timeout=httpx.Timeout(COINGECKO_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=COINGECKO_MAX_CONNECTIONS,
+                max_keepalive_connections=COINGECKO_MAX_CONNECTIONS,
+            ),
+            headers={"accept": "application/json"},
+        )
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+def _retry_delay(response: httpx.Response | None, attempt: int) -> float:
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+    return COINGECKO_BACKOFF * (2 ** attempt) * (1 + random.random() / 2)
+
+
+async def _request(path: str, params: dict | None, priority: int):
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(COINGECKO_MAX_CONCURRENCY)
+
+    for attempt in range(COINGECKO_MAX_RETRIES + 1):
+        if breaker.state == "open":
+            telemetry.inc("bot_upstream_errors_total", service="coingecko", kind="circuit_open")
+            raise CircuitOpenError("CoinGecko circuit is open, skipping request")
+        # Only a call that already holds a token may take the half-open trial slot, so the trial is
+        # never stuck behind the token queue.
+        await scheduler.acquire(priority)
+        try:
+            trial = breaker.before_call()
+        except CircuitOpenError:
+            telemetry.inc("bot_upstream_errors_total", service="coingecko", kind="circuit_open")
+            raise
+        response = None
+        try:
+            with telemetry.span("coingecko_http"):
+                async with _semaphore:
+                    response = await get_client().get(path, params=params)
+        except httpx.TransportError:
+            telemetry.inc("bot_upstream_errors_total", service="coingecko", kind="transport")
+            breaker.record_failure()
+            if attempt == COINGECKO_MAX_RETRIES:
+                raise
+        else:
+            telemetry.inc("bot_upstream_requests_total", service="coingecko", status=str(response.status_code))
+            if response.status_code == 429:
+                telemetry.inc("bot_upstream_rate_limited_total", service="coingecko")
+            if response.status_code != 429 and response.status_code < 500:
+                breaker.record_success()
+                response.raise_for_status()
+                return response.json()
+            breaker.record_failure()
+            if attempt == COINGECKO_MAX_RETRIES:
+                response.raise_for_status()
+        finally:
+            # A cancelled or otherwise failed trial must not keep the half-open slot forever.
+            if trial:
+                breaker.end_trial()
+
+        delay = _retry_delay(response, attempt)
+        if response is not None and response.status_code == 429:
+            scheduler.pause(delay)
+        else:
+            await asyncio.sleep(delay)
+
+
+async def _get_json(path: str, params: dict | None = None, priority: int = PRIORITY_INTERACTIVE):
+    key = (path, tuple(sorted((params or {}).items())))
+    return await _single_flight.do(key, lambda: _request(path, params, priority))
+
+
+async def find_coin_id(query: str, priority: int = PRIORITY_INTERACTIVE) -> str | None:
 
     query = query.lower().strip()
-    url = "https://api.coingecko.com/api/v3/search"
     params = {"query": query}
     try:
-        r = requests.get(url, params=params)
-        r.raise_for_status()
-        data = r.json()
-        time.sleep(1)
+        data = await _get_json("/search", params, priority)
         coins = data.get("coins", [])
         if not coins:
             return None
@@ -21,57 +130,55 @@ def find_coin_id(query: str) -> str | None:
             if coin["symbol"].lower() == query:
                 return coin["id"]
         return coins[0]["id"]
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, CircuitOpenError) as e:
         print(f"Error searching coin: {e}")
         return None
 
-def fetch_price_history(coin_id: str, days: int = 14) -> pd.DataFrame:
+async def fetch_price_history(coin_id: str, days: int = 14, priority: int = PRIORITY_INTERACTIVE) -> "pd.DataFrame":
+    import pandas as pd
 
-    url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
     params = {"vs_currency": "usd", "days": days}
     try:
-        r = requests.get(url, params=params)
-        r.raise_for_status()
-        data = r.json()
-        time.sleep(1)
+        data = await _get_json(f"/coins/{coin_id}/market_chart", params, priority)
         prices = data.get("prices", [])
         df = pd.DataFrame(prices, columns=["timestamp", "price"])
         if not df.empty:
             df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, CircuitOpenError) as e:
         print(f"Error fetching price history: {e}")
         return pd.DataFrame()
     return df
 
-def fetch_market_data(coin_id: str) -> dict | None:
+async def fetch_market_data(coin_id: str, priority: int = PRIORITY_INTERACTIVE) -> dict | None:
 
-    url = "https://api.coingecko.com/api/v3/coins/markets"
     params = {"vs_currency": "usd", "ids": coin_id}
     try:
-        r = requests.get(url, params=params)
-        r.raise_for_status()
-        data = r.json()
-        time.sleep(1)
+        data = await _get_json("/coins/markets", params, priority)
         if data:
             return data[0]
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, CircuitOpenError) as e:
         print(f"Error fetching market data: {e}")
         return None
     return None
 
-def fetch_ohlc_history(coin_id: str, days: int) -> pd.DataFrame:
+async def fetch_coin_list(priority: int = PRIORITY_INTERACTIVE) -> list[dict]:
 
-    url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/ohlc"
-    params = {"vs_currency": "usd", "days": days}
     try:
-        r = requests.get(url, params=params)
-        r.raise_for_status()
-        data = r.json()
-        time.sleep(1)
-        df = pd.DataFrame(data, columns=["timestamp", "open", "high", "low", "close"])
-        if not df.empty:
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching OHLC data: {e}")
-        return pd.DataFrame()
-    return df
+        data = await _get_json("/coins/list", None, priority)
+        return data or []
+    except (httpx.HTTPError, CircuitOpenError) as e:
+        print(f"Error fetching coin list: {e}")
+        return []
+
+async def fetch_markets_page(page: int, per_page: int = 250, priority: int = PRIORITY_INTERACTIVE,
+                             ids: list[str] | None = None) -> list[dict]:
+
+    params = {"vs_currency": "usd", "order": "market_cap_desc", "per_page": per_page, "page": page}
+    if ids:
+        params["ids"] = ",".join(ids)
+    try:
+        data = await _get_json("/coins/markets", params, priority)
+        return data or []
+    except (httpx.HTTPError, CircuitOpenError) as e:
+        print(f"Error fetching markets page: {e}")
+        return []
@@ -0,0 +1,42 @@
+from typing import NamedTuple
+import pandas as pd
+from services.cache import TTLCache
+from services.instrumentation import telemetry
+from services.market_data import get_ohlc_history, next_candle_at
+from services.metrics import Indicators, analyze_ohlc
+from services.rate_limiter import PRIORITY_INTERACTIVE
+from config import OHLC_CACHE_SIZE
+
+
+class CoinIndicators(NamedTuple):
+    coin_id: str
+    days: int
+    frame: pd.DataFrame
+    values: Indicators
+
+
+indicator_cache = TTLCache(OHLC_CACHE_SIZE)
+
+telemetry.gauge("bot_cache_entries", lambda: len(indicator_cache), cache="indicators")
+telemetry.gauge("bot_cache_hits_total", lambda: indicator_cache.hits, kind="counter", cache="indicators")
+telemetry.gauge("bot_cache_misses_total", lambda: indicator_cache.misses, kind="counter", cache="indicators")
+
+
+def compute_indicators(coin_id: str, days: int, df: pd.DataFrame) -> CoinIndicators:
+    with telemetry.span("calculate_indicators"):
+        values = analyze_ohlc(df["high"].to_numpy(dtype="float64"), df["low"].to_numpy(dtype="float64"),
+                              df["close"].to_numpy(dtype="float64"))
+    return CoinIndicators(coin_id, days, df, values)
+
+
+async def get_indicators(coin_id: str, days: int, priority: int = PRIORITY_INTERACTIVE) -> CoinIndicators | None:
+    df = await get_ohlc_history(coin_id, days, priority)
+    if df.empty or "close" not in df.columns:
+        return None
+    key = (coin_id, days)
+    # Valid for as long as the frame it was computed from is the one being served.
+    result = indicator_cache.get(key)
+    if result is None or result.frame is not df:
+        result = compute_indicators(coin_id, days, df)
+        indicator_cache.set(key, result, next_candle_at(df, days))
+    return result
@@ -0,0 +1,46 @@
+import asyncio
+import time
+from services.coin_summary import summary_table
+from services.instrumentation import telemetry
+from services.market_data import load_samples, sample_interval
+from services.market_snapshot import market_snapshot, fetch_markets_bulk
+from services.price_rings import price_rings
+from services.rate_limiter import PRIORITY_BACKGROUND
+from config import LIVE_PRICE_COINS, LIVE_PRICE_SEEDS_PER_POLL
+
+# Longest timeframe served from each ring tier; the rings are seeded from these windows.
+SEED_DAYS = (1, 90)
+
+
+async def seed(coin_id: str) -> bool:
+    tiers = await asyncio.gather(*(load_samples(coin_id, days, PRIORITY_BACKGROUND) for days in SEED_DAYS))
+    if not all(len(rows) for rows in tiers):
+        return False
+    return price_rings.add(coin_id, {sample_interval(days): rows for days, rows in zip(SEED_DAYS, tiers)})
+
+
+async def refresh_live_prices(context=None):
+    with telemetry.span("refresh_live_prices"):
+        hot = summary_table.hot(LIVE_PRICE_COINS)
+        wanted = set(hot)
+        new = [c for c in hot if c not in price_rings][:LIVE_PRICE_SEEDS_PER_POLL]
+        # Coins that dropped out of the hot list keep their slot until a newcomer needs it.
+        stale = [c for c in price_rings.coins() if c not in wanted]
+        for coin_id in stale[:max(0, len(new) - len(price_rings.free))]:
+            price_rings.remove(coin_id)
+
+        results = await asyncio.gather(*(seed(c) for c in new), return_exceptions=True)
+        for coin_id, result in zip(new, results):
+            if isinstance(result, BaseException):
+                print(f"Error seeding live prices for {coin_id}: {result}")
+
+        tracked = price_rings.coins()
+        if not tracked:
+            return
+        try:
+            rows = await fetch_markets_bulk(tracked, PRIORITY_BACKGROUND)
+        except Exception as e:
+            print(f"Error polling live prices: {e}")
+            return
+        market_snapshot.update(rows)
+        price_rings.push([r["id"] for r in rows], [r.get("current_price") for r in rows], int(time.time() * 1000))
@@ -0,0 +1,125 @@
+import math
+import time
+import numpy as np
+import pandas as pd
+from services.cache import TTLCache
+from services.instrumentation import telemetry
+from services.coingecko_api import fetch_price_history
+from services.price_rings import price_rings
+from services.ohlc_store import ohlc_store, prices_to_records, records_to_frame, resample_records
+from services.rate_limiter import PRIORITY_INTERACTIVE
+from config import OHLC_CACHE_SIZE, OHLC_CACHE_MIN_TTL
+
+ohlc_cache = TTLCache(OHLC_CACHE_SIZE)
+live_frames = TTLCache(OHLC_CACHE_SIZE)
+
+telemetry.gauge("bot_cache_entries", lambda: len(ohlc_cache), cache="ohlc")
+telemetry.gauge("bot_cache_hits_total", lambda: ohlc_cache.hits, kind="counter", cache="ohlc")
+telemetry.gauge("bot_cache_misses_total", lambda: ohlc_cache.misses, kind="counter", cache="ohlc")
+
+# market_chart returns 5-minute samples for up to 1 day, hourly up to 90 days and daily beyond.
+# Each tier is stored once per coin and every timeframe's candles are resampled from it.
+SAMPLE_FETCH_DAYS = {5 * 60: (1, 1), 3600: (2, 90), 86400: (91, 365)}
+
+
+def sample_interval(days: int) -> int:
+    if days <= 1:
+        return 5 * 60
+    if days <= 90:
+        return 3600
+    return 86400
+
+
+def candle_interval(days: int) -> int:
+    if days <= 2:
+        interval = 30 * 60
+    elif days <= 30:
+        interval = 4 * 3600
+    else:
+        interval = 4 * 86400
+    return max(interval, sample_interval(days))
+
+
+def next_candle_at(df: pd.DataFrame, days: int) -> float:
+    now = time.time()
+    step = sample_interval(days)
+    last_ts = df["timestamp"].iloc[-1].timestamp()
+    return max(last_ts + step, now + OHLC_CACHE_MIN_TTL)
+
+
+def window_bounds(days: int, now_ms: int) -> tuple[int, int]:
+    interval = candle_interval(days)
+    start_ms = now_ms - days * 86400 * 1000
+    # One bar before the window so the first candle has an open.
+    from_ms = (start_ms // (interval * 1000) - 1) * interval * 1000
+    return start_ms, from_ms
+
+
+def live_ohlc(coin_id: str, days: int) -> pd.DataFrame | None:
+    if coin_id not in price_rings:
+        return None
+    key = (coin_id, days, price_rings.version)
+    df = live_frames.get(key)
+    if df is not None:
+        return df
+    now_ms = int(time.time() * 1000)
+    start_ms, from_ms = window_bounds(days, now_ms)
+    samples = price_rings.window(coin_id, sample_interval(days), from_ms, start_ms, now_ms)
+    telemetry.inc("bot_live_price_reads_total", result="miss" if samples is None else "hit")
+    if samples is None:
+        return None
+    bars = resample_records(samples, candle_interval(days))
+    df = records_to_frame(bars[bars["timestamp"] >= start_ms])
+    live_frames.set(key, df, samples["timestamp"][-1] / 1000 + price_rings.max_age)
+    return df
+
+
+async def get_ohlc_history(coin_id: str, days: int, priority: int = PRIORITY_INTERACTIVE) -> pd.DataFrame:
+    df = live_ohlc(coin_id, days)
+    if df is not None:
+        return df
+
+    key = (coin_id, days)
+    df = ohlc_cache.get(key)
+    if df is not None:
+        return df
+
+    with telemetry.span("load_ohlc"):
+        df = await _load_ohlc(coin_id, days, priority)
+    if not df.empty:
+        ohlc_cache.set(key, df, next_candle_at(df, days))
+    return df
+
+
+async def load_samples(coin_id: str, days: int, priority: int = PRIORITY_INTERACTIVE) -> np.ndarray:
+    sample = sample_interval(days)
+    now_ms = int(time.time() * 1000)
+    start_ms, from_ms = window_bounds(days, now_ms)
+
+    stored = ohlc_store.window(coin_id, sample, from_ms)
+    covered = bool(len(stored)) and stored["timestamp"][0] <= start_ms + sample * 1000
+    if not covered or stored["timestamp"][-1] + sample * 1000 <= now_ms:
+        min_days, backfill_days = SAMPLE_FETCH_DAYS[sample]
+        if covered and not ohlc_store.readonly:
+            gap_days = math.ceil((now_ms - int(stored["timestamp"][-1])) / 86_400_000)
+            fetch_days = min(max(gap_days, min_days), backfill_days)
+        else:
+            fetch_days = max(days, min_days if ohlc_store.readonly else backfill_days)
+        prices = await fetch_price_history(coin_id, fetch_days, priority)
+        if prices.empty:
+            if not covered:
+                return stored[:0]
+        elif ohlc_store.readonly:
+            fetched = prices_to_records(prices)
+            stored = fetched[fetched["timestamp"] >= from_ms]
+        else:
+            ohlc_store.merge(coin_id, sample, prices_to_records(prices))
+            stored = ohlc_store.window(coin_id, sample, from_ms)
+    return stored
+
+
+async def _load_ohlc(coin_id: str, days: int, priority: int) -> pd.DataFrame:
+    stored = await load_samples(coin_id, days, priority)
+    start_ms = int(time.time() * 1000) - days * 86400 * 1000
+    bars = resample_records(stored, candle_interval(days))
+    return records_to_frame(bars[bars["timestamp"] >= start_ms])
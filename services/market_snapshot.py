@@ -0,0 +1,88 @@
+import asyncio
+import time
+from services.coingecko_api import fetch_markets_page
+from services.rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from config import MARKET_SNAPSHOT_TOP, MARKET_SNAPSHOT_MAX_AGE, MARKET_SNAPSHOT_TRACKED
+
+MARKETS_PER_CALL = 250
+
+
+async def fetch_markets_bulk(coin_ids: list[str], priority: int = PRIORITY_INTERACTIVE) -> list[dict]:
+    chunks = [coin_ids[i:i + MARKETS_PER_CALL] for i in range(0, len(coin_ids), MARKETS_PER_CALL)]
+    pages = await asyncio.gather(*(
+        fetch_markets_page(1, MARKETS_PER_CALL, priority, ids=chunk) for chunk in chunks
+    ))
+    return [row for page in pages for row in page]
+
+
+async def fetch_top_markets(count: int, priority: int = PRIORITY_INTERACTIVE) -> list[dict]:
+    pages = (count + MARKETS_PER_CALL - 1) // MARKETS_PER_CALL
+    results = await asyncio.gather(*(
+        fetch_markets_page(page, MARKETS_PER_CALL, priority) for page in range(1, pages + 1)
+    ))
+    return [row for page in results for row in page][:count]
+
+
+class MarketSnapshot:
+
+    def __init__(self, max_age: float, max_tracked: int):
+        self.max_age = max_age
+        self.max_tracked = max_tracked
+        self.rows: dict[str, dict] = {}
+        self.updated: dict[str, float] = {}
+        self.tracked: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def update(self, rows: list[dict]):
+        now = time.time()
+        for row in rows:
+            self.rows[row["id"]] = row
+            self.updated[row["id"]] = now
+
+    def track(self, coin_ids: list[str]):
+        now = time.time()
+        for coin_id in coin_ids:
+            self.tracked[coin_id] = now
+        if len(self.tracked) > self.max_tracked:
+            stale = sorted(self.tracked, key=self.tracked.get)[:len(self.tracked) - self.max_tracked]
+            for coin_id in stale:
+                del self.tracked[coin_id]
+
+    def top(self, count: int) -> list[dict]:
+        now = time.time()
+        fresh = [r for r in self.rows.values()
+                 if r.get("market_cap_rank") and r["market_cap_rank"] <= count
+                 and now - self.updated[r["id"]] <= self.max_age]
+        return sorted(fresh, key=lambda r: r["market_cap_rank"])
+
+    async def ensure(self, coin_ids: list[str], priority: int = PRIORITY_INTERACTIVE) -> list[dict]:
+        self.track(coin_ids)
+        now = time.time()
+        missing = [c for c in coin_ids if now - self.updated.get(c, 0) > self.max_age]
+        if missing:
+            self.update(await fetch_markets_bulk(missing, priority))
+        return [self.rows[c] for c in coin_ids if c in self.rows]
+
+    async def ensure_top(self, count: int, priority: int = PRIORITY_INTERACTIVE) -> list[dict]:
+        rows = self.top(count)
+        if len(rows) < count:
+            self.update(await fetch_top_markets(count, priority))
+            rows = self.top(count)
+        return rows
+
+    async def refresh(self):
+        top = await fetch_top_markets(MARKET_SNAPSHOT_TOP, PRIORITY_BACKGROUND)
+        self.update(top)
+        top_ids = {row["id"] for row in top}
+        extra = [c for c in self.tracked if c not in top_ids]
+        if extra:
+            self.update(await fetch_markets_bulk(extra, PRIORITY_BACKGROUND))
+
+
+market_snapshot = MarketSnapshot(MARKET_SNAPSHOT_MAX_AGE, MARKET_SNAPSHOT_TRACKED)
+
+
+async def refresh_market_snapshot(context=None):
+    await market_snapshot.refresh()
@@ -1,36 +1,249 @@
-import pandas as pd
+from typing import NamedTuple, TYPE_CHECKING
+import numpy as np
 
-def calculate_rsi(df: pd.DataFrame, length: int = 14) -> pd.Series | None:
+if TYPE_CHECKING:
+    import pandas as pd
 
-    if df.empty or "close" not in df.columns:
-        return None
+OVERSOLD = 30
+OVERBOUGHT = 70
+RISK_MULTIPLIER = 1.5
+REWARD_MULTIPLIER = 3
+DEFAULT_STEP_VOLATILITY = 0.02
+ANNUALIZATION = 252 ** 0.5
+ATR_MULTIPLIER = 1.5
+BOLLINGER_LENGTH = 20
+BOLLINGER_WIDTH = 2
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+REALIZED_LENGTH = 20
 
-    delta = df['close'].diff()
-    gain = delta.where(delta > 0, 0.0)
-    loss = -delta.where(delta < 0, 0.0)
+# Weights grow as decay ** -k inside a block; 128 keeps them far from overflow for any length >= 2.
+_EWM_BLOCK = 128
 
-    avg_gain = gain.ewm(com=length - 1, min_periods=length).mean()
-    avg_loss = loss.ewm(com=length - 1, min_periods=length).mean()
 
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
+class Analysis(NamedTuple):
+    rsi: np.ndarray
+    returns: np.ndarray
+    step_volatility: float | None
+    volatility: float | None
+    last_price: float | None
+    entry: float | None
+    stop: float | None
+    target: float | None
+    rr_ratio: float | None
+
+
+class Indicators(NamedTuple):
+    rsi: np.ndarray
+    atr: np.ndarray
+    bollinger_mid: np.ndarray
+    bollinger_upper: np.ndarray
+    bollinger_lower: np.ndarray
+    macd: np.ndarray
+    macd_signal: np.ndarray
+    realized_volatility: np.ndarray
+    returns: np.ndarray
+    step_volatility: float | None
+    volatility: float | None
+    last_price: float | None
+    entry: float | None
+    stop: float | None
+    target: float | None
+    rr_ratio: float | None
+    atr_stop: float | None
+
+    @property
+    def macd_histogram(self) -> np.ndarray:
+        return self.macd - self.macd_signal
+
+
+def ewm_mean(values: np.ndarray, length) -> np.ndarray:
+    # ewm(com=length - 1, adjust=True).mean() for NaN-free input: a decayed cumulative sum over
+    # a decayed count, computed block by block and carried across blocks. The rows of a 2-D input
+    # are smoothed together, each with its own length.
+    decay = 1 - 1 / np.asarray(length, dtype="float64")
+    if values.ndim == 2:
+        decay = decay.reshape(-1, 1)
+    if not np.all(decay):
+        return values.astype("float64", copy=True)
+    count = values.shape[-1]
+    out = np.empty(values.shape)
+    powers = decay ** np.arange(min(count, _EWM_BLOCK))
+    carry = 0.0
+    for start in range(0, count, _EWM_BLOCK):
+        block = values[..., start:start + _EWM_BLOCK]
+        scale = powers[..., :block.shape[-1]]
+        chunk = out[..., start:start + block.shape[-1]]
+        np.divide(block, scale, out=chunk)
+        np.cumsum(chunk, axis=-1, out=chunk)
+        chunk += decay * carry
+        chunk *= scale
+        carry = chunk[..., -1:]
+    out /= (1 - decay ** np.arange(1, count + 1)) / (1 - decay)
+    return out
+
+
+def span_length(span: int) -> float:
+    # ewm(span=n) is ewm(com=(n - 1) / 2).
+    return (span + 1) / 2
 
-    if rsi.isnull().all():
-        return None
 
+def rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray, length: int) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_gain /= avg_loss
+    avg_gain += 1
+    rsi = np.divide(100, avg_gain, out=avg_gain)
+    np.subtract(100, rsi, out=rsi)
+    rsi[:length - 1] = np.nan
     return rsi
 
-def calculate_volatility(df: pd.DataFrame) -> float | None:
+
+def fill_missing(closes: np.ndarray) -> tuple[np.ndarray, int]:
+    # The kernels need NaN-free input. As with pandas' pct_change, a missing close repeats the one
+    # before it; leading gaps have nothing to repeat, so they are cut off and their count returned.
+    missing = np.isnan(closes)
+    if not missing.any():
+        return closes, 0
+    index = np.where(missing, 0, np.arange(len(closes)))
+    np.maximum.accumulate(index, out=index)
+    lead = len(closes) if missing.all() else int(np.argmin(missing))
+    return closes[index][lead:], lead
+
+
+def pad_front(values: np.ndarray, count: int) -> np.ndarray:
+    if not count:
+        return values
+    return np.concatenate([np.full(count, np.nan), values])
+
+
+def rsi_kernel(closes: np.ndarray, length: int = 14) -> np.ndarray:
+    delta = np.empty(len(closes))
+    delta[:1] = 0.0
+    np.subtract(closes[1:], closes[:-1], out=delta[1:])
+    avg_gain = ewm_mean(np.maximum(delta, 0.0), length)
+    avg_loss = ewm_mean(np.maximum(-delta, 0.0), length)
+    return rsi_from_averages(avg_gain, avg_loss, length)
+
+
+def rolling_mean_std(values: np.ndarray, window: int, ddof: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    mean = np.full(len(values), np.nan)
+    std = np.full(len(values), np.nan)
+    if len(values) >= window > ddof:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+        window_mean = mean[window - 1:]
+        np.mean(windows, axis=1, out=window_mean)
+        deviations = windows - window_mean[:, None]
+        deviations *= deviations
+        np.sqrt(deviations.sum(axis=1) / (window - ddof), out=std[window - 1:])
+    return mean, std
+
+
+def returns_kernel(closes: np.ndarray) -> tuple[np.ndarray, float | None, float | None]:
+    returns = closes[1:] / closes[:-1]
+    returns -= 1
+    if not len(returns):
+        return returns, None, None
+    step_volatility = float(returns.std(ddof=1)) if len(returns) > 1 else float("nan")
+    return returns, step_volatility, step_volatility * ANNUALIZATION * 100
+
+
+def trade_levels(last_price: float, rsi_value: float, step_volatility: float
+                 ) -> tuple[float | None, float | None, float | None, float | None]:
+    risk_pct = step_volatility * RISK_MULTIPLIER
+    reward_pct = step_volatility * REWARD_MULTIPLIER
+    if rsi_value < OVERSOLD:
+        entry, stop, target = last_price, last_price * (1 - risk_pct), last_price * (1 + reward_pct)
+    elif rsi_value > OVERBOUGHT:
+        entry, stop, target = last_price, last_price * (1 + risk_pct), last_price * (1 - reward_pct)
+    else:
+        return None, None, None, None
+    risk = abs(entry - stop)
+    return entry, stop, target, abs(target - entry) / risk if risk > 0 else None
+
+
+def analyze_closes(closes: np.ndarray, length: int = 14) -> Analysis:
+    closes, lead = fill_missing(np.asarray(closes, dtype="float64"))
+    if not len(closes):
+        return Analysis(np.full(lead, np.nan), np.full(max(lead - 1, 0), np.nan), None, None, None, None, None,
+                        None, None)
+
+    rsi = pad_front(rsi_kernel(closes, length), lead)
+    returns, step_volatility, volatility = returns_kernel(closes)
+    returns = pad_front(returns, lead)
+    last_price = float(closes[-1])
+    levels = (None, None, None, None)
+    if len(rsi) and not np.isnan(rsi[-1]):
+        step = step_volatility if step_volatility is not None else DEFAULT_STEP_VOLATILITY
+        levels = trade_levels(last_price, float(rsi[-1]), step)
+    return Analysis(rsi, returns, step_volatility, volatility, last_price, *levels)
+
+
+def analyze_ohlc(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int = 14) -> Indicators:
+    close, lead = fill_missing(np.asarray(close, dtype="float64"))
+    if not len(close):
+        return Indicators(*(np.full(lead, np.nan),) * 8, np.full(max(lead - 1, 0), np.nan), *(None,) * 8)
+    high, low = (np.asarray(a, dtype="float64")[lead:] for a in (high, low))
+    high = np.where(np.isnan(high), close, high)
+    low = np.where(np.isnan(low), close, low)
+
+    previous = np.empty(len(close))
+    previous[0] = close[0]
+    previous[1:] = close[:-1]
+    delta = close - previous
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - previous), np.abs(low - previous)))
+    # RSI's average gain and loss, ATR's true range and both MACD averages share one smoothing pass.
+    smoothed = ewm_mean(
+        np.stack([np.maximum(delta, 0.0), np.maximum(-delta, 0.0), true_range, close, close]),
+        [length, length, length, span_length(MACD_FAST), span_length(MACD_SLOW)],
+    )
+    rsi = rsi_from_averages(smoothed[0], smoothed[1], length)
+    atr = smoothed[2]
+    macd = smoothed[3] - smoothed[4]
+    macd_signal = ewm_mean(macd, span_length(MACD_SIGNAL))
+
+    bollinger_mid, deviation = rolling_mean_std(close, BOLLINGER_LENGTH)
+    deviation *= BOLLINGER_WIDTH
+
+    returns, step_volatility, volatility = returns_kernel(close)
+    realized = np.full(len(close), np.nan)
+    realized[1:] = rolling_mean_std(np.log1p(returns), REALIZED_LENGTH, ddof=1)[1]
+    realized *= ANNUALIZATION * 100
+
+    last_price = float(close[-1])
+    levels = (None, None, None, None)
+    atr_stop = None
+    if not np.isnan(rsi[-1]):
+        step = step_volatility if step_volatility is not None else DEFAULT_STEP_VOLATILITY
+        levels = trade_levels(last_price, float(rsi[-1]), step)
+        if levels[0] is not None:
+            side = 1 if levels[2] > levels[0] else -1
+            atr_stop = last_price - side * ATR_MULTIPLIER * float(atr[-1])
+    series = (rsi, atr, bollinger_mid, bollinger_mid + deviation, bollinger_mid - deviation, macd, macd_signal,
+              realized, returns)
+    return Indicators(*(pad_front(values, lead) for values in series), step_volatility, volatility, last_price,
+                      *levels, atr_stop)
+
+
+def calculate_rsi(df: "pd.DataFrame", length: int = 14) -> "pd.Series | None":
+    import pandas as pd
 
     if df.empty or "close" not in df.columns:
         return None
 
-    returns = df['close'].pct_change().dropna()
-    if returns.empty:
+    closes, lead = fill_missing(df["close"].to_numpy(dtype="float64"))
+    rsi = pad_front(rsi_kernel(closes, length), lead)
+    if np.isnan(rsi).all():
+        return None
+
+    return pd.Series(rsi, index=df.index, name="close")
+
+def calculate_volatility(df: "pd.DataFrame") -> float | None:
+
+    if df.empty or "close" not in df.columns:
         return None
 
-    volatility = returns.std() * (252 ** 0.5)
-    return volatility * 100
+    return returns_kernel(fill_missing(df["close"].to_numpy(dtype="float64"))[0])[2]
 
 def calculate_risk_reward(
     entry: float, stop: float, target: float
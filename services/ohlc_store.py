@@ -0,0 +1,130 @@
+import os
+import re
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from config import OHLC_STORE_DIR, OHLC_STORE_READONLY, OHLC_STORE_OPEN_MAPS
+
+OHLC_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+])
+
+_EMPTY = np.zeros(0, dtype=OHLC_DTYPE)
+
+
+def samples_to_records(timestamps: np.ndarray, prices: np.ndarray) -> np.ndarray:
+    rows = np.empty(len(timestamps), dtype=OHLC_DTYPE)
+    rows["timestamp"] = timestamps
+    for column in ("open", "high", "low", "close"):
+        rows[column] = prices
+    return rows
+
+
+def prices_to_records(df: pd.DataFrame) -> np.ndarray:
+    return samples_to_records(df["timestamp"].to_numpy().astype("datetime64[ms]").astype("int64"),
+                              df["price"].to_numpy(dtype="float64"))
+
+
+def resample_records(rows: np.ndarray, interval: int, origin_ms: int = 0) -> np.ndarray:
+    # Bars are labelled by their closing edge and open at the last sample before them, the way
+    # CoinGecko builds its candles; the unfinished last bar is labelled by its latest sample.
+    if not len(rows):
+        return _EMPTY
+    step = interval * 1000
+    timestamps = rows["timestamp"]
+    edges = -(-(timestamps - origin_ms) // step) * step + origin_ms
+    starts = np.flatnonzero(np.r_[True, edges[1:] != edges[:-1]])
+    ends = np.r_[starts[1:], len(rows)] - 1
+
+    bars = np.empty(len(starts), dtype=OHLC_DTYPE)
+    bars["timestamp"] = edges[starts]
+    bars["timestamp"][-1] = timestamps[-1]
+    bars["open"] = rows["close"][starts - 1]
+    bars["open"][0] = rows["open"][0]
+    bars["high"] = np.maximum(np.maximum.reduceat(rows["high"], starts), bars["open"])
+    bars["low"] = np.minimum(np.minimum.reduceat(rows["low"], starts), bars["open"])
+    bars["close"] = rows["close"][ends]
+    return bars
+
+
+def records_to_frame(rows: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({
+        "timestamp": pd.to_datetime(rows["timestamp"], unit="ms"),
+        "open": rows["open"],
+        "high": rows["high"],
+        "low": rows["low"],
+        "close": rows["close"],
+    })
+
+
+class OhlcStore:
+
+    def __init__(self, root: str, readonly: bool = False, max_maps: int = OHLC_STORE_OPEN_MAPS):
+        self.root = root
+        self.readonly = readonly
+        self.max_maps = max_maps
+        # Every map holds a file descriptor until the last view of it is gone, so only the most
+        # recently read files stay mapped.
+        self._maps: OrderedDict[str, tuple[int, np.memmap]] = OrderedDict()
+
+    def _path(self, coin_id: str, interval: int) -> str:
+        safe_id = re.sub(r"[^a-z0-9._-]", "_", coin_id.lower())
+        return os.path.join(self.root, safe_id, f"{interval}.bin")
+
+    def read(self, coin_id: str, interval: int) -> np.ndarray:
+        path = self._path(coin_id, interval)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return _EMPTY
+        size -= size % OHLC_DTYPE.itemsize
+        if size == 0:
+            return _EMPTY
+        cached = self._maps.get(path)
+        if cached is None or cached[0] != size:
+            cached = (size, np.memmap(path, dtype=OHLC_DTYPE, mode="r", shape=(size // OHLC_DTYPE.itemsize,)))
+            self._maps[path] = cached
+            while len(self._maps) > self.max_maps:
+                self._maps.popitem(last=False)
+        self._maps.move_to_end(path)
+        return cached[1]
+
+    def window(self, coin_id: str, interval: int, start_ms: int) -> np.ndarray:
+        rows = self.read(coin_id, interval)
+        start = np.searchsorted(rows["timestamp"], start_ms, side="left")
+        return rows[start:]
+
+    def merge(self, coin_id: str, interval: int, rows: np.ndarray) -> int:
+        if self.readonly or not len(rows):
+            return 0
+        path = self._path(coin_id, interval)
+        existing = self.read(coin_id, interval)
+        first, last = int(rows["timestamp"][0]), int(rows["timestamp"][-1])
+
+        if not len(existing) or first > int(existing["timestamp"][-1]) + interval * 1000:
+            mode, added = "wb", len(rows)
+        elif first < int(existing["timestamp"][0]):
+            newer = existing[existing["timestamp"] > last]
+            added = len(rows) + len(newer) - len(existing)
+            rows, mode = np.concatenate([rows, newer]), "wb"
+        else:
+            rows = rows[rows["timestamp"] > existing["timestamp"][-1]]
+            mode, added = "ab", len(rows)
+        if not len(rows):
+            return 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._maps.pop(path, None)
+        tmp_path = f"{path}.tmp" if mode == "wb" else path
+        with open(tmp_path, mode) as f:
+            f.write(np.ascontiguousarray(rows).tobytes())
+        if tmp_path != path:
+            os.replace(tmp_path, path)
+        return added
+
+
+ohlc_store = OhlcStore(OHLC_STORE_DIR, OHLC_STORE_READONLY)
@@ -0,0 +1,81 @@
+from typing import Any, Callable, Coroutine
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+from services.instrumentation import telemetry
+from services.rate_limiter import TokenBucketScheduler, PRIORITY_INTERACTIVE
+from config import (
+    TELEGRAM_GLOBAL_RATE, TELEGRAM_GLOBAL_BURST, TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST,
+    TELEGRAM_GROUP_RATE_PER_MINUTE, TELEGRAM_MAX_RETRIES
+)
+
+MAX_IDLE_CHATS = 10000
+
+
+class OutboundLimiter(BaseRateLimiter):
+
+    def __init__(self, global_rate: float = TELEGRAM_GLOBAL_RATE, global_burst: int = TELEGRAM_GLOBAL_BURST,
+                 chat_rate: float = TELEGRAM_CHAT_RATE, chat_burst: int = TELEGRAM_CHAT_BURST,
+                 group_rate_per_minute: float = TELEGRAM_GROUP_RATE_PER_MINUTE,
+                 max_retries: int = TELEGRAM_MAX_RETRIES):
+        self.global_bucket = TokenBucketScheduler(global_rate, global_burst)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate_per_minute / 60
+        self.max_retries = max_retries
+        self.chats: dict[int | str, TokenBucketScheduler] = {}
+        self.retries = 0
+        telemetry.gauge("bot_outbound_queue_depth", lambda: self.global_bucket.queue_depth)
+        telemetry.gauge("bot_outbound_chats", lambda: len(self.chats))
+        telemetry.gauge("bot_outbound_retries_total", lambda: self.retries, kind="counter")
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    def _chat_bucket(self, chat_id: int | str) -> TokenBucketScheduler:
+        bucket = self.chats.get(chat_id)
+        if bucket is None:
+            if len(self.chats) >= MAX_IDLE_CHATS:
+                self._prune()
+            group = isinstance(chat_id, str) or chat_id < 0
+            if group:
+                bucket = TokenBucketScheduler(self.group_rate, max(1, min(self.chat_burst, int(self.group_rate * 60))))
+            else:
+                bucket = TokenBucketScheduler(self.chat_rate, self.chat_burst)
+            self.chats[chat_id] = bucket
+        return bucket
+
+    def _prune(self):
+        for chat_id, bucket in list(self.chats.items()):
+            if bucket.idle:
+                del self.chats[chat_id]
+
+    async def process_request(self, callback: Callable[..., Coroutine[Any, Any, Any]], args: Any,
+                              kwargs: dict[str, Any], endpoint: str, data: dict[str, Any],
+                              rate_limit_args: int | None) -> Any:
+        chat_id = data.get("chat_id")
+        if chat_id is None:
+            # Callback and inline answers are not chat messages and must go out immediately.
+            return await callback(*args, **kwargs)
+        if isinstance(chat_id, str) and chat_id.lstrip("-").isdigit():
+            chat_id = int(chat_id)
+
+        priority = PRIORITY_INTERACTIVE if rate_limit_args is None else rate_limit_args
+        chat_bucket = self._chat_bucket(chat_id)
+        for attempt in range(self.max_retries + 1):
+            # Wait for the chat's own turn before taking a global token, so a busy chat never holds
+            # up everyone else.
+            await chat_bucket.acquire(priority)
+            await self.global_bucket.acquire(priority)
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                if attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                telemetry.inc("bot_outbound_flood_waits_total", endpoint=endpoint)
+                # Telegram asks the whole bot to back off, not just this chat.
+                chat_bucket.pause(e.retry_after)
+                self.global_bucket.pause(e.retry_after)
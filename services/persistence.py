@@ -0,0 +1,96 @@
+import json
+import os
+import sqlite3
+from telegram.ext import BasePersistence, PersistenceInput
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_data (
+    user_id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS conversations (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (name, key)
+);
+"""
+
+
+class SqlitePersistence(BasePersistence):
+
+    def __init__(self, path: str, update_interval: float = 1.0):
+        super().__init__(
+            store_data=PersistenceInput(bot_data=False, chat_data=False, user_data=True, callback_data=False),
+            update_interval=update_interval,
+        )
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    async def get_user_data(self) -> dict[int, dict]:
+        rows = self.conn.execute("SELECT user_id, data FROM user_data").fetchall()
+        return {user_id: json.loads(data) for user_id, data in rows}
+
+    async def get_chat_data(self) -> dict[int, dict]:
+        return {}
+
+    async def get_bot_data(self) -> dict:
+        return {}
+
+    async def get_callback_data(self):
+        return None
+
+    async def get_conversations(self, name: str) -> dict:
+        rows = self.conn.execute("SELECT key, state FROM conversations WHERE name = ?", (name,)).fetchall()
+        return {tuple(json.loads(key)): json.loads(state) for key, state in rows}
+
+    async def update_conversation(self, name: str, key: tuple, new_state: object | None):
+        with self.conn:
+            if new_state is None:
+                self.conn.execute("DELETE FROM conversations WHERE name = ? AND key = ?", (name, json.dumps(key)))
+            else:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO conversations (name, key, state) VALUES (?, ?, ?)",
+                    (name, json.dumps(key), json.dumps(new_state)),
+                )
+
+    async def update_user_data(self, user_id: int, data: dict):
+        with self.conn:
+            if data:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO user_data (user_id, data) VALUES (?, ?)", (user_id, json.dumps(data))
+                )
+            else:
+                self.conn.execute("DELETE FROM user_data WHERE user_id = ?", (user_id,))
+
+    async def update_chat_data(self, chat_id: int, data: dict):
+        pass
+
+    async def update_bot_data(self, data: dict):
+        pass
+
+    async def update_callback_data(self, data):
+        pass
+
+    async def drop_chat_data(self, chat_id: int):
+        pass
+
+    async def drop_user_data(self, user_id: int):
+        with self.conn:
+            self.conn.execute("DELETE FROM user_data WHERE user_id = ?", (user_id,))
+
+    async def refresh_user_data(self, user_id: int, user_data: dict):
+        pass
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: dict):
+        pass
+
+    async def refresh_bot_data(self, bot_data: dict):
+        pass
+
+    async def flush(self):
+        self.conn.commit()
@@ -0,0 +1,130 @@
+import numpy as np
+from services.instrumentation import telemetry
+from services.ohlc_store import samples_to_records
+from config import LIVE_PRICE_COINS, LIVE_PRICE_MAX_AGE
+
+# Samples kept per coin for each stored tier: a day of 5-minute samples, and 90 days of hourly
+# samples plus the 4-day candle before the window.
+LIVE_TIERS = {5 * 60: 320, 3600: 2400}
+
+
+class PriceRing:
+
+    def __init__(self, interval: int, capacity: int, slots: int):
+        self.interval = interval
+        self.capacity = capacity
+        # One row per coin slot. np.zeros leaves the pages untouched until a slot is written.
+        self.timestamps = np.zeros((slots, capacity), dtype="int64")
+        self.prices = np.zeros((slots, capacity), dtype="float64")
+        self.heads = np.zeros(slots, dtype="int64")
+        self.counts = np.zeros(slots, dtype="int64")
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + self.prices.nbytes + self.heads.nbytes + self.counts.nbytes
+
+    def load(self, slot: int, rows: np.ndarray):
+        rows = rows[-self.capacity:]
+        count = len(rows)
+        self.timestamps[slot, :count] = rows["timestamp"]
+        self.prices[slot, :count] = rows["close"]
+        self.heads[slot] = count % self.capacity
+        self.counts[slot] = count
+
+    def push(self, slots: np.ndarray, timestamps: np.ndarray, prices: np.ndarray):
+        heads, counts = self.heads[slots], self.counts[slots]
+        last = (heads - 1) % self.capacity
+        newer = (counts == 0) | (timestamps > self.timestamps[slots, last])
+        slots, heads, counts, last = slots[newer], heads[newer], counts[newer], last[newer]
+        timestamps, prices = timestamps[newer], prices[newer]
+
+        # The newest sample is the live price. While it is less than a full interval past the last
+        # closed sample it is overwritten; once it reaches the interval it is kept as the next closed
+        # sample and the tick starts a new live one, so kept samples are exactly one interval apart.
+        closed = self.timestamps[slots, (heads - 2) % self.capacity]
+        live = self.timestamps[slots, last]
+        overwrite = (counts >= 2) & (live - closed < self.interval * 1000)
+        positions = np.where(overwrite, last, heads)
+        self.timestamps[slots, positions] = timestamps
+        self.prices[slots, positions] = prices
+        self.heads[slots] = np.where(overwrite, heads, (heads + 1) % self.capacity)
+        self.counts[slots] = np.minimum(counts + ~overwrite, self.capacity)
+
+    def window(self, slot: int, from_ms: int) -> np.ndarray:
+        count = self.counts[slot]
+        order = (self.heads[slot] - count + np.arange(count)) % self.capacity
+        timestamps = self.timestamps[slot, order]
+        start = np.searchsorted(timestamps, from_ms, side="left")
+        return samples_to_records(timestamps[start:], self.prices[slot, order[start:]])
+
+
+class PriceRings:
+
+    def __init__(self, slots: int, max_age: float):
+        self.max_age = max_age
+        self.rings = {interval: PriceRing(interval, capacity, slots) for interval, capacity in LIVE_TIERS.items()}
+        self.slots: dict[str, int] = {}
+        self.free = list(range(slots - 1, -1, -1))
+        # Bumped on every write so readers can key derived data on it.
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __contains__(self, coin_id: str) -> bool:
+        return coin_id in self.slots
+
+    @property
+    def nbytes(self) -> int:
+        return sum(ring.nbytes for ring in self.rings.values())
+
+    def coins(self) -> list[str]:
+        return list(self.slots)
+
+    def add(self, coin_id: str, tiers: dict[int, np.ndarray]) -> bool:
+        slot = self.slots.get(coin_id)
+        if slot is None:
+            if not self.free:
+                return False
+            slot = self.free.pop()
+        for interval, rows in tiers.items():
+            self.rings[interval].load(slot, rows)
+        self.slots[coin_id] = slot
+        self.version += 1
+        return True
+
+    def remove(self, coin_id: str):
+        slot = self.slots.pop(coin_id, None)
+        if slot is not None:
+            for ring in self.rings.values():
+                ring.counts[slot] = 0
+            self.free.append(slot)
+            self.version += 1
+
+    def push(self, coin_ids: list[str], prices: list[float], timestamp_ms: int):
+        pairs = [(self.slots[c], p) for c, p in zip(coin_ids, prices) if c in self.slots and p]
+        if not pairs:
+            return
+        slots = np.fromiter((s for s, _ in pairs), dtype="int64", count=len(pairs))
+        values = np.fromiter((p for _, p in pairs), dtype="float64", count=len(pairs))
+        timestamps = np.full(len(pairs), timestamp_ms, dtype="int64")
+        for ring in self.rings.values():
+            ring.push(slots, timestamps, values)
+        self.version += 1
+
+    def window(self, coin_id: str, interval: int, from_ms: int, start_ms: int, now_ms: int) -> np.ndarray | None:
+        slot = self.slots.get(coin_id)
+        ring = self.rings.get(interval)
+        if slot is None or ring is None:
+            return None
+        rows = ring.window(slot, from_ms)
+        if (not len(rows) or rows["timestamp"][0] > start_ms + interval * 1000
+                or now_ms - rows["timestamp"][-1] > self.max_age * 1000):
+            return None
+        return rows
+
+
+price_rings = PriceRings(LIVE_PRICE_COINS, LIVE_PRICE_MAX_AGE)
+
+telemetry.gauge("bot_live_price_coins", lambda: len(price_rings))
+telemetry.gauge("bot_live_price_bytes", lambda: price_rings.nbytes)
@@ -0,0 +1,251 @@
+import io
+import math
+import struct
+import time
+import zlib
+import numpy as np
+
+WIDTH, HEIGHT = 1200, 800
+LEFT, RIGHT, TOP, BOTTOM = 110, 1180, 60, 740
+PANEL_GAP = 40
+PRICE_BOTTOM = TOP + (BOTTOM - TOP - PANEL_GAP) * 3 // 4
+RSI_TOP = PRICE_BOTTOM + PANEL_GAP
+
+BACKGROUND, WHITE, CYAN, RED, GREEN, RED_BAND, GREEN_BAND, GRID = range(8)
+# The dark_background colours of the matplotlib chart, with its alpha blends over black baked in.
+PALETTE = np.array([
+    (0, 0, 0), (255, 255, 255), (0, 255, 255), (255, 0, 0),
+    (0, 128, 0), (51, 0, 0), (0, 26, 0), (100, 100, 100),
+], dtype=np.uint8)
+
+# 5x7 bitmap font, one byte per column with the top row in the lowest bit.
+_FONT = {
+    " ": (0x00, 0x00, 0x00, 0x00, 0x00), "?": (0x02, 0x01, 0x51, 0x09, 0x06),
+    ".": (0x00, 0x60, 0x60, 0x00, 0x00), ",": (0x00, 0x50, 0x30, 0x00, 0x00),
+    "-": (0x08, 0x08, 0x08, 0x08, 0x08), "_": (0x40, 0x40, 0x40, 0x40, 0x40),
+    ":": (0x00, 0x36, 0x36, 0x00, 0x00), "/": (0x20, 0x10, 0x08, 0x04, 0x02),
+    "(": (0x00, 0x1C, 0x22, 0x41, 0x00), ")": (0x00, 0x41, 0x22, 0x1C, 0x00),
+    "%": (0x23, 0x13, 0x08, 0x64, 0x62), "$": (0x24, 0x2A, 0x7F, 0x2A, 0x12),
+    "+": (0x08, 0x08, 0x3E, 0x08, 0x08),
+    "0": (0x3E, 0x51, 0x49, 0x45, 0x3E), "1": (0x00, 0x42, 0x7F, 0x40, 0x00),
+    "2": (0x42, 0x61, 0x51, 0x49, 0x46), "3": (0x21, 0x41, 0x45, 0x4B, 0x31),
+    "4": (0x18, 0x14, 0x12, 0x7F, 0x10), "5": (0x27, 0x45, 0x45, 0x45, 0x39),
+    "6": (0x3C, 0x4A, 0x49, 0x49, 0x30), "7": (0x01, 0x71, 0x09, 0x05, 0x03),
+    "8": (0x36, 0x49, 0x49, 0x49, 0x36), "9": (0x06, 0x49, 0x49, 0x29, 0x1E),
+    "A": (0x7E, 0x11, 0x11, 0x11, 0x7E), "B": (0x7F, 0x49, 0x49, 0x49, 0x36),
+    "C": (0x3E, 0x41, 0x41, 0x41, 0x22), "D": (0x7F, 0x41, 0x41, 0x22, 0x1C),
+    "E": (0x7F, 0x49, 0x49, 0x49, 0x41), "F": (0x7F, 0x09, 0x09, 0x09, 0x01),
+    "G": (0x3E, 0x41, 0x49, 0x49, 0x7A), "H": (0x7F, 0x08, 0x08, 0x08, 0x7F),
+    "I": (0x00, 0x41, 0x7F, 0x41, 0x00), "J": (0x20, 0x40, 0x41, 0x3F, 0x01),
+    "K": (0x7F, 0x08, 0x14, 0x22, 0x41), "L": (0x7F, 0x40, 0x40, 0x40, 0x40),
+    "M": (0x7F, 0x02, 0x0C, 0x02, 0x7F), "N": (0x7F, 0x04, 0x08, 0x10, 0x7F),
+    "O": (0x3E, 0x41, 0x41, 0x41, 0x3E), "P": (0x7F, 0x09, 0x09, 0x09, 0x06),
+    "Q": (0x3E, 0x41, 0x51, 0x21, 0x5E), "R": (0x7F, 0x09, 0x19, 0x29, 0x46),
+    "S": (0x46, 0x49, 0x49, 0x49, 0x31), "T": (0x01, 0x01, 0x7F, 0x01, 0x01),
+    "U": (0x3F, 0x40, 0x40, 0x40, 0x3F), "V": (0x1F, 0x20, 0x40, 0x20, 0x1F),
+    "W": (0x3F, 0x40, 0x38, 0x40, 0x3F), "X": (0x63, 0x14, 0x08, 0x14, 0x63),
+    "Y": (0x07, 0x08, 0x70, 0x08, 0x07), "Z": (0x61, 0x51, 0x49, 0x45, 0x43),
+    "a": (0x20, 0x54, 0x54, 0x54, 0x78), "b": (0x7F, 0x48, 0x44, 0x44, 0x38),
+    "c": (0x38, 0x44, 0x44, 0x44, 0x20), "d": (0x38, 0x44, 0x44, 0x48, 0x7F),
+    "e": (0x38, 0x54, 0x54, 0x54, 0x18), "f": (0x08, 0x7E, 0x09, 0x01, 0x02),
+    "g": (0x0C, 0x52, 0x52, 0x52, 0x3E), "h": (0x7F, 0x08, 0x04, 0x04, 0x78),
+    "i": (0x00, 0x44, 0x7D, 0x40, 0x00), "j": (0x20, 0x40, 0x44, 0x3D, 0x00),
+    "k": (0x7F, 0x10, 0x28, 0x44, 0x00), "l": (0x00, 0x41, 0x7F, 0x40, 0x00),
+    "m": (0x7C, 0x04, 0x18, 0x04, 0x78), "n": (0x7C, 0x08, 0x04, 0x04, 0x78),
+    "o": (0x38, 0x44, 0x44, 0x44, 0x38), "p": (0x7C, 0x14, 0x14, 0x14, 0x08),
+    "q": (0x08, 0x14, 0x14, 0x18, 0x7C), "r": (0x7C, 0x08, 0x04, 0x04, 0x08),
+    "s": (0x48, 0x54, 0x54, 0x54, 0x20), "t": (0x04, 0x3F, 0x44, 0x40, 0x20),
+    "u": (0x3C, 0x40, 0x40, 0x20, 0x7C), "v": (0x1C, 0x20, 0x40, 0x20, 0x1C),
+    "w": (0x3C, 0x40, 0x30, 0x40, 0x3C), "x": (0x44, 0x28, 0x10, 0x28, 0x44),
+    "y": (0x0C, 0x50, 0x50, 0x50, 0x3C), "z": (0x44, 0x64, 0x54, 0x4C, 0x44),
+}
+_GLYPHS = {
+    char: np.array([[(column >> row) & 1 for column in columns] + [0] for row in range(7)], dtype=bool)
+    for char, columns in _FONT.items()
+}
+
+TIME_STEPS = [h * 3600 for h in (1, 2, 3, 4, 6, 12)] + [d * 86400 for d in (1, 2, 3, 7, 14, 30, 60, 90)]
+
+
+def text_bitmap(text: str, scale: int = 2) -> np.ndarray:
+    bitmap = np.hstack([_GLYPHS.get(char, _GLYPHS["?"]) for char in text or " "])[:, :-1]
+    return bitmap.repeat(scale, axis=0).repeat(scale, axis=1)
+
+
+def draw_text(canvas: np.ndarray, x: int, y: int, text: str, color: int, scale: int = 2,
+              align: str = "left", vertical: bool = False):
+    bitmap = text_bitmap(text, scale)
+    if vertical:
+        bitmap = np.rot90(bitmap)
+    height, width = bitmap.shape
+    if align == "center":
+        x -= width // 2
+    elif align == "right":
+        x -= width
+    y -= height // 2
+    top, left = max(y, 0), max(x, 0)
+    bottom, right = min(y + height, canvas.shape[0]), min(x + width, canvas.shape[1])
+    if bottom <= top or right <= left:
+        return
+    region = canvas[top:bottom, left:right]
+    region[bitmap[top - y:bottom - y, left - x:right - x]] = color
+
+
+def draw_polyline(canvas: np.ndarray, xs: np.ndarray, ys: np.ndarray, color: int, width: int = 2):
+    x0, y0, x1, y1 = xs[:-1], ys[:-1], xs[1:], ys[1:]
+    valid = np.isfinite(y0) & np.isfinite(y1)
+    x0, y0, x1, y1 = x0[valid], y0[valid], x1[valid], y1[valid]
+    if not len(x0):
+        return
+    dx, dy = x1 - x0, y1 - y0
+    # Every segment is stepped one pixel at a time along its longer axis, all segments at once.
+    steps = np.maximum(np.ceil(np.maximum(np.abs(dx), np.abs(dy))), 1).astype(np.int64)
+    segment = np.repeat(np.arange(len(steps)), steps)
+    offset = np.arange(int(steps.sum())) - np.repeat(np.cumsum(steps) - steps, steps)
+    t = offset / steps[segment]
+    px = np.rint(np.append(x0[segment] + dx[segment] * t, x1[-1])).astype(np.int64)
+    py = np.rint(np.append(y0[segment] + dy[segment] * t, y1[-1])).astype(np.int64)
+    for ox, oy in ((0, 0), (1, 0), (0, 1), (1, 1))[:max(1, width * width)]:
+        canvas[np.clip(py + oy, 0, canvas.shape[0] - 1), np.clip(px + ox, 0, canvas.shape[1] - 1)] = color
+
+
+def dashed_hline(canvas: np.ndarray, y: int, x0: int, x1: int, color: int, dash: int = 6, width: int = 1):
+    xs = np.arange(x0, x1)
+    xs = xs[(xs - x0) // dash % 2 == 0]
+    canvas[y:y + width, xs] = color
+
+
+def dashed_vline(canvas: np.ndarray, x: int, y0: int, y1: int, color: int, dash: int = 6):
+    ys = np.arange(y0, y1)
+    canvas[ys[(ys - y0) // dash % 2 == 0], x] = color
+
+
+def draw_frame(canvas: np.ndarray, top: int, bottom: int, color: int):
+    canvas[top, LEFT:RIGHT + 1] = color
+    canvas[bottom, LEFT:RIGHT + 1] = color
+    canvas[top:bottom + 1, LEFT] = color
+    canvas[top:bottom + 1, RIGHT] = color
+
+
+def draw_legend(canvas: np.ndarray, x: int, y: int, entries: list[tuple[str, int]]):
+    width = 56 + max(text_bitmap(label).shape[1] for label, _ in entries)
+    height = 8 + 18 * len(entries)
+    canvas[y:y + height, x:x + width] = BACKGROUND
+    canvas[y, x:x + width] = canvas[y + height - 1, x:x + width] = GRID
+    canvas[y:y + height, x] = canvas[y:y + height, x + width - 1] = GRID
+    for row, (label, color) in enumerate(entries):
+        line_y = y + 12 + row * 18
+        canvas[line_y:line_y + 2, x + 8:x + 36] = color
+        draw_text(canvas, x + 44, line_y + 1, label, WHITE)
+
+
+def nice_step(span: float, count: int) -> float:
+    raw = span / max(count, 1)
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 5, 10):
+        if raw <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+def value_ticks(low: float, high: float, count: int = 6) -> tuple[np.ndarray, int]:
+    step = nice_step(high - low, count)
+    ticks = np.arange(math.ceil(low / step) * step, high + step * 1e-9, step)
+    return ticks, max(0, -math.floor(math.log10(step)))
+
+
+def time_ticks(start_s: float, end_s: float, count: int = 8) -> tuple[list[float], str]:
+    span = max(end_s - start_s, 1)
+    step = next((s for s in TIME_STEPS if span / s <= count), TIME_STEPS[-1])
+    first = math.ceil(start_s / step) * step
+    ticks = list(np.arange(first, end_s + 1, step))
+    return ticks, "%H:%M" if step < 86400 else "%m-%d"
+
+
+def encode_png(pixels: np.ndarray, palette: np.ndarray, level: int = 6) -> bytes:
+    height, width = pixels.shape
+    raw = np.zeros((height, width + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    return b"".join((
+        b"\x89PNG\r\n\x1a\n",
+        chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)),
+        chunk(b"PLTE", palette.tobytes()),
+        chunk(b"IDAT", zlib.compress(raw.tobytes(), level)),
+        chunk(b"IEND", b""),
+    ))
+
+
+def encode_webp(pixels: np.ndarray, palette: np.ndarray) -> bytes:
+    from PIL import Image
+
+    image = Image.fromarray(palette[pixels], "RGB")
+    buf = io.BytesIO()
+    image.save(buf, format="WEBP", lossless=True, method=0)
+    return buf.getvalue()
+
+
+def render_rsi_chart(timestamps: np.ndarray, closes: np.ndarray, rsi_values: np.ndarray,
+                     coin_id: str, days: int, image_format: str = "png") -> bytes:
+    canvas = np.zeros((HEIGHT, WIDTH), dtype=np.uint8)
+    seconds = np.asarray(timestamps).astype("datetime64[ms]").astype(np.int64) / 1000
+    closes = np.asarray(closes, dtype="float64")
+    rsi_values = np.asarray(rsi_values, dtype="float64")
+
+    start_s, end_s = float(seconds[0]), float(seconds[-1])
+    x_scale = (RIGHT - LEFT) / max(end_s - start_s, 1)
+    xs = LEFT + (seconds - start_s) * x_scale
+
+    low, high = float(np.nanmin(closes)), float(np.nanmax(closes))
+    pad = (high - low) * 0.05 or abs(high) * 0.01 or 1.0
+    low, high = low - pad, high + pad
+    price_scale = (PRICE_BOTTOM - TOP) / (high - low)
+
+    def price_y(value):
+        return PRICE_BOTTOM - (value - low) * price_scale
+
+    def rsi_y(value):
+        return BOTTOM - value * (BOTTOM - RSI_TOP) / 100
+
+    y70, y30 = int(round(rsi_y(70))), int(round(rsi_y(30)))
+    canvas[RSI_TOP:y70, LEFT:RIGHT] = RED_BAND
+    canvas[y30:BOTTOM, LEFT:RIGHT] = GREEN_BAND
+
+    ticks, decimals = value_ticks(low, high)
+    for value in ticks:
+        y = int(round(price_y(value)))
+        dashed_hline(canvas, y, LEFT, RIGHT, GRID)
+        draw_text(canvas, LEFT - 8, y, f"{value:,.{decimals}f}", WHITE, align="right")
+    for value in (0, 20, 40, 60, 80, 100):
+        y = int(round(rsi_y(value)))
+        dashed_hline(canvas, y, LEFT, RIGHT, GRID)
+        draw_text(canvas, LEFT - 8, y, str(value), WHITE, align="right")
+    moments, fmt = time_ticks(start_s, end_s)
+    for moment in moments:
+        x = int(round(LEFT + (moment - start_s) * x_scale))
+        dashed_vline(canvas, x, TOP, PRICE_BOTTOM, GRID)
+        dashed_vline(canvas, x, RSI_TOP, BOTTOM, GRID)
+        draw_text(canvas, x, BOTTOM + 16, time.strftime(fmt, time.gmtime(moment)), WHITE, align="center")
+
+    dashed_hline(canvas, y70, LEFT, RIGHT, RED, dash=10, width=2)
+    dashed_hline(canvas, y30, LEFT, RIGHT, GREEN, dash=10, width=2)
+    draw_polyline(canvas, xs, price_y(closes), WHITE)
+    draw_polyline(canvas, xs, rsi_y(rsi_values), CYAN)
+    draw_frame(canvas, TOP, PRICE_BOTTOM, WHITE)
+    draw_frame(canvas, RSI_TOP, BOTTOM, WHITE)
+
+    name = coin_id.capitalize()
+    draw_text(canvas, (LEFT + RIGHT) // 2, TOP // 2, f"Price and RSI for {name} over {days} days", WHITE, scale=3,
+              align="center")
+    draw_text(canvas, 16, (TOP + PRICE_BOTTOM) // 2, "Price (USD)", WHITE, vertical=True)
+    draw_text(canvas, 16, (RSI_TOP + BOTTOM) // 2, "RSI Value", WHITE, vertical=True)
+    draw_text(canvas, (LEFT + RIGHT) // 2, BOTTOM + 44, "Date", WHITE, align="center")
+    draw_legend(canvas, LEFT + 8, TOP + 8, [(f"{name} Price", WHITE)])
+    draw_legend(canvas, LEFT + 8, RSI_TOP + 8, [("RSI", CYAN), ("Overbought (70)", RED), ("Oversold (30)", GREEN)])
+
+    if image_format == "webp":
+        return encode_webp(canvas, PALETTE)
+    return encode_png(canvas, PALETTE)
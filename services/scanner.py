@@ -0,0 +1,124 @@
+import asyncio
+import numpy as np
+import pandas as pd
+from services.coingecko_api import fetch_markets_page
+from services.market_data import get_ohlc_history
+from services.rate_limiter import PRIORITY_BACKGROUND
+from services.metrics import OVERSOLD, OVERBOUGHT
+from config import SCAN_LIMIT, SCAN_TIMEOUT
+
+
+def stack_closes(series: list[np.ndarray]) -> np.ndarray:
+    width = max((len(s) for s in series), default=0)
+    closes = np.full((len(series), width), np.nan)
+    for row, values in enumerate(series):
+        if len(values):
+            closes[row, width - len(values):] = values
+    return closes
+
+
+def rsi_last(closes: np.ndarray, length: int = 14) -> np.ndarray:
+    coins, candles = closes.shape
+    decay = 1 - 1 / length
+    prev = np.full(coins, np.nan)
+    avg_gain = np.full(coins, np.nan)
+    avg_loss = np.full(coins, np.nan)
+    old_wt = np.ones(coins)
+    nobs = np.zeros(coins, dtype=np.int64)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for t in range(candles):
+            close = closes[:, t]
+            observed = ~np.isnan(close)
+            delta = close - prev
+            gain = np.where(delta > 0, delta, 0.0)
+            loss = -np.where(delta < 0, delta, 0.0)
+
+            first = observed & np.isnan(avg_gain)
+            step = observed & ~first
+            avg_gain[first] = gain[first]
+            avg_loss[first] = loss[first]
+
+            old_wt[step] *= decay
+            weight = old_wt[step]
+            g, l = avg_gain[step], avg_loss[step]
+            avg_gain[step] = np.where(g != gain[step], (weight * g + gain[step]) / (weight + 1.0), g)
+            avg_loss[step] = np.where(l != loss[step], (weight * l + loss[step]) / (weight + 1.0), l)
+            old_wt[step] += 1.0
+
+            nobs += observed
+            prev = np.where(observed, close, prev)
+
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    rsi[nobs < length] = np.nan
+    return rsi
+
+
+def annualized_volatility(closes: np.ndarray) -> np.ndarray:
+    returns = closes[:, 1:] / closes[:, :-1] - 1
+    counts = np.sum(~np.isnan(returns), axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(returns, axis=1) / counts
+        var = np.nansum((returns - mean[:, None]) ** 2, axis=1) / (counts - 1)
+    volatility = np.sqrt(var) * (252 ** 0.5) * 100
+    volatility[counts < 2] = np.nan
+    return volatility
+
+
+def classify(rsi: np.ndarray) -> np.ndarray:
+    return np.select([rsi < OVERSOLD, rsi > OVERBOUGHT], ["oversold", "overbought"], "neutral")
+
+
+def scan_closes(coin_ids: list[str], closes: np.ndarray, length: int = 14) -> pd.DataFrame:
+    rsi = rsi_last(closes, length)
+    volatility = annualized_volatility(closes)
+    last = closes[:, -1]
+    table = pd.DataFrame({
+        "coin_id": coin_ids,
+        "rsi": rsi,
+        "volatility": volatility,
+        "last_price": last,
+        "signal": classify(rsi),
+    })
+    table = table[~np.isnan(rsi)]
+    order = np.argsort(-np.abs(table["rsi"].to_numpy() - 50), kind="stable")
+    return table.iloc[order].reset_index(drop=True)
+
+
+_background: set[asyncio.Task] = set()
+
+
+def _finish_background(task: asyncio.Task):
+    _background.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Error loading scan candles: {task.exception()}")
+
+
+async def scan_market(days: int, limit: int = SCAN_LIMIT, timeout: float = SCAN_TIMEOUT) -> tuple[pd.DataFrame, int]:
+    markets = []
+    page = 1
+    # CoinGecko offsets pages by per_page, so it must stay the same on every page.
+    per_page = min(250, limit)
+    while len(markets) < limit:
+        rows = await fetch_markets_page(page, per_page, priority=PRIORITY_BACKGROUND)
+        if not rows:
+            break
+        markets += rows
+        page += 1
+    coin_ids = [m["id"] for m in markets[:limit]]
+
+    tasks = {asyncio.ensure_future(get_ohlc_history(c, days, PRIORITY_BACKGROUND)): c for c in coin_ids}
+    if not tasks:
+        return scan_closes([], np.empty((0, 0))), 0
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    # Late fetches keep running so their candles are stored and cached for the next scan.
+    for task in pending:
+        _background.add(task)
+        task.add_done_callback(_finish_background)
+
+    ready_ids, series = [], []
+    for task in done:
+        if task.exception() is None and not task.result().empty:
+            ready_ids.append(tasks[task])
+            series.append(task.result()["close"].to_numpy(dtype="float64"))
+    return scan_closes(ready_ids, stack_closes(series)), len(coin_ids) - len(ready_ids)
@@ -0,0 +1,101 @@
+import copy
+import time
+import pandas as pd
+from services.cache import TTLCache
+from config import RSI_STREAMS_MAX, RSI_STREAM_IDLE
+
+
+class _EwmMean:
+    # Same recurrence as pandas' ewm(adjust=True).mean(), so values match bit for bit.
+
+    def __init__(self, decay: float):
+        self.decay = decay
+        self.weighted = None
+        self.old_wt = 1.0
+
+    def update(self, value: float) -> float:
+        if self.weighted is None:
+            self.weighted = value
+            return value
+        self.old_wt *= self.decay
+        if self.weighted != value:
+            self.weighted = (self.old_wt * self.weighted + value) / (self.old_wt + 1.0)
+        self.old_wt += 1.0
+        return self.weighted
+
+
+class StreamingRSI:
+
+    def __init__(self, length: int = 14):
+        self.length = length
+        self.count = 0
+        self.value: float | None = None
+        self.last_close: float | None = None
+        self.last_timestamp = None
+        decay = 1 - 1 / length
+        self._avg_gain = _EwmMean(decay)
+        self._avg_loss = _EwmMean(decay)
+
+    def update(self, close: float, timestamp=None) -> float | None:
+        delta = None if self.last_close is None else close - self.last_close
+        gain = delta if delta is not None and delta > 0 else 0.0
+        loss = -(delta if delta is not None and delta < 0 else 0.0)
+        self.last_close = close
+        self.last_timestamp = timestamp
+        self.count += 1
+
+        avg_gain = self._avg_gain.update(gain)
+        avg_loss = self._avg_loss.update(loss)
+        if self.count < self.length:
+            return None
+
+        if avg_loss == 0:
+            self.value = 100.0 if avg_gain != 0 else None
+        else:
+            self.value = 100 - (100 / (1 + avg_gain / avg_loss))
+        return self.value
+
+    def peek(self, close: float) -> float | None:
+        # RSI with a still-forming candle applied, without folding it into the stream.
+        rsi = copy.copy(self)
+        rsi._avg_gain = copy.copy(self._avg_gain)
+        rsi._avg_loss = copy.copy(self._avg_loss)
+        return rsi.update(close)
+
+    def extend(self, df: pd.DataFrame) -> float | None:
+        for timestamp, close in zip(df["timestamp"], df["close"]):
+            self.update(float(close), timestamp)
+        return self.value
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, length: int = 14) -> "StreamingRSI":
+        rsi = cls(length)
+        rsi.extend(df)
+        return rsi
+
+
+# Streams nobody has synced for RSI_STREAM_IDLE seconds (their alerts were removed) are dropped.
+rsi_streams = TTLCache(RSI_STREAMS_MAX)
+
+
+def sync_rsi_stream(coin_id: str, days: int, df: pd.DataFrame, length: int = 14) -> StreamingRSI:
+    # Only closed candles are folded in. The last row is the forming candle: its label moves with
+    # every sample, so feeding it would count the same bar again on each tick.
+    key = (coin_id, days)
+    closed = df.iloc[:-1]
+    rsi = rsi_streams.get(key)
+    if rsi is not None and rsi.length == length and rsi.last_timestamp is not None:
+        newer = closed[closed["timestamp"] > rsi.last_timestamp]
+        if len(newer) < len(closed):
+            rsi.extend(newer)
+            rsi_streams.set(key, rsi, time.time() + RSI_STREAM_IDLE)
+            return rsi
+    rsi = StreamingRSI.from_history(closed, length)
+    rsi_streams.set(key, rsi, time.time() + RSI_STREAM_IDLE)
+    return rsi
+
+
+def live_rsi(coin_id: str, days: int, df: pd.DataFrame, length: int = 14) -> float | None:
+    if df.empty:
+        return None
+    return sync_rsi_stream(coin_id, days, df, length).peek(float(df["close"].iloc[-1]))
@@ -0,0 +1,251 @@
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+import signal
+from contextlib import suppress
+from typing import Callable
+from urllib.parse import urlparse
+import httpx
+from telegram import Bot, Update
+from telegram.ext import Application
+from services.instrumentation import telemetry, start_metrics_server
+from config import (
+    WEBHOOK_URL, WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_SECRET, WEBHOOK_WORKERS,
+    COINGECKO_RATE_PER_MINUTE, COINGECKO_BURST, TELEGRAM_GLOBAL_RATE, TELEGRAM_GLOBAL_BURST,
+    CHART_WORKERS, METRICS_HOST, METRICS_PORT
+)
+
+MAX_BODY = 1024 * 1024
+FORWARD_RETRY = 0.2
+
+
+def chat_key(update: dict) -> int:
+    for value in update.values():
+        if not isinstance(value, dict):
+            continue
+        chat = value.get("chat") or (value.get("message") or {}).get("chat")
+        if chat:
+            return int(chat["id"])
+        user = value.get("from") or value.get("user")
+        if user:
+            return int(user["id"])
+    return 0
+
+
+def worker_env(index: int, workers: int) -> dict[str, str]:
+    env = {
+        "WORKER_INDEX": str(index),
+        "COINGECKO_RATE_PER_MINUTE": str(COINGECKO_RATE_PER_MINUTE / workers),
+        "COINGECKO_BURST": str(max(1, COINGECKO_BURST // workers)),
+        # Chats are pinned to one worker, so only the bot-wide Telegram budget needs splitting.
+        "TELEGRAM_GLOBAL_RATE": str(TELEGRAM_GLOBAL_RATE / workers),
+        "TELEGRAM_GLOBAL_BURST": str(max(1, TELEGRAM_GLOBAL_BURST // workers)),
+        "CHART_WORKERS": str(max(1, CHART_WORKERS // workers)),
+        "METRICS_PORT": str(METRICS_PORT + 1 + index if METRICS_PORT else 0),
+    }
+    if index:
+        env["OHLC_STORE_READONLY"] = "1"
+    return env
+
+
+async def _handle_webhook(dispatch: Callable[[bytes, dict], None], path: str, secret: str,
+                          reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length") or 0)
+            if length > MAX_BODY:
+                writer.write(b"HTTP/1.1 413 Payload Too Large\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                break
+            body = await reader.readexactly(length)
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) < 2 or parts[0] != "POST" or parts[1].split("?")[0] != path:
+                status = "404 Not Found"
+            elif secret and headers.get("x-telegram-bot-api-secret-token") != secret:
+                status = "403 Forbidden"
+            else:
+                try:
+                    update = json.loads(body)
+                    if not isinstance(update, dict):
+                        raise ValueError("update is not an object")
+                    dispatch(body, update)
+                    status = "200 OK"
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f"Error decoding update: {e}")
+                    status = "400 Bad Request"
+
+            keep_alive = headers.get("connection", "").lower() != "close"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Length: 0\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_webhook(dispatch: Callable[[bytes, dict], None], host: str, port: int, path: str,
+                        secret: str = "") -> asyncio.AbstractServer:
+    handler = functools.partial(_handle_webhook, dispatch, path or "/", secret)
+    return await asyncio.start_server(handler, host, port)
+
+
+async def _serve_worker(factory: Callable[[], Application], port: int):
+    app = factory()
+    await app.initialize()
+    if app.post_init:
+        await app.post_init(app)
+    await app.start()
+
+    def dispatch(body: bytes, update: dict):
+        app.update_queue.put_nowait(Update.de_json(update, app.bot))
+
+    server = await serve_webhook(dispatch, "127.0.0.1", port, "/")
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    try:
+        await stop.wait()
+    finally:
+        server.close()
+        await app.stop()
+        await app.shutdown()
+        if app.post_shutdown:
+            await app.post_shutdown(app)
+
+
+def _run_worker(factory: Callable[[], Application], port: int):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_serve_worker(factory, port))
+
+
+class WorkerPool:
+
+    def __init__(self, factory: Callable[[], Application], workers: int, base_port: int):
+        self.factory = factory
+        self.workers = max(1, workers)
+        self.base_port = base_port
+        self._context = multiprocessing.get_context("spawn")
+        self.processes: list[multiprocessing.Process | None] = [None] * self.workers
+        self.outboxes: list[asyncio.Queue] = [asyncio.Queue() for _ in range(self.workers)]
+        self.restarts = 0
+        self._client: httpx.AsyncClient | None = None
+        self._forwarders: list[asyncio.Task] = []
+        telemetry.gauge("bot_webhook_worker_restarts_total", lambda: self.restarts, kind="counter")
+        telemetry.gauge("bot_webhook_backlog", lambda: sum(q.qsize() for q in self.outboxes))
+
+    def _spawn(self, index: int):
+        env = worker_env(index, self.workers)
+        saved = {key: os.environ.get(key) for key in env}
+        os.environ.update(env)
+        try:
+            process = self._context.Process(
+                target=_run_worker, args=(self.factory, self.base_port + index), name=f"bot-worker-{index}"
+            )
+            process.start()
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+        self.processes[index] = process
+
+    async def _forward(self, index: int):
+        url = f"http://127.0.0.1:{self.base_port + index}/"
+        outbox = self.outboxes[index]
+        while True:
+            body = await outbox.get()
+            while True:
+                try:
+                    response = await self._client.post(url, content=body)
+                    if response.status_code < 500:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(FORWARD_RETRY)
+            outbox.task_done()
+
+    def start(self) -> "WorkerPool":
+        self._client = httpx.AsyncClient(timeout=10, limits=httpx.Limits(max_connections=self.workers * 2))
+        for index in range(self.workers):
+            self._spawn(index)
+            self._forwarders.append(asyncio.create_task(self._forward(index)))
+        return self
+
+    def supervise(self):
+        for index, process in enumerate(self.processes):
+            if process is not None and process.exitcode is not None:
+                print(f"Worker {index} exited with code {process.exitcode}, restarting")
+                self.restarts += 1
+                self._spawn(index)
+
+    def dispatch(self, body: bytes, update: dict) -> int:
+        index = chat_key(update) % self.workers
+        self.outboxes[index].put_nowait(body)
+        telemetry.inc("bot_webhook_updates_total", worker=index)
+        return index
+
+    async def shutdown(self, timeout: float = 30):
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(asyncio.gather(*(q.join() for q in self.outboxes)), timeout)
+        for task in self._forwarders:
+            task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            if process is None:
+                continue
+            await asyncio.to_thread(process.join, timeout)
+            if process.is_alive():
+                process.kill()
+                await asyncio.to_thread(process.join)
+
+
+async def _run(factory: Callable[[], Application], token: str):
+    pool = WorkerPool(factory, WEBHOOK_WORKERS, WEBHOOK_PORT + 1).start()
+    server = await serve_webhook(pool.dispatch, WEBHOOK_LISTEN, WEBHOOK_PORT, urlparse(WEBHOOK_URL).path,
+                                 WEBHOOK_SECRET)
+    metrics_server = await start_metrics_server(METRICS_HOST, METRICS_PORT) if METRICS_PORT else None
+
+    async with Bot(token) as bot:
+        await bot.set_webhook(WEBHOOK_URL, secret_token=WEBHOOK_SECRET or None, allowed_updates=Update.ALL_TYPES)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        while not stop.is_set():
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), timeout=1)
+            pool.supervise()
+    finally:
+        server.close()
+        if metrics_server is not None:
+            metrics_server.close()
+        await pool.shutdown()
+
+
+def run_webhook(factory: Callable[[], Application], token: str):
+    print(f"Webhook listening on {WEBHOOK_LISTEN}:{WEBHOOK_PORT} with {WEBHOOK_WORKERS} worker(s)")
+    asyncio.run(_run(factory, token))
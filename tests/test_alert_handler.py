@@ -0,0 +1,55 @@
+import asyncio
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from handlers import alert_handler
+from services.alert_store import AlertStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Message:
+
+    def __init__(self):
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        self.replies.append(text)
+
+
+def run_alert(monkeypatch, args: list[str]) -> tuple[AlertStore, list[str]]:
+    store = AlertStore(":memory:")
+    monkeypatch.setattr(alert_handler, "alert_store", store)
+
+    async def resolve_coin_id(query):
+        return "bitcoin"
+
+    monkeypatch.setattr(alert_handler, "resolve_coin_id", resolve_coin_id)
+    message = Message()
+    update = SimpleNamespace(message=message, effective_chat=SimpleNamespace(id=42))
+    asyncio.run(alert_handler.alert_command(update, SimpleNamespace(args=args)))
+    return store, message.replies
+
+
+@pytest.mark.parametrize("threshold", ["nan", "inf", "-inf", "NaN", "abc"])
+def test_non_finite_thresholds_are_rejected(monkeypatch, threshold):
+    store, replies = run_alert(monkeypatch, ["btc", "14", "rsi", "<", threshold])
+    assert replies == [alert_handler.ALERT_USAGE]
+    assert store.for_chat(42) == []
+
+
+def test_finite_threshold_is_stored(monkeypatch):
+    store, replies = run_alert(monkeypatch, ["btc", "14", "rsi", "<", "30"])
+    assert replies[0].startswith("✅")
+    assert store.for_chat(42) == [(1, "bitcoin", 14, "rsi", "<", 30.0)]
+
+
+def test_importing_the_store_does_not_create_the_database(tmp_path):
+    env = {**os.environ, "ALERTS_DB_PATH": str(tmp_path / "data" / "alerts.sqlite3"), "PYTHONPATH": ROOT}
+    subprocess.run([sys.executable, "-c", "import services.alert_store, handlers.alert_handler"],
+                   cwd=tmp_path, env=env, check=True)
+    assert not (tmp_path / "data").exists()
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from services.backtest import (
+    HORIZON, VOL_WINDOW, Params, backtest_rows, candles_from_samples, param_grid, run_backtest, sample_tier,
+    trailing_volatility,
+)
+from services.metrics import rsi_kernel
+from services.ohlc_store import OhlcStore, samples_to_records
+
+INTERVAL = 4 * 3600
+GRID = param_grid((7, 14), (20, 30), (70, 80), (1, 1.5), (3,)) + [Params()]
+
+
+def hourly_samples(seed: int, candles: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    # Volatility regimes switch every 150 candles so both thresholds get crossed.
+    regime = np.repeat(rng.uniform(0.004, 0.02, candles // 150 + 1), 150)[:candles]
+    steps = rng.normal(0, 1, (candles, 4)) * regime[:, None] / 2
+    prices = (10 + seed % 997) * np.exp(np.cumsum(steps.ravel()))
+    start = 1_600_000_000 // INTERVAL * INTERVAL
+    timestamps = (start + np.arange(1, candles * 4 + 1) * 3600) * 1000
+    return samples_to_records(timestamps, prices)
+
+
+# Candle-by-candle replay of the same rules, the reference for the vectorized engine.
+def reference_trades(rows: np.ndarray, params: Params, vol_window: int, horizon: int) -> list[float]:
+    closes = rows["close"]
+    rsi = rsi_kernel(closes, params.length)
+    volatility = trailing_volatility(closes, vol_window)
+    returns = []
+    t = 0
+    while t < len(closes):
+        if np.isnan(volatility[t]) or not (rsi[t] < params.oversold or rsi[t] > params.overbought):
+            t += 1
+            continue
+        side = 1 if rsi[t] < params.oversold else -1
+        entry = closes[t]
+        stop = entry * (1 - side * volatility[t] * params.risk)
+        target = entry * (1 + side * volatility[t] * params.reward)
+        outcome = None
+        for k in range(t + 1, min(t + 1 + horizon, len(closes))):
+            high, low = rows["high"][k], rows["low"][k]
+            if (low <= stop) if side > 0 else (high >= stop):
+                outcome = (k, stop)
+                break
+            if (high >= target) if side > 0 else (low <= target):
+                outcome = (k, target)
+                break
+        if outcome is None:
+            if t + horizon >= len(closes):
+                t += 1
+                continue
+            outcome = (t + horizon, closes[t + horizon])
+        returns.append(side * (outcome[1] / entry - 1))
+        t = outcome[0] + 1
+    return returns
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_vectorized_engine_matches_replay(seed):
+    rows = candles_from_samples(hourly_samples(seed, 3000), INTERVAL)
+    assert len(rows) == 3000 and np.ptp(rows["close"]) > 0
+    results = backtest_rows(rows, GRID, VOL_WINDOW, HORIZON)
+    assert sum(result["trades"] for result in results) > 0
+    for params, result in zip(GRID, results):
+        expected = reference_trades(rows, params, VOL_WINDOW, HORIZON)
+        assert result["trades"] == len(expected), params
+        assert result["return_sum"] == pytest.approx(sum(expected), rel=1e-10, abs=1e-12), params
+
+
+def test_run_backtest_builds_candles_from_the_sample_tier(tmp_path):
+    samples = hourly_samples(3, 1000)
+    OhlcStore(str(tmp_path)).merge("coin-3", 3600, samples)
+    results = run_backtest(str(tmp_path), ["coin-3"], INTERVAL, GRID, workers=1)
+
+    rows = candles_from_samples(samples, INTERVAL)
+    assert (rows["high"] > rows["low"]).all()
+    expected = backtest_rows(rows, GRID)
+    assert results["trades"].tolist() == [result["trades"] for result in expected]
+    assert results["return_sum"].tolist() == [result["return_sum"] for result in expected]
+
+
+def test_candles_drop_the_forming_bar():
+    samples = hourly_samples(4, 10)
+    assert len(candles_from_samples(samples, INTERVAL)) == 10
+    assert len(candles_from_samples(samples[:-1], INTERVAL)) == 9
+
+
+def test_sample_tier():
+    assert sample_tier(30 * 60) == 300
+    assert sample_tier(4 * 3600) == 3600
+    assert sample_tier(4 * 86400) == 86400
+    with pytest.raises(ValueError):
+        sample_tier(100)
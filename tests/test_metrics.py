@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.metrics import (
+    ANNUALIZATION, ATR_MULTIPLIER, BOLLINGER_LENGTH, BOLLINGER_WIDTH, MACD_FAST, MACD_SIGNAL, MACD_SLOW,
+    OVERBOUGHT, OVERSOLD, REALIZED_LENGTH, REWARD_MULTIPLIER, RISK_MULTIPLIER, analyze_closes, analyze_ohlc,
+    calculate_rsi, calculate_volatility, fill_missing,
+)
+
+LENGTH = 14
+RTOL = 1e-10
+
+
+# The pandas implementations the NumPy kernel replaced, kept as the reference. Missing closes are
+# forward-filled first, as pct_change did before pandas 3.
+def pandas_rsi(closes: pd.Series, length: int = LENGTH) -> pd.Series:
+    delta = closes.diff()
+    gain = delta.where(delta > 0, 0.0)
+    loss = -delta.where(delta < 0, 0.0)
+    avg_gain = gain.ewm(com=length - 1, min_periods=length).mean()
+    avg_loss = loss.ewm(com=length - 1, min_periods=length).mean()
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def pandas_returns(closes: pd.Series) -> pd.Series:
+    return closes.ffill().pct_change().dropna()
+
+
+def pandas_volatility(closes: pd.Series) -> float:
+    return pandas_returns(closes).std() * ANNUALIZATION * 100
+
+
+def pandas_levels(closes: pd.Series, rsi_value: float) -> tuple:
+    step = pandas_returns(closes).std()
+    last_price = closes.ffill().iloc[-1]
+    risk_pct, reward_pct = step * RISK_MULTIPLIER, step * REWARD_MULTIPLIER
+    if rsi_value < OVERSOLD:
+        entry, stop, target = last_price, last_price * (1 - risk_pct), last_price * (1 + reward_pct)
+    elif rsi_value > OVERBOUGHT:
+        entry, stop, target = last_price, last_price * (1 + risk_pct), last_price * (1 - reward_pct)
+    else:
+        return None, None, None, None
+    return entry, stop, target, abs(target - entry) / abs(entry - stop)
+
+
+def random_walk(seed: int, n: int, sigma: float = 0.02) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, sigma, n)))
+
+
+SERIES = {
+    "walk_48": random_walk(1, 48),
+    "walk_180": random_walk(2, 180),
+    "walk_2200": random_walk(3, 2200, 0.01),
+    "walk_5000": random_walk(4, 5000, 0.01),
+    "ties": np.round(random_walk(5, 300), 0),
+    "rising": np.linspace(1.0, 2.0, 60),
+    "falling": np.linspace(2.0, 1.0, 60),
+    "flat": np.full(60, 100.0),
+    "one": random_walk(6, 1),
+    "two": random_walk(7, 2),
+    "below_length": random_walk(8, LENGTH - 1),
+    "at_length": random_walk(9, LENGTH),
+    "above_length": random_walk(10, LENGTH + 1),
+}
+
+
+def frame(closes: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({"close": closes})
+
+
+def assert_close(got, expected):
+    if expected is None or np.isnan(expected):
+        assert got is None or np.isnan(got)
+    else:
+        assert got == pytest.approx(expected, rel=RTOL)
+
+
+@pytest.mark.parametrize("name", SERIES)
+def test_rsi_matches_pandas(name):
+    closes = pd.Series(SERIES[name])
+    expected = pandas_rsi(closes)
+    got = calculate_rsi(frame(SERIES[name]), LENGTH)
+    if expected.isna().all():
+        assert got is None
+    else:
+        pd.testing.assert_series_equal(got, expected, check_names=False, rtol=RTOL, atol=1e-9)
+
+
+@pytest.mark.parametrize("name", SERIES)
+def test_volatility_and_levels_match_pandas(name):
+    closes = pd.Series(SERIES[name])
+    assert_close(calculate_volatility(frame(SERIES[name])), pandas_volatility(closes))
+
+    analysis = analyze_closes(SERIES[name], LENGTH)
+    expected_rsi = pandas_rsi(closes)
+    np.testing.assert_allclose(analysis.rsi, expected_rsi.to_numpy(), rtol=RTOL, atol=1e-9)
+    if len(closes) > 2 and not np.isnan(expected_rsi.iloc[-1]):
+        want = pandas_levels(closes, expected_rsi.iloc[-1])
+        got = (analysis.entry, analysis.stop, analysis.target, analysis.rr_ratio)
+        for a, b in zip(got, want):
+            assert_close(a, b)
+
+
+# Textbook pandas definitions of the indicators the fused pass adds.
+def pandas_indicators(high: pd.Series, low: pd.Series, close: pd.Series, length: int = LENGTH) -> dict:
+    previous = close.shift(1).fillna(close.iloc[0])
+    true_range = pd.concat([high - low, (high - previous).abs(), (low - previous).abs()], axis=1).max(axis=1)
+    macd = close.ewm(span=MACD_FAST).mean() - close.ewm(span=MACD_SLOW).mean()
+    mid = close.rolling(BOLLINGER_LENGTH).mean()
+    deviation = close.rolling(BOLLINGER_LENGTH).std(ddof=0) * BOLLINGER_WIDTH
+    log_returns = np.log(close / close.shift(1))
+    return {
+        "atr": true_range.ewm(com=length - 1).mean(),
+        "macd": macd,
+        "macd_signal": macd.ewm(span=MACD_SIGNAL).mean(),
+        "bollinger_mid": mid,
+        "bollinger_upper": mid + deviation,
+        "bollinger_lower": mid - deviation,
+        "realized_volatility": log_returns.rolling(REALIZED_LENGTH).std() * ANNUALIZATION * 100,
+    }
+
+
+def ohlc(closes: np.ndarray, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    wick = np.abs(np.random.default_rng(seed).normal(0, 0.01, (2, len(closes))))
+    return closes * (1 + wick[0]), closes * (1 - wick[1]), closes
+
+
+@pytest.mark.parametrize("name", SERIES)
+def test_fused_indicators_match_pandas(name):
+    high, low, close = ohlc(SERIES[name])
+    fused = analyze_ohlc(high, low, close, LENGTH)
+    closes_only = analyze_closes(close, LENGTH)
+    # The fused pass must not change anything the handlers already showed.
+    np.testing.assert_array_equal(fused.rsi, closes_only.rsi)
+    for field in ("step_volatility", "volatility", "last_price", "entry", "stop", "target", "rr_ratio"):
+        assert getattr(fused, field) == getattr(closes_only, field) or (
+            np.isnan(getattr(fused, field)) and np.isnan(getattr(closes_only, field))), field
+    for field, expected in pandas_indicators(pd.Series(high), pd.Series(low), pd.Series(close)).items():
+        np.testing.assert_allclose(getattr(fused, field), expected.to_numpy(), rtol=1e-9, atol=1e-9,
+                                   err_msg=field)
+    if fused.entry is not None:
+        side = 1 if fused.target > fused.entry else -1
+        assert fused.atr_stop == pytest.approx(fused.entry - side * ATR_MULTIPLIER * fused.atr[-1])
+
+
+def test_empty_input():
+    analysis = analyze_closes(np.empty(0))
+    assert len(analysis.rsi) == 0 and analysis.last_price is None
+    assert calculate_rsi(frame(np.empty(0))) is None
+
+
+def with_gaps(values: np.ndarray, positions) -> np.ndarray:
+    values = values.copy()
+    values[list(positions)] = np.nan
+    return values
+
+
+def test_fill_missing_repeats_previous_close_and_cuts_leading_gaps():
+    filled, lead = fill_missing(np.array([np.nan, np.nan, 1.0, np.nan, np.nan, 4.0, np.nan]))
+    assert lead == 2
+    np.testing.assert_array_equal(filled, [1.0, 1.0, 1.0, 4.0, 4.0])
+
+    clean = np.array([1.0, 2.0])
+    assert fill_missing(clean)[0] is clean
+
+    filled, lead = fill_missing(np.full(3, np.nan))
+    assert len(filled) == 0 and lead == 3
+
+
+def test_missing_closes_are_forward_filled():
+    closes = with_gaps(SERIES["walk_180"], (40, 41, 90, 179))
+    analysis = analyze_closes(closes, LENGTH)
+    reference = analyze_closes(pd.Series(closes).ffill().to_numpy(), LENGTH)
+
+    assert not np.isnan(analysis.rsi[LENGTH:]).any()
+    np.testing.assert_array_equal(analysis.rsi, reference.rsi)
+    assert analysis.last_price == closes[178]
+    assert analysis.volatility == pytest.approx(pandas_volatility(pd.Series(closes)), rel=RTOL)
+    assert calculate_volatility(frame(closes)) == analysis.volatility
+    np.testing.assert_array_equal(calculate_rsi(frame(closes), LENGTH).to_numpy(), analysis.rsi)
+
+
+def test_leading_missing_closes_are_left_out():
+    tail = SERIES["walk_180"][5:]
+    closes = with_gaps(SERIES["walk_180"], range(5))
+    analysis = analyze_closes(closes, LENGTH)
+    reference = analyze_closes(tail, LENGTH)
+
+    assert len(analysis.rsi) == len(closes) and len(analysis.returns) == len(closes) - 1
+    assert np.isnan(analysis.rsi[:5]).all() and np.isnan(analysis.returns[:5]).all()
+    np.testing.assert_array_equal(analysis.rsi[5:], reference.rsi)
+    np.testing.assert_array_equal(analysis.returns[5:], reference.returns)
+    assert analysis.volatility == reference.volatility
+
+    everything_missing = analyze_closes(np.full(4, np.nan), LENGTH)
+    assert np.isnan(everything_missing.rsi).all() and everything_missing.last_price is None
+
+
+def test_ohlc_indicators_with_missing_values():
+    close = with_gaps(SERIES["walk_180"], (0, 1, 60, 61))
+    high = with_gaps(close * 1.01, (30,))
+    low = close * 0.99
+    got = analyze_ohlc(high, low, close, LENGTH)
+
+    filled = pd.Series(close).ffill().to_numpy()[2:]
+    reference = analyze_ohlc(np.where(np.isnan(high[2:]), filled, high[2:]), low[2:], filled, LENGTH)
+    for field in ("rsi", "atr", "bollinger_mid", "macd", "macd_signal", "realized_volatility", "returns"):
+        values = getattr(got, field)
+        assert np.isnan(values[:2]).all(), field
+        np.testing.assert_array_equal(values[2:], getattr(reference, field), err_msg=field)
+    assert got.volatility == reference.volatility
+    assert np.array_equal(got.rsi, analyze_closes(close, LENGTH).rsi, equal_nan=True)
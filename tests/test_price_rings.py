@@ -0,0 +1,47 @@
+import numpy as np
+
+from services.market_data import sample_interval, window_bounds
+from services.ohlc_store import OHLC_DTYPE
+from services.price_rings import LIVE_TIERS, PriceRings
+
+MINUTE = 60_000
+HOUR = 60 * MINUTE
+START = 1_700_006_400_000  # 2023-11-15 00:00 UTC
+
+
+def poll(rings: PriceRings, hours: float, tick_ms: int = MINUTE) -> int:
+    now_ms = START
+    for i in range(int(hours * HOUR // tick_ms) + 1):
+        now_ms = START + i * tick_ms
+        rings.push(["bitcoin"], [100.0 + i % 7], now_ms)
+    return now_ms
+
+
+def empty_tiers() -> dict:
+    return {interval: np.zeros(0, dtype=OHLC_DTYPE) for interval in LIVE_TIERS}
+
+
+def test_one_minute_ticks_keep_five_minute_spacing_for_a_full_day():
+    rings = PriceRings(4, 300)
+    rings.add("bitcoin", empty_tiers())
+    now_ms = poll(rings, 30)
+
+    start_ms, from_ms = window_bounds(1, now_ms)
+    rows = rings.window("bitcoin", sample_interval(1), from_ms, start_ms, now_ms)
+    assert rows is not None
+    assert rows["timestamp"][-1] == now_ms
+    # Every sample but the live one is a closed bucket exactly one interval after the last.
+    assert (np.diff(rows["timestamp"][:-1]) == 300 * 1000).all()
+    assert rows["timestamp"][0] <= start_ms
+
+
+def test_live_sample_is_overwritten_until_a_full_interval_has_passed():
+    rings = PriceRings(4, 300)
+    rings.add("bitcoin", empty_tiers())
+    ring = rings.rings[300]
+    for minute, price in enumerate([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]):
+        rings.push(["bitcoin"], [price], START + minute * MINUTE)
+
+    rows = ring.window(rings.slots["bitcoin"], 0)
+    np.testing.assert_array_equal(rows["timestamp"], [START, START + 5 * MINUTE, START + 6 * MINUTE])
+    np.testing.assert_array_equal(rows["close"], [1.0, 6.0, 7.0])
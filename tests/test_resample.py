@@ -0,0 +1,106 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from services import market_data
+from services.ohlc_store import OHLC_DTYPE, resample_records, samples_to_records
+
+MINUTE = 60_000
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# 5-minute samples the way CoinGecko returns them for days=1: not aligned to any candle edge.
+# 1_700_000_000_000 is 2023-11-14 22:13:20 UTC.
+FIVE_MINUTE_START = 1_700_000_000_000
+FIVE_MINUTE_PRICES = [100, 102, 99, 101, 103, 105, 104, 98, 100, 101, 102, 97, 99, 100]
+
+# Daily samples at 00:00 UTC from 2024-01-01 (epoch day 19723) to 2024-01-10.
+DAILY_START_DAY = 19723
+DAILY_PRICES = [10, 11, 12, 9, 8, 13, 14, 15, 7, 16]
+
+
+def five_minute_samples() -> np.ndarray:
+    timestamps = FIVE_MINUTE_START + 5 * MINUTE * np.arange(len(FIVE_MINUTE_PRICES), dtype="int64")
+    return samples_to_records(timestamps, np.array(FIVE_MINUTE_PRICES, dtype="float64"))
+
+
+def daily_samples() -> np.ndarray:
+    timestamps = (DAILY_START_DAY + np.arange(len(DAILY_PRICES), dtype="int64")) * DAY
+    return samples_to_records(timestamps, np.array(DAILY_PRICES, dtype="float64"))
+
+
+def bars(*rows) -> np.ndarray:
+    return np.array(list(rows), dtype=OHLC_DTYPE)
+
+
+def assert_bars_equal(got: np.ndarray, expected: np.ndarray):
+    assert got.dtype == OHLC_DTYPE
+    np.testing.assert_array_equal(got["timestamp"], expected["timestamp"])
+    for column in ("open", "high", "low", "close"):
+        np.testing.assert_array_equal(got[column], expected[column], err_msg=column)
+
+
+# Samples up to 22:28:20 close the 22:30 bar, the next six the 23:00 bar, and the last four form
+# the unfinished bar labelled by its latest sample (23:18:20). Each bar opens at the previous
+# bar's last sample.
+EXPECTED_30M = bars(
+    (1_700_001_000_000, 100, 102, 99, 101),
+    (1_700_002_800_000, 101, 105, 98, 101),
+    (FIVE_MINUTE_START + 13 * 5 * MINUTE, 101, 102, 97, 100),
+)
+
+# With the epoch origin, 4-day edges fall on epoch days 19724, 19728 and 19732. A sample exactly on
+# an edge closes that bar.
+EXPECTED_4D = bars(
+    (19724 * DAY, 10, 11, 10, 11),
+    (19728 * DAY, 11, 13, 8, 13),
+    (19732 * DAY, 13, 16, 7, 16),
+)
+
+
+def test_thirty_minute_bars_from_five_minute_samples():
+    assert_bars_equal(resample_records(five_minute_samples(), 30 * 60), EXPECTED_30M)
+
+
+def test_four_day_bars_from_daily_samples_use_epoch_edges():
+    assert_bars_equal(resample_records(daily_samples(), 4 * 86400), EXPECTED_4D)
+
+
+def test_four_hour_bars_keep_high_and_low_of_stored_rows():
+    # Rows that already carry their own high and low (a coarser stored tier) must keep them.
+    start = 1_700_006_400_000  # 2023-11-15 00:00 UTC, a 4h edge
+    rows = bars(
+        (start + 1 * HOUR, 50, 55, 48, 52),
+        (start + 2 * HOUR, 52, 53, 49, 50),
+        (start + 4 * HOUR, 50, 51, 47, 49),
+        (start + 5 * HOUR, 49, 60, 49, 58),
+    )
+    expected = bars(
+        (start + 4 * HOUR, 50, 55, 47, 49),
+        (start + 5 * HOUR, 49, 60, 49, 58),
+    )
+    assert_bars_equal(resample_records(rows, 4 * 3600), expected)
+
+
+def test_empty_samples():
+    assert len(resample_records(np.zeros(0, dtype=OHLC_DTYPE), 30 * 60)) == 0
+
+
+@pytest.mark.parametrize("days, samples, expected, now_ms", [
+    (1, five_minute_samples, EXPECTED_30M, FIVE_MINUTE_START + 70 * MINUTE),
+    (365, daily_samples, EXPECTED_4D, 19732 * DAY + HOUR),
+])
+def test_load_ohlc_resamples_with_production_alignment(monkeypatch, days, samples, expected, now_ms):
+    async def load_samples(coin_id, requested_days, priority):
+        assert requested_days == days
+        return samples()
+
+    monkeypatch.setattr(market_data, "load_samples", load_samples)
+    monkeypatch.setattr(market_data.time, "time", lambda: now_ms / 1000)
+    df = asyncio.run(market_data._load_ohlc("bitcoin", days, 0))
+
+    np.testing.assert_array_equal(df["timestamp"].to_numpy().astype("datetime64[ms]").astype("int64"),
+                                  expected["timestamp"])
+    for column in ("open", "high", "low", "close"):
+        np.testing.assert_array_equal(df[column].to_numpy(), expected[column], err_msg=column)
@@ -0,0 +1,61 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import scanner
+from services.metrics import calculate_rsi, calculate_volatility
+from services.scanner import scan_closes, stack_closes
+
+
+def universe(coins: int) -> tuple[list[str], list[np.ndarray]]:
+    # Random walks of different lengths, so shorter histories are front-padded when stacked.
+    rng = np.random.default_rng(11)
+    ids = [f"coin-{i}" for i in range(coins)]
+    series = [100 * np.exp(np.cumsum(rng.normal(0, 0.02, 180 - int(rng.integers(0, 10))))) for _ in ids]
+    series[0] = series[0][:10]
+    return ids, series
+
+
+def test_scan_matches_per_coin_indicators():
+    ids, series = universe(60)
+    table = scan_closes(ids, stack_closes(series)).set_index("coin_id")
+
+    expected = {}
+    for coin_id, closes in zip(ids, series):
+        df = pd.DataFrame({"close": closes})
+        rsi = calculate_rsi(df, 14)
+        if rsi is not None and not pd.isna(rsi.iloc[-1]):
+            expected[coin_id] = (rsi.iloc[-1], calculate_volatility(df))
+    assert "coin-0" not in expected
+    assert sorted(table.index) == sorted(expected)
+    for coin_id, (rsi, volatility) in expected.items():
+        assert table.at[coin_id, "rsi"] == pytest.approx(rsi, rel=1e-12), coin_id
+        assert table.at[coin_id, "volatility"] == pytest.approx(volatility, rel=1e-9), coin_id
+
+
+def test_fetches_past_the_timeout_keep_running(monkeypatch):
+    loaded = []
+
+    async def fetch_markets_page(page, per_page, priority):
+        return [{"id": "fast"}, {"id": "slow"}] if page == 1 else []
+
+    async def get_ohlc_history(coin_id, days, priority):
+        await asyncio.sleep(0.2 if coin_id == "slow" else 0)
+        loaded.append(coin_id)
+        return pd.DataFrame({"close": np.linspace(1.0, 2.0, 30)})
+
+    monkeypatch.setattr(scanner, "fetch_markets_page", fetch_markets_page)
+    monkeypatch.setattr(scanner, "get_ohlc_history", get_ohlc_history)
+
+    async def scan():
+        table, missing = await scanner.scan_market(30, limit=2, timeout=0.05)
+        assert list(table["coin_id"]) == ["fast"] and missing == 1
+        assert len(scanner._background) == 1
+        await asyncio.gather(*scanner._background)
+        await asyncio.sleep(0)
+
+    asyncio.run(scan())
+    assert loaded == ["fast", "slow"]
+    assert not scanner._background
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import streaming_rsi
+from services.metrics import calculate_rsi
+from services.ohlc_store import records_to_frame, resample_records, samples_to_records
+from services.streaming_rsi import StreamingRSI, live_rsi, sync_rsi_stream
+
+LENGTH = 14
+
+
+def batch_rsi(closes: pd.Series, length: int = LENGTH) -> pd.Series:
+    # Wilder RSI as pandas computes it, the definition the streaming version has to reproduce.
+    delta = closes.diff()
+    gain = delta.where(delta > 0, 0.0)
+    loss = -delta.where(delta < 0, 0.0)
+    avg_gain = gain.ewm(com=length - 1, min_periods=length).mean()
+    avg_loss = loss.ewm(com=length - 1, min_periods=length).mean()
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def frame(closes) -> pd.DataFrame:
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=len(closes), freq="4h"),
+        "close": np.asarray(closes, dtype="float64"),
+    })
+
+
+def random_walk(seed: int, n: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+
+
+SERIES = {
+    "random_walk": random_walk(1, 500),
+    "long_random_walk": random_walk(2, 2200),
+    # Repeated closes give zero deltas, which the ewm recurrence treats specially.
+    "ties": np.round(random_walk(3, 300), 0),
+    "rising": np.arange(1.0, 61.0),
+    "falling": np.arange(60.0, 0.0, -1.0),
+    "short": random_walk(4, LENGTH - 1),
+}
+
+
+@pytest.mark.parametrize("name", SERIES)
+def test_streaming_matches_batch_exactly(name):
+    closes = pd.Series(SERIES[name])
+    rsi = StreamingRSI(LENGTH)
+    got = pd.Series([np.nan if v is None else v for v in (rsi.update(float(c)) for c in closes)])
+    pd.testing.assert_series_equal(got, batch_rsi(closes), check_exact=True)
+
+
+def test_flat_series_has_no_rsi():
+    rsi = StreamingRSI(LENGTH)
+    assert all(rsi.update(100.0) is None for _ in range(50))
+
+
+def test_sync_extends_with_new_candles_only():
+    streaming_rsi.rsi_streams.clear()
+    df = frame(SERIES["random_walk"])
+    first = sync_rsi_stream("bitcoin", 30, df.iloc[:400])
+    second = sync_rsi_stream("bitcoin", 30, df)
+    assert second is first
+    # The last row is the forming candle and stays out of the stream.
+    assert second.count == len(df) - 1
+    assert second.value == batch_rsi(df["close"]).iloc[-2]
+    assert live_rsi("bitcoin", 30, df) == batch_rsi(df["close"]).iloc[-1]
+    assert second.count == len(df) - 1
+
+
+def test_sync_rebuilds_after_a_gap():
+    streaming_rsi.rsi_streams.clear()
+    df = frame(SERIES["random_walk"])
+    first = sync_rsi_stream("bitcoin", 30, df.iloc[:100])
+    shifted = df.iloc[100:].reset_index(drop=True)
+    shifted["timestamp"] = shifted["timestamp"] + pd.Timedelta(days=365)
+    second = sync_rsi_stream("bitcoin", 30, shifted)
+    assert second is not first
+    assert second.value == batch_rsi(shifted["close"]).iloc[-2]
+
+
+def test_live_rsi_matches_batch_across_ticks_inside_one_bar():
+    streaming_rsi.rsi_streams.clear()
+    hour = 3600 * 1000
+    start = 1_700_006_400_000  # 2023-11-15 00:00 UTC, a 4h edge
+    # Hourly samples up to 200h after the edge, so the last one closes a bar.
+    prices = SERIES["random_walk"][:201]
+    timestamps = start + hour * np.arange(len(prices), dtype="int64")
+    last = timestamps[-1]
+    for tick, price in enumerate(random_walk(5, 12)):
+        # Ticks every 10 minutes, all inside the next, still forming 4h bar.
+        tick_ms = last + (tick + 1) * 10 * 60 * 1000
+        samples = samples_to_records(np.r_[timestamps, tick_ms], np.r_[prices, price])
+        df = records_to_frame(resample_records(samples, 4 * 3600))
+        expected = calculate_rsi(df, LENGTH).iloc[-1]
+        assert df["timestamp"].iloc[-1].value // 10 ** 6 == tick_ms
+        assert live_rsi("bitcoin", 30, df) == pytest.approx(expected, rel=1e-10), tick
+        assert streaming_rsi.rsi_streams.get(("bitcoin", 30)).count == len(df) - 1
+
+
+def test_idle_streams_are_dropped(monkeypatch):
+    streaming_rsi.rsi_streams.clear()
+    now = 1_700_000_000.0
+    monkeypatch.setattr(streaming_rsi.time, "time", lambda: now)
+    sync_rsi_stream("bitcoin", 30, frame(SERIES["random_walk"]))
+    assert streaming_rsi.rsi_streams.get(("bitcoin", 30)) is not None
+
+    now += streaming_rsi.RSI_STREAM_IDLE + 1
+    assert streaming_rsi.rsi_streams.get(("bitcoin", 30)) is None
+    assert len(streaming_rsi.rsi_streams) == 0
+
+
+def test_stream_count_is_bounded(monkeypatch):
+    monkeypatch.setattr(streaming_rsi, "rsi_streams", streaming_rsi.TTLCache(3))
+    df = frame(SERIES["rising"])
+    for i in range(10):
+        sync_rsi_stream(f"coin-{i}", 30, df)
+    assert len(streaming_rsi.rsi_streams) == 3